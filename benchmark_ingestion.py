@@ -0,0 +1,97 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from openpyxl import Workbook, load_workbook
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is then reported as n/a
+    resource = None
+
+SOURCE_FILE = 'Faropoint Rent Roll All Funds (25JUN).xlsx'
+ANALYSIS_DATE = datetime(2025, 6, 30)
+
+
+def build_large_workbook(source_path, target_path, rows):
+    """Write a workbook with the source header block and its lease rows repeated up to `rows` rows"""
+    src = load_workbook(source_path, read_only=True)
+    src_rows = list(src['Report1'].iter_rows(values_only=True))
+    src.close()
+    header, body = src_rows[:5], src_rows[5:]
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Report1')
+    for row in header:
+        ws.append(row)
+    for i in range(rows):
+        ws.append(body[i % len(body)])
+    wb.save(target_path)
+
+
+def run_once(mode, file_path, batch_size, columns):
+    """Parse the workbook in this process and report wall time and peak RSS (None without `resource`)"""
+    from dashboard_data_processor import RentRollProcessor
+    from rent_roll_normalization import ANALYSIS_COLUMNS
+
+    processor = RentRollProcessor(use_cache=False, streaming=(mode == 'streaming'), batch_size=batch_size,
+                                  columns=ANALYSIS_COLUMNS if columns == 'analysis' else None)
+    start = time.perf_counter()
+    df = processor._process_rent_roll(file_path, ANALYSIS_DATE)
+    elapsed = time.perf_counter() - start
+
+    peak_mb = None
+    if resource is not None:
+        # ru_maxrss is kilobytes on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_mb = peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    print(json.dumps({'mode': mode, 'rows': len(df), 'seconds': elapsed, 'peak_rss_mb': peak_mb}))
+
+
+def measure(mode, file_path, batch_size, columns):
+    # Each mode runs in a fresh interpreter so peak RSS is not shared between them
+    output = subprocess.run(
+        [sys.executable, __file__, '--run', mode, '--file', file_path, '--batch-size', str(batch_size),
+         '--columns', columns],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare pd.read_excel and streaming rent roll ingestion')
+    parser.add_argument('--file', default=SOURCE_FILE)
+    parser.add_argument('--rows', type=int, default=0,
+                        help='Generate a synthetic workbook with this many sheet rows instead of using --file')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--columns', choices=['analysis', 'all'], help='Only benchmark this column selection')
+    parser.add_argument('--run', choices=['read_excel', 'streaming'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_once(args.run, args.file, args.batch_size, args.columns or 'analysis')
+        sys.exit(0)
+
+    file_path = args.file
+    if args.rows:
+        file_path = f'benchmark_rent_roll_{args.rows}.xlsx'
+        if not os.path.exists(file_path):
+            print(f"Generating {args.rows:,}-row workbook: {file_path}")
+            build_large_workbook(SOURCE_FILE, file_path, args.rows)
+
+    print("=" * 70)
+    print("RENT ROLL INGESTION BENCHMARK")
+    print(f"File: {file_path}  Batch size: {args.batch_size:,}")
+    print("=" * 70)
+    print(f"{'Mode':<15} {'Columns':<10} {'Rows kept':>12} {'Seconds':>10} {'Peak RSS (MB)':>15}")
+    print("-" * 66)
+    for mode in ['read_excel', 'streaming']:
+        for columns in [args.columns] if args.columns else ['all', 'analysis']:
+            result = measure(mode, file_path, args.batch_size, columns)
+            peak = 'n/a' if result['peak_rss_mb'] is None else f"{result['peak_rss_mb']:.1f}"
+            print(f"{mode:<15} {columns:<10} {result['rows']:>12,} {result['seconds']:>10.2f} {peak:>15}")
@@ -0,0 +1,92 @@
+import argparse
+import time
+import warnings
+
+import numpy as np
+from dashboard_data_processor import RentRollProcessor
+from metrics_engine import PERIOD_METRICS, stack_snapshots, grouped_period_metrics
+warnings.filterwarnings('ignore')
+
+
+def legacy_period_metrics(data, fund, period):
+    """The per-(fund, period) filtering RentRollProcessor used before metrics_engine"""
+    fund_data = data[data['Fund'] == fund]
+    occupied_data = fund_data[~fund_data['Is_Vacant']]
+    
+    total_sf = fund_data['Area'].sum()
+    occupied_sf = occupied_data['Area'].sum()
+    
+    walt = 0
+    if len(occupied_data) > 0 and occupied_data['Area'].sum() > 0:
+        walt = (occupied_data['Area'] * occupied_data['Months_To_Expiry']).sum() / occupied_data['Area'].sum()
+    
+    return {
+        'period': period,
+        'properties': fund_data['Prop_Code'].nunique(),
+        'total_leases': len(fund_data),
+        'occupied_leases': len(occupied_data),
+        'vacant_leases': fund_data['Is_Vacant'].sum(),
+        'total_sf': total_sf,
+        'occupied_sf': occupied_sf,
+        'vacant_sf': fund_data[fund_data['Is_Vacant']]['Area'].sum(),
+        'occupancy_rate': (occupied_sf / total_sf * 100) if total_sf > 0 else 0,
+        'annual_revenue': occupied_data['Annual_Rent'].sum(),
+        'monthly_revenue': occupied_data['Monthly_Rent'].sum(),
+        'avg_rent_psf': occupied_data['Annual_Rent'].sum() / occupied_sf if occupied_sf > 0 else 0,
+        'walt': walt,
+        'near_term_expiry_sf': occupied_data[occupied_data['Months_To_Expiry'] <= 12]['Area'].sum(),
+        'near_term_expiry_pct': (occupied_data[occupied_data['Months_To_Expiry'] <= 12]['Area'].sum() / 
+                                 occupied_sf * 100) if occupied_sf > 0 else 0
+    }
+
+
+def synthetic_snapshots(source, funds, quarters, rows_per_quarter, seed=0):
+    """Resample a processed snapshot into `quarters` periods spread across `funds` synthetic funds"""
+    rng = np.random.default_rng(seed)
+    fund_names = np.array([f'Fund {i + 1}' for i in range(funds)], dtype=object)
+    frames = {}
+    for q in range(quarters):
+        frame = source.iloc[rng.integers(0, len(source), size=rows_per_quarter)].reset_index(drop=True)
+        frame['Fund'] = fund_names[rng.integers(0, funds, size=rows_per_quarter)]
+        frame['Months_To_Expiry'] = np.maximum(frame['Months_To_Expiry'] - 3 * q + rng.normal(0, 6, rows_per_quarter), 0)
+        frames[f'Q{q % 4 + 1}_{2000 + q // 4}'] = frame
+    return frames
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare grouped and per-(fund, period) metric calculation')
+    parser.add_argument('--funds', type=int, default=50)
+    parser.add_argument('--quarters', type=int, default=40)
+    parser.add_argument('--rows-per-quarter', type=int, default=5000)
+    args = parser.parse_args()
+
+    processor = RentRollProcessor()
+    processor.load_data()
+    source = processor.snapshots[processor.snapshots.latest]
+    frames = synthetic_snapshots(source, args.funds, args.quarters, args.rows_per_quarter)
+    periods = list(frames)
+    funds = [f'Fund {i + 1}' for i in range(args.funds)]
+
+    start = time.perf_counter()
+    legacy = {fund: {period: legacy_period_metrics(frames[period], fund, period) for period in periods}
+              for fund in funds}
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grouped = grouped_period_metrics(stack_snapshots(frames), periods, funds=funds)
+    grouped_time = time.perf_counter() - start
+
+    for fund in funds:
+        for period in periods:
+            for key in PERIOD_METRICS[1:]:
+                assert np.isclose(grouped[fund][period][key], legacy[fund][period][key], rtol=1e-9), (fund, period, key)
+
+    pairs = args.funds * args.quarters
+    print("=" * 70)
+    print("PERIOD METRICS BENCHMARK")
+    print(f"{args.funds} funds x {args.quarters} quarters ({pairs:,} pairs), "
+          f"{args.rows_per_quarter * args.quarters:,} lease rows")
+    print("=" * 70)
+    print(f"{'Per-(fund, period) filters':<30} {legacy_time:>10.3f}s")
+    print(f"{'One grouped aggregation':<30} {grouped_time:>10.3f}s")
+    print(f"{'Speedup':<30} {legacy_time / grouped_time:>10.1f}x")
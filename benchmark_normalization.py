@@ -0,0 +1,86 @@
+import argparse
+import time
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from rent_roll_normalization import read_rent_roll, normalize_rent_roll, extract_prop_code
+from fund_classification import default_classifier
+warnings.filterwarnings('ignore')
+
+SOURCE_FILE = 'Faropoint Rent Roll All Funds (25JUN).xlsx'
+ANALYSIS_DATE = datetime(2025, 6, 30)
+
+
+def legacy_normalize(df, analysis_date):
+    """The row-wise cleaning block the analysis scripts used before rent_roll_normalization"""
+    df = df.dropna(subset=['Property'])
+    df['Prop_Code'] = df['Property'].str.extract(r'\(([^)]+)\)')
+    df['Fund'] = df['Prop_Code'].apply(lambda x: 'Fund 3' if str(x).startswith('3') else ('Fund 2' if str(x).startswith('x') else 'Other') if pd.notna(x) else 'Unknown')
+
+    df['Lease_To'] = pd.to_datetime(df['Lease_To'], errors='coerce')
+    df['Is_Vacant'] = df['Lease'].str.contains('VACANT', na=False)
+    df['Months_To_Expiry'] = df.apply(lambda row:
+        max((row['Lease_To'] - analysis_date).days / 30.44, 0) if pd.notna(row['Lease_To']) and not row['Is_Vacant'] else 0,
+        axis=1)
+
+    numeric_cols = ['Area', 'Monthly_Rent', 'Annual_Rent', 'Annual_Rent_Area']
+    for col in numeric_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    df_valid = df[df['Area'].notna() & (df['Area'] > 0) & df['Fund'].isin(['Fund 2', 'Fund 3'])]
+    df_valid['Tenant_Name'] = df_valid['Lease'].str.extract(r'^([^(]+)')
+    df_valid['Tenant_Name'] = df_valid['Tenant_Name'].str.strip()
+    return df_valid
+
+
+def synthetic_raw_frame(raw, rows, seed=0):
+    """Resample the raw workbook rows (blank spacer rows included) up to `rows` rows"""
+    rng = np.random.default_rng(seed)
+    sample = raw.iloc[rng.integers(0, len(raw), size=rows)]
+    return sample.reset_index(drop=True)
+
+
+def time_call(func, *args, repeat=1):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare vectorized and row-wise rent roll normalization')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--legacy-max-rows', type=int, default=1_000_000,
+                        help='Skip the row-wise baseline above this many rows')
+    args = parser.parse_args()
+
+    raw = read_rent_roll(SOURCE_FILE)
+
+    print("=" * 92)
+    print("RENT ROLL NORMALIZATION BENCHMARK")
+    print("=" * 92)
+    print(f"{'Rows':>10} {'Row-wise (s)':>14} {'Vectorized (s)':>16} {'Row-wise us/row':>17} {'Vector us/row':>15}"
+          f" {'Classify (s)':>13}")
+    print("-" * 92)
+    for rows in args.sizes:
+        frame = synthetic_raw_frame(raw, rows)
+        repeat = 3 if rows <= 100_000 else 1
+
+        vector_time, vector_df = time_call(lambda: normalize_rent_roll(frame, ANALYSIS_DATE), repeat=repeat)
+        prop_codes = extract_prop_code(frame['Property'])
+        classify_time, _ = time_call(default_classifier().classify, prop_codes, repeat=repeat)
+        if rows <= args.legacy_max_rows:
+            legacy_time, legacy_df = time_call(lambda: legacy_normalize(frame.copy(), ANALYSIS_DATE), repeat=repeat)
+            pd.testing.assert_series_equal(legacy_df['Months_To_Expiry'], vector_df['Months_To_Expiry'],
+                                           check_dtype=False)
+            legacy_cols = f"{legacy_time:>14.3f}"
+            legacy_per_row = f"{legacy_time / rows * 1e6:>17.2f}"
+        else:
+            legacy_cols, legacy_per_row = f"{'skipped':>14}", f"{'-':>17}"
+
+        print(f"{rows:>10,} {legacy_cols} {vector_time:>16.3f} {legacy_per_row} {vector_time / rows * 1e6:>15.2f}"
+              f" {classify_time:>13.3f}")
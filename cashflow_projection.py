@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+DEFAULT_HORIZON = 120
+# Months a month-to-month or holdover lease (no Lease_To, or one already past) is assumed to keep paying;
+# None projects it through the whole horizon
+DEFAULT_HOLDOVER_MONTHS = 12
+# Leases per broadcast block, bounding the lease x month scratch arrays to a few MB
+CHUNK_ROWS = 8192
+
+
+def month_grid(analysis_date, horizon=DEFAULT_HORIZON):
+    """First days of the `horizon` months that follow analysis_date (from the month containing the next day)"""
+    first = np.datetime64(pd.Timestamp(analysis_date) + pd.Timedelta(days=1), 'M')
+    return (first + np.arange(horizon)).astype('datetime64[D]')
+
+
+def _days(dates, missing):
+    """Dates as int64 day numbers, with NaT replaced by `missing`"""
+    days = dates.to_numpy(dtype='datetime64[D]').astype(np.int64)
+    return np.where(dates.isna().to_numpy(), missing, days)
+
+
+def holdover_leases(df, analysis_date):
+    """Occupied leases with no Lease_To or one before analysis_date: month-to-month or holding over"""
+    lease_to = df['Lease_To']
+    return ~df['Is_Vacant'].to_numpy(dtype=bool) & (lease_to.isna() | (lease_to < pd.Timestamp(analysis_date))).to_numpy()
+
+
+def project_rent(df, analysis_date, horizon=DEFAULT_HORIZON, by=('Fund', 'Prop_Code'),
+                 holdover_months=DEFAULT_HOLDOVER_MONTHS):
+    """Contractual monthly rent of every group for the next `horizon` months
+
+    Each occupied lease pays its Monthly_Rent for the days of each month between
+    Lease_From and Lease_To (partial months are prorated by day). Leases without a
+    start date are treated as already running. Holdover leases (see holdover_leases)
+    keep paying for the first `holdover_months` projected months, or the whole
+    horizon with holdover_months=None; holdover_exposure() reports the rent this
+    leaves out. The lease x month overlap is computed by NumPy broadcasting in
+    blocks of CHUNK_ROWS leases and summed per group, so no Python loop runs per
+    lease or per month.
+
+    Returns a frame indexed by `by` with one column per month (first day of month).
+    """
+    by = list(by)
+    months = month_grid(analysis_date, horizon)
+    month_start = months.astype(np.int64)
+    month_end = (months.astype('datetime64[M]') + 1).astype('datetime64[D]').astype(np.int64) - 1
+    month_days = (month_end - month_start + 1).astype(np.float64)
+
+    occupied = df[~df['Is_Vacant'].to_numpy(dtype=bool)]
+    holdover = holdover_leases(occupied, analysis_date)
+    lease_from = _days(occupied['Lease_From'], np.iinfo(np.int64).min // 2)
+    lease_to = _days(occupied['Lease_To'], np.iinfo(np.int64).min // 2)
+    if holdover_months is None or holdover_months >= horizon:
+        holdover_end = month_end[-1] if horizon else 0
+    elif holdover_months > 0:
+        holdover_end = month_end[holdover_months - 1]
+    else:
+        holdover_end = np.iinfo(np.int64).min // 2
+    lease_to = np.where(holdover, holdover_end, lease_to)
+    rent = np.nan_to_num(occupied['Monthly_Rent'].to_numpy(dtype=np.float64))
+
+    grouped = occupied.groupby(by, sort=True, observed=True, dropna=False)
+    group_codes = grouped.ngroup().to_numpy()
+    index = grouped.size().index
+    # Sorting by group makes each block's groups contiguous, so they reduce with one reduceat
+    order = np.argsort(group_codes, kind='stable')
+    lease_from, lease_to, rent, group_codes = lease_from[order], lease_to[order], rent[order], group_codes[order]
+
+    projection = np.zeros((len(index), horizon))
+    for start in range(0, len(order), CHUNK_ROWS):
+        block = slice(start, start + CHUNK_ROWS)
+        first_day = np.maximum(lease_from[block, None], month_start[None, :])
+        last_day = np.minimum(lease_to[block, None], month_end[None, :])
+        active = np.clip(last_day - first_day + 1, 0, None) / month_days[None, :]
+        block_rent = active * rent[block, None]
+
+        codes = group_codes[block]
+        boundaries = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        projection[codes[boundaries]] += np.add.reduceat(block_rent, boundaries, axis=0)
+
+    return pd.DataFrame(projection, index=index, columns=pd.DatetimeIndex(months, name='Month'))
+
+
+def holdover_exposure(df, analysis_date, horizon=DEFAULT_HORIZON, by=('Fund', 'Prop_Code'),
+                      holdover_months=DEFAULT_HOLDOVER_MONTHS):
+    """Holdover leases of every group and how much of their rent project_rent() includes
+
+    Returns a frame indexed by `by` with leases, monthly_rent, projected_rent (over
+    the horizon with the given holdover_months) and excluded_rent (what projecting
+    them through the whole horizon would add).
+    """
+    holdovers = df[holdover_leases(df, analysis_date)]
+    full = project_rent(holdovers, analysis_date, horizon, by, holdover_months=None).sum(axis=1)
+    projected = project_rent(holdovers, analysis_date, horizon, by, holdover_months).sum(axis=1)
+    grouped = holdovers.groupby(list(by), sort=True, observed=True, dropna=False)
+    return pd.DataFrame({
+        'leases': grouped.size(),
+        'monthly_rent': grouped['Monthly_Rent'].sum(),
+        'projected_rent': projected,
+        'excluded_rent': full - projected,
+    })
+
+
+def projection_summary(projection, key, holdovers=None, holdover_months=DEFAULT_HOLDOVER_MONTHS):
+    """{'months': [...], 'monthly_rent': [...], 'holdover': {...}} for one row of a project_rent() frame
+
+    Missing keys project zeros; 'holdover' summarizes the key's row of a
+    holdover_exposure() frame when one is given.
+    """
+    row = projection.loc[key] if key in projection.index else pd.Series(0.0, index=projection.columns)
+    summary = {
+        'months': [f'{month:%Y-%m}' for month in projection.columns],
+        'monthly_rent': row.tolist(),
+    }
+    if holdovers is not None:
+        exposure = holdovers.loc[key] if key in holdovers.index else pd.Series(0.0, index=holdovers.columns)
+        summary['holdover'] = {'months': holdover_months, 'leases': int(exposure['leases']),
+                               **{column: float(exposure[column])
+                                  for column in ('monthly_rent', 'projected_rent', 'excluded_rent')}}
+    return summary
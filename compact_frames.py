@@ -0,0 +1,127 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_COLUMNS = ['Property', 'Units', 'Lease', 'Lease_Type', 'Prop_Code', 'Fund', 'Tenant_Name']
+INT32_RANGE = (np.iinfo(np.int32).min, np.iinfo(np.int32).max)
+
+
+def downcast_numeric(values):
+    """Return int32 or float32 values when that is lossless, otherwise the float64 input unchanged"""
+    array = values.to_numpy(dtype=np.float64)
+    finite = ~np.isnan(array)
+    if finite.all() and np.array_equal(array, np.round(array)) \
+            and (len(array) == 0 or INT32_RANGE[0] <= array.min() <= array.max() <= INT32_RANGE[1]):
+        return values.astype(np.int32)
+    as_float32 = array.astype(np.float32)
+    if np.array_equal(as_float32[finite].astype(np.float64), array[finite]):
+        return values.astype(np.float32)
+    return values
+
+
+class SharedCategories:
+    """Append-only category dictionaries shared by every compacted snapshot
+
+    New values are appended to the end of a column's categories, so a frame encoded
+    earlier keeps valid codes and only needs its categories extended by `align()`.
+    Frames with identical categories concatenate, join and group on integer codes.
+    """
+
+    def __init__(self, columns=CATEGORICAL_COLUMNS):
+        self.categories = {col: pd.Index([], dtype=object) for col in columns}
+
+    def encode(self, col, values):
+        """Encode one column against the shared categories, extending them with unseen values"""
+        categories = self.categories[col]
+        distinct = pd.Index(values.dropna().unique(), dtype=object)
+        unseen = distinct[categories.get_indexer(distinct) < 0]
+        if len(unseen):
+            categories = categories.append(unseen)
+            self.categories[col] = categories
+        return pd.Series(pd.Categorical(values, categories=categories), index=values.index, name=values.name)
+
+    def compact(self, df):
+        """Return a copy of a processed frame with shared categoricals and downcast numerics"""
+        df = df.copy()
+        for col in df.columns:
+            if col in self.categories:
+                df[col] = self.encode(col, df[col])
+            elif col == 'Is_Vacant':
+                df[col] = df[col].astype(bool)
+            elif pd.api.types.is_float_dtype(df[col]):
+                df[col] = downcast_numeric(df[col])
+        return df
+
+    def align(self, df):
+        """Extend a frame's categoricals in place to the current shared categories"""
+        for col, categories in self.categories.items():
+            if col in df.columns and len(df[col].cat.categories) != len(categories):
+                df[col] = df[col].cat.set_categories(categories)
+        return df
+
+    @property
+    def nbytes(self):
+        """Deep memory use of the shared category dictionaries"""
+        return int(sum(categories.memory_usage(deep=True) for categories in self.categories.values()))
+
+
+def frame_bytes(df):
+    """Deep memory use of a frame, counting categorical columns by their codes only
+
+    The categories of a compacted frame belong to the shared dictionary, which is
+    reported once through SharedCategories.nbytes rather than once per snapshot.
+    """
+    total = df.index.memory_usage(deep=True)
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            total += values.cat.codes.to_numpy().nbytes
+        else:
+            total += values.memory_usage(index=False, deep=True)
+    return int(total)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare memory and groupby time of standard and compact snapshots')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    from dashboard_data_processor import RentRollProcessor
+
+    standard = RentRollProcessor()
+    standard.load_data(preload=True)
+    compact = RentRollProcessor(compact=True)
+    compact.load_data(preload=True)
+
+    print("=" * 70)
+    print("COMPACT SNAPSHOT MEMORY")
+    print("=" * 70)
+    print(f"{'Period':<10} {'Rows':>8} {'Standard (KB)':>15} {'Compact (KB)':>14} {'Saved':>8}")
+    print("-" * 70)
+    for period in standard.snapshots.periods:
+        before = frame_bytes(standard.snapshots[period])
+        after = frame_bytes(compact.snapshots[period])
+        print(f"{period:<10} {len(standard.snapshots[period]):>8,} {before / 1024:>15,.1f} {after / 1024:>14,.1f}"
+              f" {1 - after / before:>8.1%}")
+    standard_total = standard.memory_report()['total_bytes']
+    compact_total = compact.memory_report()['total_bytes']
+    print(f"{'Shared dictionary':<19} {'':>15} {compact.categories.nbytes / 1024:>14,.1f}")
+    print(f"{'Total':<19} {standard_total / 1024:>15,.1f} {compact_total / 1024:>14,.1f}"
+          f" {1 - compact_total / standard_total:>8.1%}")
+
+    def stacked(processor):
+        return pd.concat([processor.snapshots[period] for period in processor.snapshots.periods])
+
+    print(f"\n{'Cross-quarter groupby':<32} {'Standard (ms)':>15} {'Compact (ms)':>14}")
+    print("-" * 70)
+    for key in ['Prop_Code', 'Tenant_Name']:
+        timings = []
+        for processor in (standard, compact):
+            frame = stacked(processor)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                frame.groupby(key, observed=True)['Annual_Rent'].sum()
+            timings.append((time.perf_counter() - start) / args.repeat * 1000)
+        print(f"{key:<32} {timings[0]:>15.2f} {timings[1]:>14.2f}")
@@ -4,43 +4,17 @@ from datetime import datetime
 import warnings
 import matplotlib.pyplot as plt
 import seaborn as sns
+from rent_roll_normalization import read_rent_roll, normalize_rent_roll
+from expiry_buckets import ExpiryBuckets, expiry_table
+from property_rollup import property_rollup, top_n
+from rent_statistics import rent_statistics
 warnings.filterwarnings('ignore')
 
-# Read the Excel file
-df = pd.read_excel('Faropoint Rent Roll All Funds (25JUN).xlsx', sheet_name='Report1', skiprows=4)
-
-# Clean column names
-df.columns = ['Property', 'Units', 'Lease', 'Lease_Type', 'Area', 'Lease_From', 'Lease_To', 
-              'Term', 'Tenancy_Years', 'Monthly_Rent', 'Monthly_Rent_Area', 'Annual_Rent', 
-              'Annual_Rent_Area', 'Annual_Rec_Area', 'Annual_Misc_Area', 'Security_Deposit', 'LOC_Amount']
-
-# Data cleaning and preparation
-df = df.dropna(subset=['Property'])
-df['Prop_Code'] = df['Property'].str.extract(r'\(([^)]+)\)')
-df['Fund'] = df['Prop_Code'].apply(lambda x: 'Fund 3' if str(x).startswith('3') else ('Fund 2' if str(x).startswith('x') else 'Other') if pd.notna(x) else 'Unknown')
-
 # Reference date
 reference_date = datetime(2025, 6, 30)
 
-# Process dates and identify vacancies
-df['Lease_To'] = pd.to_datetime(df['Lease_To'], errors='coerce')
-df['Lease_From'] = pd.to_datetime(df['Lease_From'], errors='coerce')
-df['Is_Vacant'] = df['Lease'].str.contains('VACANT', na=False)
-df['Months_To_Expiry'] = df.apply(lambda row: 
-    max((row['Lease_To'] - reference_date).days / 30.44, 0) if pd.notna(row['Lease_To']) and not row['Is_Vacant'] else 0, 
-    axis=1)
-
-# Convert numeric columns
-numeric_cols = ['Area', 'Monthly_Rent', 'Annual_Rent', 'Annual_Rent_Area', 'Security_Deposit', 'LOC_Amount']
-for col in numeric_cols:
-    df[col] = pd.to_numeric(df[col], errors='coerce')
-
-# Filter valid data
-df_valid = df[df['Area'].notna() & (df['Area'] > 0) & df['Fund'].isin(['Fund 2', 'Fund 3'])]
-
-# Extract tenant name from Lease column
-df_valid['Tenant_Name'] = df_valid['Lease'].str.extract(r'^([^(]+)')
-df_valid['Tenant_Name'] = df_valid['Tenant_Name'].str.strip()
+# Read and normalize the rent roll (Fund 2 and Fund 3 rows with a valid area)
+df_valid = normalize_rent_roll(read_rent_roll('Faropoint Rent Roll All Funds (25JUN).xlsx'), reference_date)
 
 print("=" * 80)
 print("COMPREHENSIVE RENT ROLL ANALYSIS BY FUND")
@@ -83,32 +57,12 @@ for fund in ['Fund 2', 'Fund 3']:
 print("\n\n2. LEASE EXPIRATION RISK ANALYSIS")
 print("-" * 50)
 
-# Create expiration buckets
-def categorize_expiration(months):
-    if months == 0:
-        return 'Expired/Vacant'
-    elif months <= 6:
-        return '0-6 months'
-    elif months <= 12:
-        return '6-12 months'
-    elif months <= 24:
-        return '12-24 months'
-    elif months <= 36:
-        return '24-36 months'
-    elif months <= 60:
-        return '36-60 months'
-    else:
-        return '60+ months'
+# Expiration buckets; months to expiry is 0 for vacant and expired leases
+expiry_buckets = ExpiryBuckets([0, 6, 12, 24, 36, 60], expired='Expired/Vacant')
+expiry_summary = expiry_table(df_valid, expiry_buckets, by=['Fund'], occupied_only=False).round(0)
 
 for fund in ['Fund 2', 'Fund 3']:
     fund_data = df_valid[df_valid['Fund'] == fund]
-    fund_data['Expiry_Bucket'] = fund_data['Months_To_Expiry'].apply(categorize_expiration)
-    
-    # Group by expiration bucket
-    expiry_summary = fund_data.groupby('Expiry_Bucket').agg({
-        'Area': ['count', 'sum'],
-        'Annual_Rent': 'sum'
-    }).round(0)
     
     print(f"\n{fund} Lease Expiration Schedule:")
     print(f"{'Expiry Period':<20} {'Leases':>10} {'SF':>15} {'Annual Rent':>20} {'% of Rent':>10}")
@@ -116,33 +70,28 @@ for fund in ['Fund 2', 'Fund 3']:
     
     total_rent = fund_data[~fund_data['Is_Vacant']]['Annual_Rent'].sum()
     
-    bucket_order = ['Expired/Vacant', '0-6 months', '6-12 months', '12-24 months', 
-                    '24-36 months', '36-60 months', '60+ months']
-    
-    for bucket in bucket_order:
-        if bucket in expiry_summary.index:
-            row = expiry_summary.loc[bucket]
-            lease_count = row[('Area', 'count')]
-            sf = row[('Area', 'sum')]
-            rent = row[('Annual_Rent', 'sum')]
-            rent_pct = (rent / total_rent * 100) if total_rent > 0 else 0
-            print(f"{bucket:<20} {int(lease_count):>10} {sf:>15,.0f} ${rent:>18,.0f} {rent_pct:>9.1f}%")
+    for bucket, row in expiry_summary.loc[fund].iterrows():
+        if row['count'] == 0:
+            continue
+        rent_pct = (row['annual_rent'] / total_rent * 100) if total_rent > 0 else 0
+        print(f"{bucket:<20} {int(row['count']):>10} {row['sf']:>15,.0f} ${row['annual_rent']:>18,.0f} {rent_pct:>9.1f}%")
 
 # 3. RENT ANALYSIS
 print("\n\n3. RENT ANALYSIS BY FUND")
 print("-" * 50)
 
+# Unweighted and SF-weighted rent/SF statistics of the occupied leases, every fund in one pass
+rent_stats_table = rent_statistics(df_valid, by=['Fund'], percentiles=[25, 50, 75])
+
 for fund in ['Fund 2', 'Fund 3']:
-    fund_data = df_valid[(df_valid['Fund'] == fund) & (~df_valid['Is_Vacant'])]
-    
-    if len(fund_data) > 0:
-        # Calculate rent statistics
+    if fund in rent_stats_table.index and rent_stats_table.loc[fund, 'count'] > 0:
+        fund_stats = rent_stats_table.loc[fund]
         rent_stats = {
-            'Mean Rent/SF': fund_data['Annual_Rent_Area'].mean(),
-            'Median Rent/SF': fund_data['Annual_Rent_Area'].median(),
-            'Min Rent/SF': fund_data['Annual_Rent_Area'].min(),
-            'Max Rent/SF': fund_data['Annual_Rent_Area'].max(),
-            'Std Dev': fund_data['Annual_Rent_Area'].std()
+            'Mean Rent/SF': fund_stats['mean'],
+            'Median Rent/SF': fund_stats['p50'],
+            'Min Rent/SF': fund_stats['min'],
+            'Max Rent/SF': fund_stats['max'],
+            'Std Dev': fund_stats['std']
         }
         
         print(f"\n{fund} Rent Statistics (Annual Rent/SF):")
@@ -150,10 +99,14 @@ for fund in ['Fund 2', 'Fund 3']:
             print(f"  {metric}: ${value:.2f}")
         
         # Rent distribution by quartiles
-        quartiles = fund_data['Annual_Rent_Area'].quantile([0.25, 0.5, 0.75])
-        print(f"  25th Percentile: ${quartiles[0.25]:.2f}")
-        print(f"  50th Percentile: ${quartiles[0.50]:.2f}")
-        print(f"  75th Percentile: ${quartiles[0.75]:.2f}")
+        print(f"  25th Percentile: ${fund_stats['p25']:.2f}")
+        print(f"  50th Percentile: ${fund_stats['p50']:.2f}")
+        print(f"  75th Percentile: ${fund_stats['p75']:.2f}")
+        
+        # Weighted by SF, so large buildings count in proportion to their size
+        print(f"  SF-Weighted Mean Rent/SF: ${fund_stats['weighted_mean']:.2f}")
+        print(f"  SF-Weighted Quartiles: ${fund_stats['weighted_p25']:.2f} / ${fund_stats['weighted_p50']:.2f}"
+              f" / ${fund_stats['weighted_p75']:.2f}")
 
 # 4. TENANT CONCENTRATION ANALYSIS
 print("\n\n4. TENANT CONCENTRATION ANALYSIS")
@@ -192,30 +145,18 @@ for fund in ['Fund 2', 'Fund 3']:
 print("\n\n5. PROPERTY PERFORMANCE ANALYSIS")
 print("-" * 50)
 
+# One roll-up row per property, shared by the property and vacancy sections
+rollup = property_rollup(df_valid)
+
 for fund in ['Fund 2', 'Fund 3']:
-    fund_data = df_valid[df_valid['Fund'] == fund]
-    
-    # Group by property
-    property_summary = fund_data.groupby(['Prop_Code', 'Property']).agg({
-        'Area': 'sum',
-        'Annual_Rent': 'sum',
-        'Is_Vacant': 'sum'
-    })
-    
-    # Calculate occupancy and avg rent per property
-    property_summary['Occupancy_Rate'] = 1 - (property_summary['Is_Vacant'] > 0).astype(int)
-    property_summary['Avg_Rent_PSF'] = property_summary['Annual_Rent'] / property_summary['Area']
-    
-    # Sort by annual rent
-    property_summary = property_summary.sort_values('Annual_Rent', ascending=False)
+    top_5 = top_n(rollup, 5, fund=fund)
     
     print(f"\n{fund} - Top 5 Properties by Annual Rent:")
     print(f"{'Property':<40} {'SF':>12} {'Annual Rent':>15} {'Avg $/SF':>10}")
     print("-" * 80)
     
-    for i, (idx, row) in enumerate(property_summary.head(5).iterrows()):
-        prop_name = idx[1].split('(')[0].strip()[:39]
-        print(f"{prop_name:<40} {row['Area']:>12,.0f} ${row['Annual_Rent']:>14,.0f} ${row['Avg_Rent_PSF']:>9.2f}")
+    for name, total_sf, rent in zip(top_5['property'], top_5['total_sf'], top_5['annual_rent']):
+        print(f"{name[:39]:<40} {total_sf:>12,.0f} ${rent:>14,.0f} ${rent / total_sf:>9.2f}")
 
 # 6. VACANCY ANALYSIS
 print("\n\n6. VACANCY ANALYSIS")
@@ -223,26 +164,17 @@ print("-" * 50)
 
 for fund in ['Fund 2', 'Fund 3']:
     fund_data = df_valid[df_valid['Fund'] == fund]
-    
-    # Vacancy by property
-    vacancy_by_property = fund_data.groupby('Prop_Code').agg({
-        'Area': 'sum',
-        'Is_Vacant': lambda x: x.sum() > 0
-    })
-    
-    vacant_properties = vacancy_by_property[vacancy_by_property['Is_Vacant']].index.tolist()
-    
-    # Vacant space details
-    vacant_spaces = fund_data[fund_data['Is_Vacant']]
+    fund_properties = rollup[rollup['fund'] == fund]
+    vacant_sf = fund_properties['vacant_sf'].sum()
     
     print(f"\n{fund} Vacancy Analysis:")
-    print(f"  Properties with vacancy: {len(vacant_properties)} out of {fund_data['Prop_Code'].nunique()}")
-    print(f"  Total vacant spaces: {len(vacant_spaces)}")
-    print(f"  Total vacant SF: {vacant_spaces['Area'].sum():,.0f}")
+    print(f"  Properties with vacancy: {fund_properties['has_vacancy'].sum()} out of {len(fund_properties)}")
+    print(f"  Total vacant spaces: {fund_properties['vacant_leases'].sum()}")
+    print(f"  Total vacant SF: {vacant_sf:,.0f}")
     
     # Estimate potential revenue
     avg_rent_psf = fund_data[~fund_data['Is_Vacant']]['Annual_Rent_Area'].mean()
-    potential_revenue = vacant_spaces['Area'].sum() * avg_rent_psf
+    potential_revenue = vacant_sf * avg_rent_psf
     
     print(f"  Potential annual revenue if leased: ${potential_revenue:,.0f}")
     print(f"  (Based on average rent of ${avg_rent_psf:.2f}/SF)")
@@ -4,31 +4,12 @@ from datetime import datetime
 import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
+from rent_roll_normalization import read_rent_roll, normalize_rent_roll
 warnings.filterwarnings('ignore')
 
 # Function to process each rent roll file
 def process_rent_roll(file_path, analysis_date):
-    df = pd.read_excel(file_path, sheet_name='Report1', skiprows=4)
-    df.columns = ['Property', 'Units', 'Lease', 'Lease_Type', 'Area', 'Lease_From', 'Lease_To', 
-                  'Term', 'Tenancy_Years', 'Monthly_Rent', 'Monthly_Rent_Area', 'Annual_Rent', 
-                  'Annual_Rent_Area', 'Annual_Rec_Area', 'Annual_Misc_Area', 'Security_Deposit', 'LOC_Amount']
-    
-    df = df.dropna(subset=['Property'])
-    df['Prop_Code'] = df['Property'].str.extract(r'\(([^)]+)\)')
-    df['Fund'] = df['Prop_Code'].apply(lambda x: 'Fund 3' if str(x).startswith('3') else ('Fund 2' if str(x).startswith('x') else 'Other') if pd.notna(x) else 'Unknown')
-    
-    df['Lease_To'] = pd.to_datetime(df['Lease_To'], errors='coerce')
-    df['Is_Vacant'] = df['Lease'].str.contains('VACANT', na=False)
-    df['Months_To_Expiry'] = df.apply(lambda row: 
-        max((row['Lease_To'] - analysis_date).days / 30.44, 0) if pd.notna(row['Lease_To']) and not row['Is_Vacant'] else 0, 
-        axis=1)
-    
-    numeric_cols = ['Area', 'Monthly_Rent', 'Annual_Rent', 'Annual_Rent_Area']
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    df_valid = df[df['Area'].notna() & (df['Area'] > 0) & df['Fund'].isin(['Fund 2', 'Fund 3'])]
-    return df_valid
+    return normalize_rent_roll(read_rent_roll(file_path), analysis_date)
 
 # Load data
 dec_data = process_rent_roll('Faropoint Rent Roll All Funds (24DEC).xlsx', datetime(2024, 12, 31))
@@ -4,6 +4,7 @@ from datetime import datetime
 import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
+from rent_roll_normalization import read_rent_roll, normalize_rent_roll
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -11,29 +12,8 @@ plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
 
 # Read and prepare data
-df = pd.read_excel('Faropoint Rent Roll All Funds (25JUN).xlsx', sheet_name='Report1', skiprows=4)
-df.columns = ['Property', 'Units', 'Lease', 'Lease_Type', 'Area', 'Lease_From', 'Lease_To', 
-              'Term', 'Tenancy_Years', 'Monthly_Rent', 'Monthly_Rent_Area', 'Annual_Rent', 
-              'Annual_Rent_Area', 'Annual_Rec_Area', 'Annual_Misc_Area', 'Security_Deposit', 'LOC_Amount']
-
-# Data cleaning
-df = df.dropna(subset=['Property'])
-df['Prop_Code'] = df['Property'].str.extract(r'\(([^)]+)\)')
-df['Fund'] = df['Prop_Code'].apply(lambda x: 'Fund 3' if str(x).startswith('3') else ('Fund 2' if str(x).startswith('x') else 'Other') if pd.notna(x) else 'Unknown')
-
-# Process dates and numeric columns
 reference_date = datetime(2025, 6, 30)
-df['Lease_To'] = pd.to_datetime(df['Lease_To'], errors='coerce')
-df['Is_Vacant'] = df['Lease'].str.contains('VACANT', na=False)
-df['Months_To_Expiry'] = df.apply(lambda row: 
-    max((row['Lease_To'] - reference_date).days / 30.44, 0) if pd.notna(row['Lease_To']) and not row['Is_Vacant'] else 0, 
-    axis=1)
-
-numeric_cols = ['Area', 'Monthly_Rent', 'Annual_Rent', 'Annual_Rent_Area']
-for col in numeric_cols:
-    df[col] = pd.to_numeric(df[col], errors='coerce')
-
-df_valid = df[df['Area'].notna() & (df['Area'] > 0) & df['Fund'].isin(['Fund 2', 'Fund 3'])]
+df_valid = normalize_rent_roll(read_rent_roll('Faropoint Rent Roll All Funds (25JUN).xlsx'), reference_date)
 
 # Create figure with subplots
 fig = plt.figure(figsize=(20, 24))
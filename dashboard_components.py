@@ -2,6 +2,10 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
+from dash import dash_table
+from dash.dash_table.Format import Format, Scheme, Group
+from metrics_cube import as_cube
+from revenue_bridge import BRIDGE_COMPONENTS, BRIDGE_LABELS
 
 class DashboardComponents:
     """Reusable components for the BI dashboard"""
@@ -34,27 +38,23 @@ class DashboardComponents:
     
     @staticmethod
     def create_occupancy_trend(metrics):
-        """Create occupancy trend chart"""
-        periods = ['Q4 2024', 'Q1 2025', 'Q2 2025']
-        occupancy_rates = [
-            metrics['Q4_2024']['occupancy_rate'],
-            metrics['Q1_2025']['occupancy_rate'],
-            metrics['Q2_2025']['occupancy_rate']
-        ]
+        """Create occupancy trend chart from fund metrics or a MetricsCube (one line per fund)"""
+        cube = as_cube(metrics)
         
         fig = go.Figure()
         
         # Add occupancy line
-        fig.add_trace(go.Scatter(
-            x=periods,
-            y=occupancy_rates,
-            mode='lines+markers',
-            name='Occupancy Rate',
-            line=dict(color='#2E86AB', width=3),
-            marker=dict(size=10),
-            text=[f'{rate:.1f}%' for rate in occupancy_rates],
-            textposition='top center'
-        ))
+        for fund, occupancy_rates in zip(cube.funds, cube.metric('occupancy_rate').tolist()):
+            fig.add_trace(go.Scatter(
+                x=cube.labels,
+                y=occupancy_rates,
+                mode='lines+markers',
+                name='Occupancy Rate' if len(cube.funds) == 1 else fund,
+                line=dict(color='#2E86AB', width=3) if len(cube.funds) == 1 else dict(width=3),
+                marker=dict(size=10),
+                text=[f'{rate:.1f}%' for rate in occupancy_rates],
+                textposition='top center'
+            ))
         
         # Add target line
         fig.add_hline(y=95, line_dash="dash", line_color="green", 
@@ -72,19 +72,36 @@ class DashboardComponents:
         return fig
     
     @staticmethod
-    def create_revenue_waterfall(metrics):
-        """Create revenue waterfall chart"""
-        q1_rev = metrics['Q1_2025']['annual_revenue'] / 1e6
-        q2_rev = metrics['Q2_2025']['annual_revenue'] / 1e6
-        change = q2_rev - q1_rev
+    def create_revenue_waterfall(metrics, bridge=None):
+        """Create revenue waterfall chart (latest vs previous period of the first fund)
+        
+        With a precomputed revenue bridge (calculate_fund_metrics()['revenue_bridge']) the
+        change is split into new leases, move-outs, renewals and rent changes.
+        """
+        cube = as_cube(metrics)
+        revenue = cube.metric('annual_revenue')[0] / 1e6
+        prior, current = max(len(cube.periods) - 2, 0), len(cube.periods) - 1
+        q1_rev = revenue[prior]
+        q2_rev = revenue[current]
+        
+        if bridge is not None:
+            steps = [bridge[component] / 1e6 for component in BRIDGE_COMPONENTS]
+            x = [cube.labels[prior]] + [BRIDGE_LABELS[component] for component in BRIDGE_COMPONENTS] + [cube.labels[current]]
+            y = [q1_rev] + steps + [None]
+            text = [f'${q1_rev:.1f}M'] + [f'{step:+.1f}M' for step in steps] + [f'${q2_rev:.1f}M']
+        else:
+            change = q2_rev - q1_rev
+            x = [cube.labels[prior], 'Change', cube.labels[current]]
+            y = [q1_rev, change, None]
+            text = [f'${q1_rev:.1f}M', f'{change:+.1f}M', f'${q2_rev:.1f}M']
         
         fig = go.Figure()
         
         fig.add_trace(go.Waterfall(
-            x=['Q1 2025', 'Change', 'Q2 2025'],
-            y=[q1_rev, change, None],
-            measure=['absolute', 'relative', 'total'],
-            text=[f'${q1_rev:.1f}M', f'{change:+.1f}M', f'${q2_rev:.1f}M'],
+            x=x,
+            y=y,
+            measure=['absolute'] + ['relative'] * (len(x) - 2) + ['total'],
+            text=text,
             textposition='auto',
             connector={'line': {'color': 'rgb(63, 63, 63)'}},
             increasing={'marker': {'color': 'green'}},
@@ -93,7 +110,7 @@ class DashboardComponents:
         ))
         
         fig.update_layout(
-            title='Q2 2025 Revenue Change Analysis',
+            title=f"{cube.labels[current]} Revenue Change Analysis",
             yaxis_title='Annual Revenue ($M)',
             height=350,
             showlegend=False
@@ -142,17 +159,17 @@ class DashboardComponents:
     
     @staticmethod
     def create_property_heatmap(top_properties):
-        """Create property performance heatmap"""
+        """Create property performance heatmap from top_properties() dicts or a property_rollup() slice"""
         df = pd.DataFrame(top_properties)
+        rent = df['annual_rent'].to_numpy() / 1e6
         
         # Create a matrix for the heatmap
         fig = go.Figure(data=go.Heatmap(
-            z=[[prop['annual_rent']/1e6 for prop in top_properties]],
-            x=[prop['property'][:20] for prop in top_properties],
+            z=[rent],
+            x=df['property'].str[:20],
             y=['Annual Rent ($M)'],
             colorscale='Blues',
-            text=[[f"${prop['annual_rent']/1e6:.2f}M<br>{prop['total_sf']:,.0f} SF" 
-                   for prop in top_properties]],
+            text=[[f"${value:.2f}M<br>{sf:,.0f} SF" for value, sf in zip(rent, df['total_sf'])]],
             texttemplate="%{text}",
             textfont={"size": 10},
             showscale=True
@@ -233,19 +250,19 @@ class DashboardComponents:
     
     @staticmethod
     def create_quarterly_comparison_table(metrics):
-        """Create quarterly metrics comparison table"""
-        data = []
-        
-        for period in ['Q4_2024', 'Q1_2025', 'Q2_2025']:
-            m = metrics[period]
-            data.append([
-                period.replace('_', ' '),
-                f"{m['occupancy_rate']:.1f}%",
-                f"${m['annual_revenue']/1e6:.1f}M",
-                f"${m['avg_rent_psf']:.2f}",
-                f"{m['walt']:.1f}",
-                f"{m['vacant_sf']:,.0f}"
-            ])
+        """Create quarterly metrics comparison table for the first fund of fund metrics or a MetricsCube"""
+        cube = as_cube(metrics)
+        columns = cube.sel(funds=cube.funds[:1], metrics=['occupancy_rate', 'annual_revenue', 'avg_rent_psf',
+                                                          'walt', 'vacant_sf']).values[0].T.tolist()
+        occupancy, revenue, rent_psf, walt, vacant_sf = columns
+        data = list(zip(
+            cube.labels,
+            [f"{v:.1f}%" for v in occupancy],
+            [f"${v/1e6:.1f}M" for v in revenue],
+            [f"${v:.2f}" for v in rent_psf],
+            [f"{v:.1f}" for v in walt],
+            [f"{v:,.0f}" for v in vacant_sf]
+        ))
         
         fig = go.Figure(data=[go.Table(
             header=dict(
@@ -272,17 +289,176 @@ class DashboardComponents:
         return fig
     
     @staticmethod
-    def create_leasing_velocity_chart(metrics):
-        """Create leasing velocity chart"""
-        periods = ['Q1 2025', 'Q2 2025']
-        new_leases = [
-            metrics['Q1_2025']['occupied_leases'] - metrics['Q4_2024']['occupied_leases'],
-            metrics['q2_summary']['new_leases']
-        ]
-        lost_leases = [
-            metrics['Q4_2024']['occupied_leases'] - metrics['Q1_2025']['occupied_leases'],
-            metrics['q2_summary']['lost_leases']
+    def create_rent_projection_chart(projection):
+        """Create contractual rent projection chart from calculate_fund_metrics()['rent_projection']"""
+        months = pd.to_datetime(projection['months'])
+        rent = [value / 1e6 for value in projection['monthly_rent']]
+        
+        fig = go.Figure()
+        
+        fig.add_trace(go.Scatter(
+            x=months,
+            y=rent,
+            mode='lines',
+            fill='tozeroy',
+            name='Contractual Rent',
+            line=dict(color='#2E86AB', width=2),
+            hovertemplate='%{x|%b %Y}: $%{y:.2f}M<extra></extra>'
+        ))
+        
+        title = 'Contractual Rent Roll-off (In-Place Leases)'
+        holdover = projection.get('holdover')
+        if holdover and holdover['leases']:
+            term = f"{holdover['months']} months" if holdover['months'] is not None else 'the full horizon'
+            title += (f"<br><span style='font-size:0.8em'>{holdover['leases']} holdover leases "
+                      f"(${holdover['monthly_rent'] / 1e3:,.0f}K/mo) projected for {term}; "
+                      f"${holdover['excluded_rent'] / 1e6:,.2f}M beyond that excluded</span>")
+        
+        fig.update_layout(
+            title=title,
+            xaxis_title='Month',
+            yaxis_title='Monthly Rent ($M)',
+            height=350,
+            showlegend=False
+        )
+        
+        return fig
+    
+    @staticmethod
+    def create_walt_curve_chart(curve):
+        """Create WALT decay chart from one fund's processor.walt_curve() rows (indexed by As_Of)"""
+        fig = make_subplots(specs=[[{'secondary_y': True}]])
+        
+        fig.add_trace(
+            go.Scatter(x=curve.index, y=curve['walt'], mode='lines', name='WALT (months)',
+                       line=dict(color='#2E86AB', width=3)),
+            secondary_y=False
+        )
+        fig.add_trace(
+            go.Scatter(x=curve.index, y=curve['occupied_sf'] / 1e6, mode='lines', name='Occupied SF (M)',
+                       line=dict(color='#A23B72', width=2, dash='dot')),
+            secondary_y=True
+        )
+        
+        fig.update_layout(
+            title='WALT Decay of In-Place Leases',
+            height=350,
+            hovermode='x unified',
+            legend=dict(orientation='h', y=-0.2)
+        )
+        fig.update_yaxes(title_text='WALT (months)', secondary_y=False)
+        fig.update_yaxes(title_text='Occupied SF (M)', secondary_y=True)
+        
+        return fig
+    
+    @staticmethod
+    def create_rent_distribution_chart(distribution):
+        """Create rent/SF histogram (SF per bin) with the unweighted and SF-weighted medians in the title"""
+        histogram = distribution['histogram']
+        stats = distribution['statistics']
+        fig = go.Figure()
+        
+        fig.add_trace(go.Bar(
+            x=histogram['bins'],
+            y=[sf / 1e6 for sf in histogram['sf']],
+            customdata=histogram['count'],
+            marker_color='#2E86AB',
+            name='Occupied SF',
+            hovertemplate='%{x}: %{y:.2f}M SF in %{customdata} leases<extra></extra>'
+        ))
+        
+        def money(value):
+            return f"${value:.2f}" if value is not None else 'n/a'
+        
+        fig.update_layout(
+            title=(f"Rent/SF Distribution<br><span style='font-size:0.8em'>Median {money(stats.get('p50'))}"
+                   f" | SF-weighted median {money(stats.get('weighted_p50'))}</span>"),
+            xaxis_title='Annual Rent/SF',
+            yaxis_title='Occupied SF (M)',
+            height=350,
+            showlegend=False
+        )
+        
+        return fig
+
+    @staticmethod
+    def create_vacancy_aging_chart(aging):
+        """Create vacant SF by months of downtime, with the SF-weighted average downtime in the title"""
+        buckets = aging['buckets']
+        fig = go.Figure()
+
+        fig.add_trace(go.Bar(
+            x=buckets['labels'],
+            y=[sf / 1e3 for sf in buckets['sf']],
+            customdata=buckets['count'],
+            marker_color='#C73E1D',
+            name='Vacant SF',
+            hovertemplate='%{x}: %{y:,.0f}K SF in %{customdata} units<extra></extra>'
+        ))
+
+        fig.update_layout(
+            title=(f"Vacancy Aging<br><span style='font-size:0.8em'>{aging['vacant_units']} vacant units"
+                   f" | avg downtime {aging['avg_downtime_months']:.1f} months</span>"),
+            xaxis_title='Months Vacant',
+            yaxis_title='Vacant SF (K)',
+            height=350,
+            showlegend=False
+        )
+
+        return fig
+
+    @staticmethod
+    def create_property_risk_table(scores, page_size=15):
+        """Create a sortable, filterable property risk table from processor.property_risk() rows
+        
+        Sorting, filtering and paging run in the browser, so only one page of rows is
+        rendered at a time however many properties there are.
+        """
+        columns = [
+            ('property', 'Property', None),
+            ('overall_risk_score', 'Risk Score', Format(precision=0, scheme=Scheme.fixed)),
+            ('risk_level', 'Risk Level', None),
+            ('occupancy_rate', 'Occupancy %', Format(precision=1, scheme=Scheme.fixed)),
+            ('walt', 'WALT (mo)', Format(precision=1, scheme=Scheme.fixed)),
+            ('near_term_expiry_pct', 'Near-term Expiry %', Format(precision=1, scheme=Scheme.fixed)),
+            ('top_10_concentration', 'Top 10 Tenants %', Format(precision=1, scheme=Scheme.fixed)),
+            ('total_sf', 'Total SF', Format(precision=0, scheme=Scheme.fixed, group=Group.yes)),
+            ('annual_revenue', 'Annual Revenue', Format(precision=0, scheme=Scheme.fixed, group=Group.yes)),
         ]
+        level_colors = {'High': '#f8d7da', 'Medium': '#fff3cd', 'Low': '#d4edda'}
+        
+        return dash_table.DataTable(
+            data=scores[[column for column, _, _ in columns]].to_dict('records'),
+            columns=[{'id': column, 'name': name, 'type': 'numeric', 'format': fmt} if fmt is not None
+                     else {'id': column, 'name': name} for column, name, fmt in columns],
+            sort_action='native',
+            filter_action='native',
+            page_action='native',
+            page_size=page_size,
+            style_table={'overflowX': 'auto'},
+            style_cell={'padding': '6px', 'fontSize': 13, 'textAlign': 'right'},
+            style_cell_conditional=[{'if': {'column_id': 'property'}, 'textAlign': 'left'}],
+            style_header={'backgroundColor': 'lightgray', 'fontWeight': 'bold'},
+            style_data_conditional=[
+                {'if': {'filter_query': f'{{risk_level}} = "{level}"', 'column_id': 'risk_level'},
+                 'backgroundColor': color}
+                for level, color in level_colors.items()
+            ]
+        )
+    
+    @staticmethod
+    def create_leasing_velocity_chart(metrics):
+        """Create leasing velocity chart from fund metrics or a MetricsCube"""
+        # Earlier quarters only have net occupied-lease movement; fund metrics add lease-level
+        # counts for the latest quarter, while a cube shows net movement throughout
+        cube = as_cube(metrics)
+        periods = cube.labels[1:]
+        net = cube.qoq().metric('occupied_leases')[0, 1:].astype(int).tolist()
+        new_leases = net.copy()
+        lost_leases = [-v for v in net]
+        if isinstance(metrics, dict) and new_leases:
+            new_leases[-1] = metrics['q2_summary']['new_leases']
+            lost_leases[-1] = metrics['q2_summary']['lost_leases']
         
         fig = go.Figure()
         
@@ -1,237 +1,527 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import hashlib
 import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from snapshot_cache import SnapshotCache, FileDigests, DEFAULT_CACHE_DIR, METRICS_DIR, PIPELINE_VERSION
+from streaming_reader import read_rent_roll_streaming, DEFAULT_BATCH_SIZE
+from snapshot_registry import SnapshotRegistry, DEFAULT_MAX_LOADED
+from rent_roll_normalization import read_rent_roll, normalize_rent_roll, canonical_columns, ANALYSIS_COLUMNS
+from fund_classification import FundClassifier, DEFAULT_CONFIG
+from compact_frames import SharedCategories, frame_bytes
+from history_store import HistoryStore, DEFAULT_HISTORY_DIR
+from metrics_engine import stack_snapshots, grouped_period_metrics
+from metrics_cube import MetricsCube
+from metrics_memo import MetricsMemo, memo_key
+from expiry_buckets import DASHBOARD_BUCKETS, expiry_table, bucket_summary
+from lease_diff import diff_snapshots, status_counts
+from revenue_bridge import revenue_bridge, bridge_summary
+from property_rollup import property_rollup, top_properties
+from cashflow_projection import (project_rent, holdover_exposure, projection_summary, DEFAULT_HORIZON,
+                                 DEFAULT_HOLDOVER_MONTHS)
+from walt_curve import walt_curve, month_end_grid, DEFAULT_CURVE_MONTHS
+from scenario_engine import ScenarioEngine
+from rent_statistics import rent_statistics, rent_histogram, distribution_summary, RENT_BINS
+from tenant_resolution import TenantRegistry, DEFAULT_TENANT_MAP
+from risk_scoring import risk_inputs, score_risk, risk_summary
+from occupancy_simulation import simulate_occupancy, DEFAULT_PATHS, DEFAULT_SIM_HORIZON
+from vacancy_aging import VacancyTracker, aging_table, aging_summary
+
+# Bump whenever calculate_fund_metrics, generate_insights or metrics_engine change their
+# results, so memoized metrics from older code are never served.
+METRICS_VERSION = '10'
+
+
+def _parse_snapshot_worker(file_path, analysis_date, streaming, batch_size, funds, fund_config, columns):
+    """Parse one workbook in a worker process (module level so it can be pickled)"""
+    processor = RentRollProcessor(use_cache=False, streaming=streaming, batch_size=batch_size,
+                                  funds=funds, fund_config=fund_config, columns=columns)
+    return processor._parse_counted(file_path, analysis_date)
+
 
 class RentRollProcessor:
     """Process rent roll data for dashboard visualization"""
     
-    def __init__(self):
-        self.dec_data = None
-        self.mar_data = None
-        self.jun_data = None
+    def __init__(self, use_cache=True, cache_dir=DEFAULT_CACHE_DIR, streaming=False, batch_size=DEFAULT_BATCH_SIZE,
+                 data_dir='.', max_loaded=DEFAULT_MAX_LOADED, funds=None, fund_config=DEFAULT_CONFIG, compact=False,
+                 columns=ANALYSIS_COLUMNS, history_dir=DEFAULT_HISTORY_DIR, memoize=True,
+                 expiry_buckets=DASHBOARD_BUCKETS, risk_rules=None, risk_weights=None,
+                 tenant_map=DEFAULT_TENANT_MAP, holdover_months=DEFAULT_HOLDOVER_MONTHS):
         self.metrics = {}
-        
-    def load_data(self):
-        """Load all three rent roll files"""
-        self.dec_data = self._process_rent_roll('Faropoint Rent Roll All Funds (24DEC).xlsx', datetime(2024, 12, 31))
-        self.mar_data = self._process_rent_roll('Faropoint Rent Roll All Funds (25MAR).xlsx', datetime(2025, 3, 31))
-        self.jun_data = self._process_rent_roll('Faropoint Rent Roll All Funds (25JUN).xlsx', datetime(2025, 6, 30))
+        self.fund_config = fund_config
+        self.classifier = FundClassifier.from_config(fund_config)
+        # Funds kept in the processed frames; defaults to the config's "include" list
+        self.funds = tuple(funds) if funds is not None else self.classifier.include
+        # {file_path: {Prop_Code: rows}} matching no fund rule, per snapshot parsed or loaded from the cache
+        self._unmatched = {}
+        # Source columns to read; pass columns=None to keep every column of the export
+        self.columns = canonical_columns(columns)
+        options = json.dumps([self.classifier.fingerprint(self.funds), self.columns])
+        self.pipeline_version = f"{PIPELINE_VERSION}-{hashlib.sha256(options.encode()).hexdigest()[:12]}"
+        # Workbook hashes shared by the snapshot cache keys and the metrics fingerprints
+        self.digests = FileDigests()
+        self.cache = SnapshotCache(cache_dir, self.pipeline_version, self.digests) if use_cache else None
+        self.history = HistoryStore(history_dir)
+        # Metrics memo: in-process LRU, plus pickles under the cache directory when the cache is on
+        memo_dir = os.path.join(cache_dir, METRICS_DIR) if use_cache else None
+        self.memo = MetricsMemo(cache_dir=memo_dir) if memoize else None
+        # Buckets behind metrics['expiry_analysis']
+        self.expiry_buckets = expiry_buckets
+        # Months holdover and month-to-month leases keep paying in metrics['rent_projection'] (None: the whole horizon)
+        self.holdover_months = holdover_months
+        # Overrides of risk_scoring.RISK_RULES and per-component weights behind metrics['risk_metrics']
+        self.risk_rules = risk_rules
+        self.risk_weights = risk_weights
+        # Canonical tenant IDs behind the concentration metrics; pass tenant_map=None to keep them in memory only
+        self.tenants = TenantRegistry(tenant_map)
+        # {period: (workbook hash, ScenarioEngine)}; engines hold whole-snapshot arrays, so they stay
+        # in process rather than going through the metrics memo
+        self._scenario_engines = {}
+        # Opt-in compact frames: categoricals sharing one dictionary across snapshots, downcast numerics
+        self.categories = SharedCategories() if compact else None
+        self.streaming = streaming
+        self.batch_size = batch_size
+        self.snapshots = SnapshotRegistry(self._process_rent_roll, self.load_snapshots,
+                                          data_dir=data_dir, max_loaded=max_loaded)
+        
+    def load_data(self, parallel=False, max_workers=None, preload=False):
+        """Discover rent roll snapshots; each one is parsed on first access
+        
+        With preload=True (implied by parallel=True) the most recent snapshots, up to the
+        registry's LRU bound, are parsed immediately. Tenant names of snapshots new to the
+        tenant map are registered here (see sync_tenants).
+        """
+        self.snapshots.discover()
+        if preload or parallel:
+            self.snapshots.preload(parallel=parallel, max_workers=max_workers)
+        self.sync_tenants()
+    
+    def sync_tenants(self):
+        """Register the tenant names of every snapshot the tenant map has not seen yet
+        
+        Run by load_data so the map, and with it the tenant fingerprint in memo keys, is
+        settled before any key is built. Snapshots are recorded in the map by workbook
+        hash, so unchanged workbooks are not loaded again.
+        """
+        for key, snapshot in self.snapshots.snapshots.items():
+            sha = self.file_digest(snapshot.file_path)
+            if not self.tenants.synced(sha):
+                self.tenants.sync(sha, self.snapshots[key]['Tenant_Name'].to_numpy(dtype=object))
+    
+    def load_snapshots(self, snapshots, parallel=False, max_workers=None):
+        """Process (file_path, analysis_date) pairs and return the frames in the same order
+        
+        With parallel=True, workbooks missing from the cache are parsed concurrently in a
+        process pool of max_workers (default: CPU count). Falls back to serial parsing when
+        there is nothing to parallelize or the pool cannot be started.
+        """
+        frames = [None] * len(snapshots)
+        pending = []
+        for i, (file_path, analysis_date) in enumerate(snapshots):
+            key = self.cache.key(file_path, analysis_date) if self.cache is not None else None
+            frames[i] = self.cache.load_key(key) if key is not None else None
+            if frames[i] is None:
+                pending.append((i, key, file_path, analysis_date))
+            else:
+                self._unmatched[file_path] = self.cache.unmatched(key)
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(pending))
+        parsed = None
+        if parallel and workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = [pool.submit(_parse_snapshot_worker, file_path, analysis_date,
+                                           self.streaming, self.batch_size, self.funds, self.fund_config,
+                                           self.columns)
+                               for _, _, file_path, analysis_date in pending]
+                    parsed = [future.result() for future in futures]
+            except (BrokenProcessPool, OSError):
+                parsed = None
+        if parsed is None:
+            parsed = [self._parse_counted(file_path, analysis_date)
+                      for _, _, file_path, analysis_date in pending]
+        
+        for (i, key, file_path, _), (df, unmatched) in zip(pending, parsed):
+            if key is not None:
+                self.cache.store_key(key, file_path, df, unmatched)
+            self._unmatched[file_path] = unmatched
+            frames[i] = df
+        if self.cache is not None:
+            self.cache.flush_stats()
+        return [self._compact(df) for df in frames]
         
     def _process_rent_roll(self, file_path, analysis_date):
-        """Process individual rent roll file"""
-        df = pd.read_excel(file_path, sheet_name='Report1', skiprows=4)
-        
-        df.columns = ['Property', 'Units', 'Lease', 'Lease_Type', 'Area', 'Lease_From', 'Lease_To', 
-                      'Term', 'Tenancy_Years', 'Monthly_Rent', 'Monthly_Rent_Area', 'Annual_Rent', 
-                      'Annual_Rent_Area', 'Annual_Rec_Area', 'Annual_Misc_Area', 'Security_Deposit', 'LOC_Amount']
-        
-        df = df.dropna(subset=['Property'])
-        df['Prop_Code'] = df['Property'].str.extract(r'\(([^)]+)\)')
-        df['Fund'] = df['Prop_Code'].apply(lambda x: 'Fund 3' if str(x).startswith('3') else ('Fund 2' if str(x).startswith('x') else 'Other') if pd.notna(x) else 'Unknown')
-        
-        df['Lease_To'] = pd.to_datetime(df['Lease_To'], errors='coerce')
-        df['Is_Vacant'] = df['Lease'].str.contains('VACANT', na=False)
-        df['Months_To_Expiry'] = df.apply(lambda row: 
-            max((row['Lease_To'] - analysis_date).days / 30.44, 0) if pd.notna(row['Lease_To']) and not row['Is_Vacant'] else 0, 
-            axis=1)
-        
-        numeric_cols = ['Area', 'Monthly_Rent', 'Annual_Rent', 'Annual_Rent_Area']
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        df_valid = df[df['Area'].notna() & (df['Area'] > 0) & df['Fund'].isin(['Fund 2', 'Fund 3'])]
-        
-        # Add tenant name extraction
-        df_valid['Tenant_Name'] = df_valid['Lease'].str.extract(r'^([^(]+)')
-        df_valid['Tenant_Name'] = df_valid['Tenant_Name'].str.strip()
-        
-        return df_valid
+        """Process individual rent roll file, reusing the cached frame when the workbook is unchanged"""
+        return self.load_snapshots([(file_path, analysis_date)])[0]
+    
+    def _compact(self, df):
+        """Compact a processed frame when enabled, keeping loaded snapshots on the same categories"""
+        if self.categories is None:
+            return df
+        df = self.categories.compact(df)
+        for _, loaded in self.snapshots.loaded_frames():
+            self.categories.align(loaded)
+        return df
+    
+    def sync_history(self):
+        """Write new or changed snapshots to the history store and drop ones whose workbook is gone
+        
+        Returns the periods that were (re)written; unchanged snapshots are not loaded at all.
+        """
+        written = []
+        for key, snapshot in self.snapshots.snapshots.items():
+            sha = self.file_digest(snapshot.file_path)
+            if self.history.is_current(snapshot.analysis_date, sha, self.pipeline_version):
+                continue
+            self.history.write_snapshot(self.snapshots[key], snapshot.analysis_date, key, sha,
+                                        self.pipeline_version)
+            written.append(key)
+        
+        known = {f"{snapshot.analysis_date:%Y-%m-%d}" for snapshot in self.snapshots.snapshots.values()}
+        for date in set(self.history.manifest()) - known:
+            self.history.remove_snapshot(pd.Timestamp(date))
+        return written
+    
+    def scan_history(self, start=None, end=None, columns=None, funds=None, properties=None, sync=True):
+        """Lease rows of every snapshot dated within [start, end] from the history store
+        
+        Reads only the requested columns plus Snapshot_Date; fund filters skip whole
+        partitions and property codes are pushed down to the Parquet row groups. With
+        sync=True new or changed workbooks are written to the store first.
+        """
+        if sync:
+            self.sync_history()
+        return self.history.scan(start, end, columns, funds, properties)
+    
+    def memory_report(self):
+        """Rows and deep memory use in bytes of every snapshot currently held in memory
+        
+        In compact mode the shared category dictionary is counted once in total_bytes.
+        """
+        periods = {}
+        for period, df in self.snapshots.loaded_frames():
+            periods[period] = {'rows': len(df), 'bytes': frame_bytes(df)}
+        dictionary_bytes = self.categories.nbytes if self.categories is not None else 0
+        return {
+            'compact': self.categories is not None,
+            'periods': periods,
+            'dictionary_bytes': dictionary_bytes,
+            'total_bytes': sum(entry['bytes'] for entry in periods.values()) + dictionary_bytes
+        }
+    
+    def cache_stats(self):
+        """Return snapshot cache hits, misses and size on disk"""
+        return self.cache.stats() if self.cache is not None else {}
+    
+    def invalidate_cache(self, file_paths=None):
+        """Drop cached snapshots and memoized metrics so the next load re-parses the workbooks"""
+        if self.memo is not None:
+            self.memo.clear()
+        return self.cache.invalidate(file_paths) if self.cache is not None else 0
+    
+    def _parse_rent_roll(self, file_path, analysis_date):
+        """Parse and clean a rent roll workbook"""
+        if self.streaming:
+            return read_rent_roll_streaming(file_path, analysis_date, batch_size=self.batch_size,
+                                            funds=self.funds, classifier=self.classifier, columns=self.columns)
+        
+        return normalize_rent_roll(read_rent_roll(file_path, columns=self.columns), analysis_date,
+                                   self.funds, self.classifier)
+    
+    def _parse_counted(self, file_path, analysis_date):
+        """Parse a workbook; returns the frame and {Prop_Code: rows} of the codes that matched no fund rule"""
+        before = Counter(self.classifier.unmatched)
+        df = self._parse_rent_roll(file_path, analysis_date)
+        return df, dict(self.classifier.unmatched - before)
+    
+    def unmatched_prop_codes(self):
+        """Property codes of every discovered snapshot that matched no fund rule, with row counts
+        
+        The counts are stored with each cached snapshot, so snapshots served from the cache
+        or parsed in a worker process are included; snapshots not loaded yet are loaded.
+        """
+        totals = Counter()
+        for period, snapshot in self.snapshots.snapshots.items():
+            if snapshot.file_path not in self._unmatched:
+                # Loading the snapshot (from the cache or the workbook) records its counts
+                self.snapshots[period]
+            totals.update(self._unmatched.get(snapshot.file_path, {}))
+        return dict(totals)
+    
+    def file_digest(self, file_path):
+        """SHA-256 of a workbook, rehashed only when its mtime or size changes"""
+        return self.digests(file_path)
+    
+    def snapshot_fingerprint(self):
+        """(period, workbook hash) for every discovered snapshot, plus the pipeline version"""
+        return [self.pipeline_version] + [[key, self.file_digest(snapshot.file_path)]
+                                          for key, snapshot in self.snapshots.snapshots.items()]
+    
+    def _memoized(self, kind, compute, *parts):
+        if self.memo is None:
+            return compute()
+        key = memo_key(kind, METRICS_VERSION, self.snapshot_fingerprint(), *parts)
+        return self.memo.get_or_compute(key, compute)
+    
+    def memo_stats(self):
+        """In-process and on-disk hits and misses of the metrics memo"""
+        return self.memo.stats() if self.memo is not None else {}
+    
+    def calculate_period_metrics(self, funds=None):
+        """Period metrics for every (fund, period) pair in one grouped pass: {fund: {period: metrics}}"""
+        return self._memoized('period_metrics', lambda: self._compute_period_metrics(funds),
+                              None if funds is None else list(funds))
+    
+    def _compute_period_metrics(self, funds):
+        """Run the grouped metrics engine over every registry snapshot"""
+        periods = self.snapshots.periods
+        stacked = stack_snapshots({period: self.snapshots[period] for period in periods})
+        labels = {period: self.snapshots.label(period) for period in periods}
+        return grouped_period_metrics(stacked, periods, labels, funds)
+    
+    def metrics_cube(self, funds=None):
+        """Period metrics of every fund and period as a fund x period x metric MetricsCube"""
+        return MetricsCube.from_period_metrics(self.calculate_period_metrics(funds), self.snapshots.periods)
     
     def calculate_fund_metrics(self, fund):
+        """Calculate comprehensive metrics for a specific fund (memoized on the snapshot fingerprints)"""
+        return self._memoized('fund_metrics', lambda: self._compute_fund_metrics(fund),
+                              *self._fund_metrics_parts(fund))
+    
+    def _fund_metrics_parts(self, fund):
+        """Memo key parts of a fund's metrics besides the snapshot fingerprint"""
+        return [fund, self.expiry_buckets.spec(), self.risk_rules, self.risk_weights, self.tenants.fingerprint(),
+                self.holdover_months]
+    
+    def _compute_fund_metrics(self, fund):
         """Calculate comprehensive metrics for a specific fund"""
-        metrics = {
-            'Q4_2024': self._calculate_period_metrics(self.dec_data, fund, 'Q4 2024'),
-            'Q1_2025': self._calculate_period_metrics(self.mar_data, fund, 'Q1 2025'),
-            'Q2_2025': self._calculate_period_metrics(self.jun_data, fund, 'Q2 2025')
-        }
+        metrics = dict(self.calculate_period_metrics([fund])[fund])
         
-        # Calculate Q2 specific metrics
-        q2_data = self.jun_data[self.jun_data['Fund'] == fund]
-        mar_data = self.mar_data[self.mar_data['Fund'] == fund]
+        latest = self.snapshots.latest
+        previous = self.snapshots.previous or latest
+        metrics['periods'] = self.snapshots.periods
+        metrics['latest_period'] = latest
+        metrics['previous_period'] = previous
         
-        # Q2 Performance Summary
+        # Calculate latest-quarter specific metrics
+        activity = status_counts(self.lease_diff(previous, latest)).reindex([fund], fill_value=0).iloc[0]
+        
+        # Latest quarter performance summary vs the prior snapshot
+        current, prior = metrics[latest], metrics[previous]
         metrics['q2_summary'] = {
-            'occupancy_change': metrics['Q2_2025']['occupancy_rate'] - metrics['Q1_2025']['occupancy_rate'],
-            'revenue_change': ((metrics['Q2_2025']['annual_revenue'] - metrics['Q1_2025']['annual_revenue']) / 
-                              metrics['Q1_2025']['annual_revenue'] * 100) if metrics['Q1_2025']['annual_revenue'] > 0 else 0,
-            'walt_change': metrics['Q2_2025']['walt'] - metrics['Q1_2025']['walt'],
-            'new_leases': self._count_new_leases(mar_data, q2_data),
-            'lost_leases': self._count_lost_leases(mar_data, q2_data),
-            'net_absorption': metrics['Q2_2025']['occupied_sf'] - metrics['Q1_2025']['occupied_sf']
+            'occupancy_change': current['occupancy_rate'] - prior['occupancy_rate'],
+            'revenue_change': ((current['annual_revenue'] - prior['annual_revenue']) / 
+                              prior['annual_revenue'] * 100) if prior['annual_revenue'] > 0 else 0,
+            'walt_change': current['walt'] - prior['walt'],
+            'new_leases': int(activity['new']),
+            'lost_leases': int(activity['lost']),
+            'net_absorption': current['occupied_sf'] - prior['occupied_sf'],
+            'lease_activity': {status: int(count) for status, count in activity.items()}
         }
         
+        # Revenue change vs the prior snapshot split into new leases, move-outs, renewals and rent changes
+        metrics['revenue_bridge'] = bridge_summary(self.revenue_bridge(previous, latest), fund,
+                                                   self.snapshots.label(previous), self.snapshots.label(latest))
+        
+        # Contractual rent of the in-place leases for the coming months
+        metrics['rent_projection'] = projection_summary(self.rent_projection(latest), fund,
+                                                        self.holdover_exposure(latest), self.holdover_months)
+        
+        # Unweighted and SF-weighted rent/SF distribution of the occupied leases
+        metrics['rent_distribution'] = distribution_summary(self.rent_statistics(latest), self.rent_histogram(latest),
+                                                            fund)
+        
+        # How long the currently vacant units have been dark, tracked across every snapshot
+        aging = self.vacancy_aging()
+        metrics['vacancy_aging'] = aging_summary(aging, aging_table(aging), fund)
+        
         # Top properties by revenue
-        metrics['top_properties'] = self._get_top_properties(q2_data)
+        metrics['top_properties'] = top_properties(self.property_rollup(latest), fund=fund)
         
         # Expiry analysis
-        metrics['expiry_analysis'] = self._get_expiry_analysis(q2_data)
+        metrics['expiry_analysis'] = bucket_summary(self.expiry_schedule(latest), fund)
         
         # Risk metrics
-        metrics['risk_metrics'] = self._calculate_risk_metrics(q2_data, metrics)
+        metrics['risk_metrics'] = risk_summary(self.risk_scores(latest, by=('Fund',)), fund,
+                                               self.risk_rules, self.risk_weights)
         
         return metrics
     
     def _calculate_period_metrics(self, data, fund, period):
         """Calculate metrics for a specific period and fund"""
-        fund_data = data[data['Fund'] == fund]
-        occupied_data = fund_data[~fund_data['Is_Vacant']]
-        
-        total_sf = fund_data['Area'].sum()
-        occupied_sf = occupied_data['Area'].sum()
-        
-        walt = 0
-        if len(occupied_data) > 0 and occupied_data['Area'].sum() > 0:
-            walt = (occupied_data['Area'] * occupied_data['Months_To_Expiry']).sum() / occupied_data['Area'].sum()
-        
-        return {
-            'period': period,
-            'properties': fund_data['Prop_Code'].nunique(),
-            'total_leases': len(fund_data),
-            'occupied_leases': len(occupied_data),
-            'vacant_leases': fund_data['Is_Vacant'].sum(),
-            'total_sf': total_sf,
-            'occupied_sf': occupied_sf,
-            'vacant_sf': fund_data[fund_data['Is_Vacant']]['Area'].sum(),
-            'occupancy_rate': (occupied_sf / total_sf * 100) if total_sf > 0 else 0,
-            'annual_revenue': occupied_data['Annual_Rent'].sum(),
-            'monthly_revenue': occupied_data['Monthly_Rent'].sum(),
-            'avg_rent_psf': occupied_data['Annual_Rent'].sum() / occupied_sf if occupied_sf > 0 else 0,
-            'walt': walt,
-            'near_term_expiry_sf': occupied_data[occupied_data['Months_To_Expiry'] <= 12]['Area'].sum(),
-            'near_term_expiry_pct': (occupied_data[occupied_data['Months_To_Expiry'] <= 12]['Area'].sum() / 
-                                     occupied_sf * 100) if occupied_sf > 0 else 0
-        }
+        return grouped_period_metrics(stack_snapshots({period: data}), [period], funds=[fund])[fund][period]
     
-    def _count_new_leases(self, old_data, new_data):
-        """Count new leases between periods"""
-        old_tenants = set(old_data[~old_data['Is_Vacant']]['Lease'].unique())
-        new_tenants = set(new_data[~new_data['Is_Vacant']]['Lease'].unique())
-        return len(new_tenants - old_tenants)
-    
-    def _count_lost_leases(self, old_data, new_data):
-        """Count lost leases between periods"""
-        old_tenants = set(old_data[~old_data['Is_Vacant']]['Lease'].unique())
-        new_tenants = set(new_data[~new_data['Is_Vacant']]['Lease'].unique())
-        return len(old_tenants - new_tenants)
-    
-    def _get_top_properties(self, data, n=10):
-        """Get top properties by annual rent"""
-        property_summary = data.groupby(['Prop_Code', 'Property']).agg({
-            'Area': 'sum',
-            'Annual_Rent': 'sum',
-            'Is_Vacant': 'sum'
-        }).sort_values('Annual_Rent', ascending=False)
-        
-        top_props = []
-        for idx, row in property_summary.head(n).iterrows():
-            prop_name = idx[1].split('(')[0].strip()
-            top_props.append({
-                'property': prop_name,
-                'prop_code': idx[0],
-                'total_sf': row['Area'],
-                'annual_rent': row['Annual_Rent'],
-                'has_vacancy': row['Is_Vacant'] > 0
-            })
-        
-        return top_props
-    
-    def _get_expiry_analysis(self, data):
-        """Analyze lease expirations"""
-        occupied_data = data[~data['Is_Vacant']]
-        
-        buckets = {
-            '0-6 months': occupied_data[(occupied_data['Months_To_Expiry'] > 0) & 
-                                       (occupied_data['Months_To_Expiry'] <= 6)],
-            '6-12 months': occupied_data[(occupied_data['Months_To_Expiry'] > 6) & 
-                                        (occupied_data['Months_To_Expiry'] <= 12)],
-            '12-24 months': occupied_data[(occupied_data['Months_To_Expiry'] > 12) & 
-                                         (occupied_data['Months_To_Expiry'] <= 24)],
-            '24-36 months': occupied_data[(occupied_data['Months_To_Expiry'] > 24) & 
-                                         (occupied_data['Months_To_Expiry'] <= 36)],
-            '36+ months': occupied_data[occupied_data['Months_To_Expiry'] > 36]
-        }
-        
-        expiry_data = {}
-        for period, df in buckets.items():
-            expiry_data[period] = {
-                'count': len(df),
-                'sf': df['Area'].sum(),
-                'annual_rent': df['Annual_Rent'].sum()
-            }
-        
-        return expiry_data
-    
-    def _calculate_risk_metrics(self, data, metrics):
-        """Calculate risk indicators"""
-        occupied_data = data[~data['Is_Vacant']]
-        
-        # Tenant concentration
-        tenant_revenue = occupied_data.groupby('Tenant_Name')['Annual_Rent'].sum().sort_values(ascending=False)
-        total_revenue = tenant_revenue.sum()
-        
-        top_5_concentration = (tenant_revenue.head(5).sum() / total_revenue * 100) if total_revenue > 0 else 0
-        top_10_concentration = (tenant_revenue.head(10).sum() / total_revenue * 100) if total_revenue > 0 else 0
-        
-        # Calculate risk score (0-100, higher is riskier)
-        risk_score = 0
-        
-        # Occupancy risk (0-30 points)
-        occupancy = metrics['Q2_2025']['occupancy_rate']
-        if occupancy < 85:
-            risk_score += 30
-        elif occupancy < 90:
-            risk_score += 20
-        elif occupancy < 95:
-            risk_score += 10
-        
-        # WALT risk (0-30 points)
-        walt = metrics['Q2_2025']['walt']
-        if walt < 24:
-            risk_score += 30
-        elif walt < 36:
-            risk_score += 20
-        elif walt < 48:
-            risk_score += 10
-        
-        # Near-term expiry risk (0-20 points)
-        near_term_pct = metrics['Q2_2025']['near_term_expiry_pct']
-        if near_term_pct > 25:
-            risk_score += 20
-        elif near_term_pct > 15:
-            risk_score += 10
-        elif near_term_pct > 10:
-            risk_score += 5
-        
-        # Concentration risk (0-20 points)
-        if top_10_concentration > 30:
-            risk_score += 20
-        elif top_10_concentration > 20:
-            risk_score += 10
-        elif top_10_concentration > 15:
-            risk_score += 5
+    def lease_diff(self, prior=None, current=None):
+        """Lease-level diff of two snapshots (default: previous vs latest), see lease_diff.diff_snapshots"""
+        prior = prior or self.snapshots.previous or self.snapshots.latest
+        current = current or self.snapshots.latest
+        return self._memoized('lease_diff', lambda: diff_snapshots(self.snapshots[prior], self.snapshots[current]),
+                              prior, current)
+    
+    def revenue_bridge(self, prior=None, current=None):
+        """Annual revenue bridge of every fund between two snapshots (default: previous vs latest)"""
+        return revenue_bridge(self.lease_diff(prior, current))
+    
+    def rent_projection(self, period=None, horizon=DEFAULT_HORIZON, by=('Fund',)):
+        """Monthly contractual rent per group for `horizon` months after a snapshot (default: latest)
+        
+        Holdover and month-to-month leases pay for the processor's holdover_months.
+        """
+        period = period or self.snapshots.latest
+        analysis_date = self.snapshots.snapshots[period].analysis_date
+        return self._memoized('rent_projection',
+                              lambda: project_rent(self.snapshots[period], analysis_date, horizon, by,
+                                                   self.holdover_months),
+                              period, horizon, list(by), self.holdover_months)
+    
+    def holdover_exposure(self, period=None, horizon=DEFAULT_HORIZON, by=('Fund',)):
+        """Holdover leases per group of a snapshot and the rent rent_projection() leaves out beyond holdover_months"""
+        period = period or self.snapshots.latest
+        analysis_date = self.snapshots.snapshots[period].analysis_date
+        return holdover_exposure(self.snapshots[period], analysis_date, horizon, by, self.holdover_months)
+    
+    def walt_curve(self, as_of_dates=None, period=None, by=('Fund',), exact_months=False):
+        """WALT, occupied SF and near-term expiry of one snapshot (default: latest) over a grid of as-of dates
+        
+        The default grid is the snapshot date plus the next DEFAULT_CURVE_MONTHS month ends.
+        """
+        period = period or self.snapshots.latest
+        analysis_date = self.snapshots.snapshots[period].analysis_date
+        as_of_dates = month_end_grid(analysis_date) if as_of_dates is None else pd.DatetimeIndex(as_of_dates)
+        return self._memoized('walt_curve',
+                              lambda: walt_curve(self.snapshots[period], as_of_dates, analysis_date, by, exact_months),
+                              period, [f'{date:%Y-%m-%d}' for date in as_of_dates], list(by), exact_months)
+    
+    def simulate_occupancy(self, period=None, assumptions=None, n_paths=DEFAULT_PATHS, horizon=DEFAULT_SIM_HORIZON,
+                           seed=None, parallel=False, max_workers=None):
+        """Monte Carlo occupancy and revenue bands per fund for `horizon` months after a snapshot (default: latest)
+        
+        See occupancy_simulation.simulate_occupancy. Only seeded runs are memoized, since
+        an unseeded run is meant to differ every time.
+        """
+        period = period or self.snapshots.latest
+        analysis_date = self.snapshots.snapshots[period].analysis_date
+        def compute():
+            return simulate_occupancy(self.snapshots[period], analysis_date, assumptions, n_paths, horizon, seed,
+                                      parallel=parallel, max_workers=max_workers)
+        if seed is None:
+            return compute()
+        return self._memoized('occupancy_simulation', compute, period, assumptions, n_paths, horizon, seed)
+    
+    def scenario_engine(self, period=None):
+        """What-if ScenarioEngine over one snapshot (default: latest), see scenario_engine.ScenarioEngine"""
+        period = period or self.snapshots.latest
+        sha = self.file_digest(self.snapshots.snapshots[period].file_path)
+        cached = self._scenario_engines.get(period)
+        if cached is None or cached[0] != sha:
+            cached = self._scenario_engines[period] = (
+                sha, ScenarioEngine(self.snapshots[period], self.snapshots.label(period)))
+        return cached[1]
+    
+    def compare_scenarios(self, scenarios, period=None, level='fund'):
+        """Evaluate {name: overrides} against one snapshot (default: latest), side by side with the base case"""
+        period = period or self.snapshots.latest
+        return self._memoized('scenario_comparison', lambda: self.scenario_engine(period).compare(scenarios, level),
+                              period, scenarios, level)
+    
+    def rent_statistics(self, period=None, by=('Fund',)):
+        """Unweighted and SF-weighted rent/SF statistics per group of one snapshot (default: latest)
         
-        return {
-            'overall_risk_score': risk_score,
-            'risk_level': 'High' if risk_score >= 60 else 'Medium' if risk_score >= 30 else 'Low',
-            'top_5_concentration': top_5_concentration,
-            'top_10_concentration': top_10_concentration,
-            'unique_tenants': occupied_data['Tenant_Name'].nunique()
-        }
+        Pass by=('Fund', 'Prop_Code') or ('Fund', 'Lease_Type') for finer groups.
+        """
+        period = period or self.snapshots.latest
+        return self._memoized('rent_statistics', lambda: rent_statistics(self.snapshots[period], by), period, list(by))
+    
+    def rent_histogram(self, period=None, by=('Fund',), bins=RENT_BINS):
+        """Lease count and SF per rent/SF bin for every group of one snapshot (default: latest)"""
+        period = period or self.snapshots.latest
+        return self._memoized('rent_histogram', lambda: rent_histogram(self.snapshots[period], by, bins),
+                              period, list(by), list(bins))
+    
+    def property_rollup(self, period=None):
+        """Per-property roll-up of one snapshot (default: latest), indexed by Prop_Code"""
+        period = period or self.snapshots.latest
+        return self._memoized('property_rollup', lambda: property_rollup(self.snapshots[period]), period)
+    
+    def expiry_schedule(self, period=None, buckets=None, by=('Fund',), occupied_only=True):
+        """Lease count, SF and annual rent per expiry bucket for every fund (or property) of one snapshot
+        
+        Defaults to the latest period and the processor's expiry buckets; pass
+        by=('Fund', 'Prop_Code') for a per-property schedule.
+        """
+        period = period or self.snapshots.latest
+        return expiry_table(self.snapshots[period], buckets or self.expiry_buckets,
+                            self.snapshots.snapshots[period].analysis_date, by=by, occupied_only=occupied_only)
     
+    def risk_scores(self, period=None, by=('Fund', 'Prop_Code')):
+        """Occupancy, WALT, near-term expiry and concentration risk of every group of one snapshot (default: latest)
+        
+        Scored with the processor's risk rules and weights, see risk_scoring.score_risk; tenant
+        concentration counts canonical tenants from the tenant registry.
+        """
+        period = period or self.snapshots.latest
+        return self._memoized('risk_scores',
+                              lambda: score_risk(risk_inputs(self.snapshots[period], by, self.tenant_ids(period)),
+                                                 self.risk_rules, self.risk_weights),
+                              period, list(by), self.risk_rules, self.risk_weights, self.tenants.fingerprint())
+    
+    def tenant_ids(self, period=None):
+        """Canonical tenant ID of every row of one snapshot (default: latest), None where Tenant_Name is missing"""
+        period = period or self.snapshots.latest
+        return self.tenants.resolve(self.snapshots[period]['Tenant_Name'].to_numpy(dtype=object))
+    
+    def property_risk(self, period=None):
+        """Per-property risk scores of one snapshot (default: latest) with the property names, riskiest first"""
+        period = period or self.snapshots.latest
+        scores = self.risk_scores(period).reset_index(level='Fund')
+        scores.insert(1, 'property', self.property_rollup(period)['property'].reindex(scores.index))
+        return scores.sort_values(['overall_risk_score', 'annual_revenue'], ascending=False, kind='stable')
+    
+    def vacancy_tracker(self):
+        """VacancyTracker folded over every snapshot in date order, see vacancy_aging.VacancyTracker
+
+        The tracker after each prefix of the snapshots is memoized under that prefix's
+        fingerprint, so when a snapshot is added only it is folded into the tracker
+        memoized for the ones before it; a changed or removed workbook invalidates every
+        prefix that contains it.
+        """
+        fingerprint = self.snapshot_fingerprint()
+        pipeline_version, entries = fingerprint[0], fingerprint[1:]
+        keys = [memo_key('vacancy_tracker', METRICS_VERSION, [pipeline_version] + entries[:n])
+                for n in range(1, len(entries) + 1)]
+        tracker, folded = VacancyTracker(), 0
+        if self.memo is not None:
+            for n in range(len(keys), 0, -1):
+                cached = self.memo.get(keys[n - 1])
+                if cached is not None:
+                    tracker, folded = cached, n
+                    break
+        for n, period in enumerate(self.snapshots.periods[folded:], start=folded):
+            tracker.update(self.snapshots[period], self.snapshots.snapshots[period].analysis_date, period)
+            if self.memo is not None:
+                self.memo.put(keys[n], tracker)
+        return tracker
+
+    def vacancy_aging(self):
+        """Every unit vacant in the latest snapshot with its downtime and last in-place lease, longest dark first"""
+        return self.vacancy_tracker().aging()
+
     def generate_insights(self, fund, metrics):
+        """Generate automated insights for a fund from its calculate_fund_metrics() result
+        
+        Memoized under the same key parts as the fund's metrics, not on the metrics dict itself.
+        """
+        return self._memoized('insights', lambda: self._compute_insights(fund, metrics),
+                              *self._fund_metrics_parts(fund))
+    
+    def _compute_insights(self, fund, metrics):
         """Generate automated insights for a fund"""
         insights = []
+        latest_label = metrics[metrics['latest_period']]['period']
         
         # Occupancy insights
         occ_change = metrics['q2_summary']['occupancy_change']
@@ -239,14 +529,14 @@ class RentRollProcessor:
             insights.append({
                 'type': 'warning',
                 'category': 'Occupancy',
-                'message': f'Occupancy declined {abs(occ_change):.1f}pp in Q2 2025',
+                'message': f'Occupancy declined {abs(occ_change):.1f}pp in {latest_label}',
                 'recommendation': 'Implement aggressive leasing campaign with concessions'
             })
         elif occ_change > 2:
             insights.append({
                 'type': 'success',
                 'category': 'Occupancy',
-                'message': f'Occupancy improved {occ_change:.1f}pp in Q2 2025',
+                'message': f'Occupancy improved {occ_change:.1f}pp in {latest_label}',
                 'recommendation': 'Maintain momentum with selective rent increases'
             })
         
@@ -263,12 +553,12 @@ class RentRollProcessor:
             insights.append({
                 'type': 'success',
                 'category': 'Revenue',
-                'message': f'Revenue grew {rev_change:.1f}% in Q2 2025',
+                'message': f'Revenue grew {rev_change:.1f}% in {latest_label}',
                 'recommendation': 'Continue rent optimization strategy'
             })
         
         # WALT insights
-        walt = metrics['Q2_2025']['walt']
+        walt = metrics[metrics['latest_period']]['walt']
         if walt < 36:
             insights.append({
                 'type': 'warning',
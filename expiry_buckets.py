@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+from rent_roll_normalization import DAYS_PER_MONTH
+
+BUCKET_COLUMNS = ['count', 'sf', 'annual_rent']
+
+
+class ExpiryBuckets:
+    """Lease expiry buckets: right-closed intervals between ascending edges
+
+    With edges [0, 6, 12] the buckets are (0, 6], (6, 12] and, when open_ended, 12+.
+    include_lowest closes the first bucket at its lower edge ([0, 6]). Values at or
+    below the first edge fall into the `expired` bucket when it has a label and are
+    left out otherwise; so are undated leases and, without open_ended, values above
+    the last edge.
+
+    unit='months' bins months to expiry: the normalized Months_To_Expiry column, or
+    with signed=True months measured from Lease_To that are negative for leases
+    already past their expiry date. unit='years' bins the calendar year of Lease_To.
+    """
+
+    def __init__(self, edges, labels=None, expired=None, include_lowest=False, open_ended=True,
+                 unit='months', signed=False):
+        if unit not in ('months', 'years'):
+            raise ValueError(f"unit must be 'months' or 'years', not {unit!r}")
+        self.edges = np.asarray(edges, dtype=np.float64)
+        if len(self.edges) < 2 - int(open_ended) or np.any(np.diff(self.edges) <= 0):
+            raise ValueError(f"Bucket edges must be strictly ascending: {list(edges)}")
+        self.unit = unit
+        self.signed = signed
+        self.include_lowest = include_lowest
+        self.open_ended = open_ended
+        self.expired = expired
+        bucket_labels = list(labels) if labels is not None else self._default_labels()
+        if len(bucket_labels) != len(self.edges) - 1 + int(open_ended):
+            raise ValueError(f"Expected {len(self.edges) - 1 + int(open_ended)} labels, got {len(bucket_labels)}")
+        self.labels = ([expired] if expired is not None else []) + bucket_labels
+
+    @classmethod
+    def calendar_years(cls, first_year, last_year, expired=None, open_ended=True):
+        """One bucket per expiry year from first_year to last_year, then a '<last_year + 1>+' bucket"""
+        return cls(range(first_year - 1, last_year + 1), expired=expired, open_ended=open_ended, unit='years')
+
+    def _default_labels(self):
+        edges = [f'{edge:g}' for edge in self.edges]
+        if self.unit == 'years':
+            labels = edges[1:]
+            return labels + [f'{self.edges[-1] + 1:g}+'] if self.open_ended else labels
+        labels = [f'{low}-{high} months' for low, high in zip(edges[:-1], edges[1:])]
+        return labels + [f'{edges[-1]}+ months'] if self.open_ended else labels
+
+    def spec(self):
+        """JSON-serializable description, for cache and memo keys"""
+        return {'edges': self.edges.tolist(), 'labels': self.labels, 'include_lowest': self.include_lowest,
+                'open_ended': self.open_ended, 'unit': self.unit, 'signed': self.signed}
+
+    def values(self, df, analysis_date=None):
+        """The per-row quantity being binned, NaN for undated leases where it depends on Lease_To"""
+        if self.unit == 'years':
+            return df['Lease_To'].dt.year.to_numpy(dtype=np.float64)
+        if not self.signed:
+            return df['Months_To_Expiry'].to_numpy(dtype=np.float64)
+        if analysis_date is None:
+            raise ValueError("Signed expiry buckets need the analysis date")
+        days = (df['Lease_To'] - pd.Timestamp(analysis_date)).dt.days.to_numpy(dtype=np.float64)
+        return days / DAYS_PER_MONTH
+
+    def codes(self, values):
+        """Position of each value in self.labels, or -1 for values outside every bucket"""
+        values = np.asarray(values, dtype=np.float64)
+        # searchsorted(side='left') counts the edges strictly below each value, which is
+        # exactly the index of its right-closed interval (0 = at or below the first edge)
+        slots = np.searchsorted(self.edges, values, side='left')
+        if self.include_lowest:
+            slots[values == self.edges[0]] = 1
+
+        n_buckets = len(self.edges) - 1 + int(self.open_ended)
+        offset = 0 if self.expired is not None else -1
+        codes = slots + offset
+        outside = np.isnan(values) | (slots > n_buckets)
+        if self.expired is None:
+            outside |= slots == 0
+        return np.where(outside, -1, codes)
+
+
+def expiry_table(df, buckets, analysis_date=None, by=('Fund',), occupied_only=True):
+    """Lease count, SF and annual rent per expiry bucket for every group in `by` at once
+
+    Rows are binned with one searchsorted call and summed in one groupby. The result
+    is indexed by the `by` columns plus an ordered categorical Bucket level, with every
+    bucket present (zero-filled) for every group that appears in df.
+    """
+    by = list(by)
+    if occupied_only:
+        df = df[~df['Is_Vacant'].to_numpy(dtype=bool)]
+    codes = buckets.codes(buckets.values(df, analysis_date))
+    keep = codes >= 0
+
+    frame = pd.DataFrame({key: df[key].to_numpy()[keep] for key in by})
+    frame['Bucket'] = pd.Categorical.from_codes(codes[keep], categories=buckets.labels, ordered=True)
+    frame['count'] = 1
+    frame['sf'] = df['Area'].to_numpy(dtype=np.float64)[keep]
+    frame['annual_rent'] = df['Annual_Rent'].to_numpy(dtype=np.float64)[keep]
+    sums = frame.groupby(by + ['Bucket'], observed=True, sort=False)[BUCKET_COLUMNS].sum()
+
+    groups = df[by].drop_duplicates()
+    n_labels = len(buckets.labels)
+    levels = [np.repeat(groups[key].to_numpy(), n_labels) for key in by]
+    bucket_level = pd.Categorical(np.tile(buckets.labels, len(groups)), categories=buckets.labels, ordered=True)
+    full_index = pd.MultiIndex.from_arrays(levels + [bucket_level], names=by + ['Bucket'])
+    return sums.reindex(full_index, fill_value=0)
+
+
+def bucket_summary(table, *group):
+    """{bucket: {'count', 'sf', 'annual_rent'}} for one group of an expiry_table()"""
+    rows = table.xs(group, level=list(range(len(group)))) if group else table
+    return {
+        str(bucket): {'count': int(count), 'sf': float(sf), 'annual_rent': float(rent)}
+        for bucket, count, sf, rent in zip(rows.index, *(rows[col].to_numpy() for col in BUCKET_COLUMNS))
+    }
+
+
+# Buckets shown on the dashboard expiry chart: occupied leases with time left on them
+DASHBOARD_BUCKETS = ExpiryBuckets([0, 6, 12, 24, 36])
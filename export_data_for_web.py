@@ -1,7 +1,9 @@
 import json
+import os
 import pandas as pd
 import numpy as np
 from dashboard_data_processor import RentRollProcessor
+from fund_classification import fund_key
 
 # Function to convert metrics to serializable format
 def convert_to_serializable(obj):
@@ -25,62 +27,59 @@ def convert_to_serializable(obj):
     else:
         return obj
 
-# Initialize processor and load data
-print("Loading data...")
-processor = RentRollProcessor()
-processor.load_data()
-
-# Calculate metrics for both funds
-print("Calculating Fund 2 metrics...")
-fund2_metrics = processor.calculate_fund_metrics('Fund 2')
-print("Calculating Fund 3 metrics...")
-fund3_metrics = processor.calculate_fund_metrics('Fund 3')
-
-# Generate insights
-print("Generating insights...")
-fund2_insights = processor.generate_insights('Fund 2', fund2_metrics)
-fund3_insights = processor.generate_insights('Fund 3', fund3_metrics)
+EXPORT_PATH = 'docs/data/dashboard_data.json'
 
 # Prepare data for export
-export_data = {
-    'fund2': {
-        'metrics': convert_to_serializable({
-            'Q4_2024': fund2_metrics['Q4_2024'],
-            'Q1_2025': fund2_metrics['Q1_2025'],
-            'Q2_2025': fund2_metrics['Q2_2025'],
-            'q2_summary': fund2_metrics['q2_summary'],
-            'top_properties': fund2_metrics['top_properties'],
-            'expiry_analysis': fund2_metrics['expiry_analysis'],
-            'risk_metrics': fund2_metrics['risk_metrics']
-        }),
-        'insights': convert_to_serializable(fund2_insights)
-    },
-    'fund3': {
+def export_fund(metrics, insights):
+    periods = metrics['periods']
+    return {
         'metrics': convert_to_serializable({
-            'Q4_2024': fund3_metrics['Q4_2024'],
-            'Q1_2025': fund3_metrics['Q1_2025'],
-            'Q2_2025': fund3_metrics['Q2_2025'],
-            'q2_summary': fund3_metrics['q2_summary'],
-            'top_properties': fund3_metrics['top_properties'],
-            'expiry_analysis': fund3_metrics['expiry_analysis'],
-            'risk_metrics': fund3_metrics['risk_metrics']
+            **{period: metrics[period] for period in periods},
+            'q2_summary': metrics['q2_summary'],
+            'revenue_bridge': metrics['revenue_bridge'],
+            'rent_projection': metrics['rent_projection'],
+            'top_properties': metrics['top_properties'],
+            'expiry_analysis': metrics['expiry_analysis'],
+            'rent_distribution': metrics['rent_distribution'],
+            'vacancy_aging': metrics['vacancy_aging'],
+            'risk_metrics': metrics['risk_metrics']
         }),
-        'insights': convert_to_serializable(fund3_insights)
-    },
-    'metadata': {
-        'generated_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'data_period': 'Q2 2025',
-        'source_files': [
-            'Faropoint Rent Roll All Funds (24DEC).xlsx',
-            'Faropoint Rent Roll All Funds (25MAR).xlsx',
-            'Faropoint Rent Roll All Funds (25JUN).xlsx'
-        ]
+        'insights': convert_to_serializable(insights)
     }
-}
 
-# Save to JSON file
-print("Exporting data to JSON...")
-with open('docs/data/dashboard_data.json', 'w') as f:
-    json.dump(export_data, f, indent=2)
+def export_dashboard_data(processor, path=EXPORT_PATH):
+    """Calculate every configured fund's metrics from a loaded processor and write the dashboard JSON"""
+    export_data = {}
+    for fund in processor.funds:
+        print(f"Calculating {fund} metrics...")
+        metrics = processor.calculate_fund_metrics(fund)
+        print(f"Generating {fund} insights...")
+        export_data[fund_key(fund)] = export_fund(metrics, processor.generate_insights(fund, metrics))
+
+    export_data.update({
+        # Every fund x period x metric value in one flat array (see MetricsCube.from_dict)
+        'metrics_cube': processor.metrics_cube().to_dict(),
+        'metadata': {
+            'generated_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'data_period': processor.snapshots.label(processor.snapshots.latest),
+            'periods': processor.snapshots.periods,
+            'source_files': [os.path.basename(snapshot.file_path) for snapshot in processor.snapshots.snapshots.values()],
+            # Section key of each fund, in the configured order
+            'funds': {fund_key(fund): fund for fund in processor.funds}
+        }
+    })
+
+    # Save to JSON file
+    print("Exporting data to JSON...")
+    with open(path, 'w') as f:
+        json.dump(export_data, f, indent=2)
+    return export_data
+
+if __name__ == '__main__':
+    # Initialize processor and load data
+    print("Loading data...")
+    processor = RentRollProcessor()
+    processor.load_data()
 
-print("Data exported successfully to docs/data/dashboard_data.json")
\ No newline at end of file
+    export_dashboard_data(processor)
+    print(f"Data exported successfully to {EXPORT_PATH}")
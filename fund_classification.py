@@ -0,0 +1,108 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fund_classification.json')
+
+
+class FundClassifier:
+    """Ordered prefix/regex rules mapping property codes to funds, compiled once
+
+    Each rule is {"fund": ..., "prefix": ...} or {"fund": ..., "pattern": <regex>};
+    the first matching rule wins. Codes that match no rule get `default`, missing
+    codes get `missing`, and `include` lists the funds analyses keep by default.
+    """
+
+    def __init__(self, rules, default='Other', missing='Unknown', include=None):
+        self.rules = rules
+        self.default = default
+        self.missing = missing
+        self.include = tuple(include) if include is not None else tuple(dict.fromkeys(r['fund'] for r in rules))
+        self.unmatched = Counter()
+        self._compiled = [
+            (rule['fund'], re.compile(re.escape(rule['prefix']) if 'prefix' in rule else rule['pattern']))
+            for rule in rules
+        ]
+
+    @classmethod
+    def from_config(cls, path=DEFAULT_CONFIG):
+        with open(path) as f:
+            config = json.load(f)
+        return cls(config['rules'], config.get('default', 'Other'), config.get('missing', 'Unknown'),
+                   config.get('include'))
+
+    def fingerprint(self, funds=None):
+        """Short hash of the rules and kept funds (default: `include`), used to key cached snapshots"""
+        funds = sorted(funds if funds is not None else self.include)
+        payload = json.dumps([self.rules, self.default, self.missing, funds], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:12]
+
+    def classify_codes(self, codes):
+        """Classify distinct property codes (no missing values) with the compiled rules"""
+        codes = pd.Series(codes, dtype=object)
+        funds = np.full(len(codes), self.default, dtype=object)
+        unassigned = np.ones(len(codes), dtype=bool)
+        for fund, regex in self._compiled:
+            if not unassigned.any():
+                break
+            hits = unassigned & codes.str.match(regex, na=False).to_numpy()
+            funds[hits] = fund
+            unassigned &= ~hits
+        return funds, unassigned
+
+    def classify(self, prop_codes):
+        """Return the fund for every row of a Prop_Code series
+
+        Rules run once per distinct code; the labels are then broadcast back to the
+        rows through the factorized codes. Unmatched codes are tallied in `unmatched`.
+        """
+        codes, uniques = pd.factorize(prop_codes)
+        funds, unassigned = self.classify_codes(uniques)
+        if unassigned.any():
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            self.unmatched.update(dict(zip(uniques[unassigned], counts[unassigned].tolist())))
+        # factorize marks missing codes with -1, which picks up the trailing `missing` label
+        return np.append(funds, self.missing)[codes]
+
+
+def fund_key(fund):
+    """Identifier form of a fund name for JSON sections and dashboard tabs ('Fund 2' -> 'fund2')"""
+    return re.sub(r'[^a-z0-9]+', '', fund.lower())
+
+
+_default_classifier = None
+
+
+def default_classifier():
+    """The classifier loaded from fund_classification.json (loaded once per process)"""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = FundClassifier.from_config(DEFAULT_CONFIG)
+    return _default_classifier
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Report property codes that match no fund rule')
+    parser.add_argument('workbooks', nargs='+')
+    parser.add_argument('--config', default=DEFAULT_CONFIG)
+    args = parser.parse_args()
+
+    from rent_roll_normalization import read_rent_roll, extract_prop_code
+
+    classifier = FundClassifier.from_config(args.config)
+    for workbook in args.workbooks:
+        df = read_rent_roll(workbook).dropna(subset=['Property'])
+        fund_counts = Counter(classifier.classify(extract_prop_code(df['Property'])))
+        print(f"\n{workbook}:")
+        for fund, count in sorted(fund_counts.items()):
+            print(f"  {fund:<20} {count:>8,} rows")
+
+    print(f"\nUnmatched property codes ({len(classifier.unmatched)}):")
+    for code, count in classifier.unmatched.most_common():
+        print(f"  {code:<20} {count:>8,} rows")
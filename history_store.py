@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+DEFAULT_HISTORY_DIR = '.rent_roll_history'
+PARTITIONING = ds.partitioning(pa.schema([('Snapshot_Date', pa.date32()), ('Fund', pa.string())]), flavor='hive')
+
+
+class HistoryStore:
+    """Parquet dataset of processed lease rows, partitioned by snapshot date and fund
+
+    Layout: <root>/Snapshot_Date=2025-06-30/Fund=Fund%202/part-0.parquet. A manifest
+    records the workbook hash and pipeline version behind every snapshot date so
+    unchanged snapshots are never rewritten.
+    """
+
+    # Leading underscore keeps pyarrow dataset discovery from treating it as data
+    MANIFEST_FILE = '_manifest.json'
+
+    def __init__(self, root=DEFAULT_HISTORY_DIR):
+        self.root = root
+
+    def manifest(self):
+        """Snapshot date (ISO) -> {'period', 'sha256', 'pipeline_version', 'rows'}"""
+        path = os.path.join(self.root, self.MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def is_current(self, analysis_date, sha256, pipeline_version):
+        """True when the stored snapshot was written from this workbook by this pipeline"""
+        entry = self.manifest().get(f"{analysis_date:%Y-%m-%d}")
+        return entry is not None and entry['sha256'] == sha256 and entry['pipeline_version'] == pipeline_version
+
+    def write_snapshot(self, df, analysis_date, period, sha256, pipeline_version):
+        """Replace the partitions of one snapshot date with the rows of a processed frame"""
+        date_dir = os.path.join(self.root, f"Snapshot_Date={analysis_date:%Y-%m-%d}")
+        tmp_dir = os.path.join(self.root, f"_tmp_{analysis_date:%Y%m%d}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        # Categoricals from compact frames are written as plain strings so every partition shares one schema
+        df = df.astype({col: object for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.append_column('Snapshot_Date', pa.array([analysis_date.date()] * len(df), pa.date32()))
+        ds.write_dataset(table, tmp_dir, format='parquet', partitioning=PARTITIONING,
+                         basename_template='part-{i}.parquet')
+
+        # write_dataset nests the date directory under tmp_dir; swap it into place
+        shutil.rmtree(date_dir, ignore_errors=True)
+        written = os.path.join(tmp_dir, os.path.basename(date_dir))
+        if os.path.isdir(written):
+            os.replace(written, date_dir)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        manifest = self.manifest()
+        manifest[f"{analysis_date:%Y-%m-%d}"] = {
+            'period': period, 'sha256': sha256, 'pipeline_version': pipeline_version, 'rows': len(df)
+        }
+        self._write_manifest(manifest)
+
+    def remove_snapshot(self, analysis_date):
+        """Drop every partition of one snapshot date"""
+        shutil.rmtree(os.path.join(self.root, f"Snapshot_Date={analysis_date:%Y-%m-%d}"), ignore_errors=True)
+        manifest = self.manifest()
+        if manifest.pop(f"{analysis_date:%Y-%m-%d}", None) is not None:
+            self._write_manifest(manifest)
+
+    def dataset(self):
+        """The pyarrow dataset over every stored partition, or None while the store is empty"""
+        if not os.path.isdir(self.root) or not any(name.startswith('Snapshot_Date=')
+                                                   for name in os.listdir(self.root)):
+            return None
+        return ds.dataset(self.root, format='parquet', partitioning=PARTITIONING)
+
+    def scan(self, start=None, end=None, columns=None, funds=None, properties=None):
+        """Read lease rows for snapshot dates in [start, end] as a DataFrame
+
+        Only the requested columns are read (Snapshot_Date is always included), date and
+        fund filters prune whole partitions, and property codes are pushed down to the
+        Parquet row-group statistics.
+        """
+        dataset = self.dataset()
+        if dataset is None:
+            return pd.DataFrame(columns=(columns or []) + ['Snapshot_Date'])
+
+        condition = None
+        filters = []
+        if start is not None:
+            filters.append(ds.field('Snapshot_Date') >= pa.scalar(pd.Timestamp(start).date(), pa.date32()))
+        if end is not None:
+            filters.append(ds.field('Snapshot_Date') <= pa.scalar(pd.Timestamp(end).date(), pa.date32()))
+        if funds is not None:
+            filters.append(ds.field('Fund').isin(list(funds)))
+        if properties is not None:
+            filters.append(ds.field('Prop_Code').isin(list(properties)))
+        for expression in filters:
+            condition = expression if condition is None else condition & expression
+
+        if columns is not None:
+            columns = list(dict.fromkeys(list(columns) + ['Snapshot_Date']))
+        df = dataset.to_table(columns=columns, filter=condition).to_pandas()
+        df['Snapshot_Date'] = pd.to_datetime(df['Snapshot_Date'])
+        return df
+
+    def _write_manifest(self, manifest):
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, self.MANIFEST_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(dict(sorted(manifest.items())), f, indent=2)
+        os.replace(path + '.tmp', path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build or inspect the partitioned rent roll history store')
+    parser.add_argument('command', choices=['sync', 'list'])
+    parser.add_argument('--history-dir', default=DEFAULT_HISTORY_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'sync':
+        from dashboard_data_processor import RentRollProcessor
+
+        processor = RentRollProcessor(history_dir=args.history_dir)
+        processor.load_data()
+        written = processor.sync_history()
+        print(f"Wrote {len(written)} snapshot(s): {', '.join(written) or '-'}")
+
+    for date, entry in HistoryStore(args.history_dir).manifest().items():
+        print(f"{date}  {entry['period']:<8} {entry['rows']:>8,} rows  {entry['sha256'][:12]}")
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+LEASE_STATUSES = ['new', 'lost', 'renewed', 'extended', 'rent_changed', 'unchanged']
+# Join keys tried in order; the second pairs up leases whose unit list was redrawn (expansions, contractions)
+MATCH_KEYS = [['Prop_Key', 'Unit_Key', 'Tenant_Key'], ['Prop_Key', 'Tenant_Key']]
+# Annual rent differences below this many dollars are rounding, not a rent change
+RENT_TOLERANCE = 1.0
+
+_LEGAL_SUFFIXES = r'(?:\s+(?:inc|llc|l l c|corp|corporation|co|company|ltd|limited|lp|llp|plc))+$'
+
+
+def normalize_tenant(names):
+    """Case-, punctuation- and legal-suffix-insensitive tenant key ('* Acme, Inc. (t0000123)' -> 'acme')"""
+    # The tenant code goes first: the punctuation run before it would otherwise swallow its '('
+    return (names.str.lower()
+            .str.replace(r'\(t\d+\)', ' ', regex=True)
+            .str.replace(r'[^a-z0-9]+', ' ', regex=True)
+            .str.strip()
+            .str.replace(_LEGAL_SUFFIXES, '', regex=True))
+
+
+def normalize_units(units):
+    """Unit key with whitespace and case removed and integral floats printed as integers ('A,  B' -> 'A,B')"""
+    return units.str.upper().str.replace(r'\s+', '', regex=True).str.replace(r'\.0$', '', regex=True)
+
+
+def _encode(prior_values, current_values, transform):
+    """Shared integer codes of the normalized values of both sides, plus the normalized categories
+
+    The transform runs once per distinct raw value across both snapshots; missing
+    values get code -1.
+    """
+    codes, uniques = pd.factorize(np.concatenate([prior_values, current_values]))
+    normalized_codes, categories = pd.factorize(transform(pd.Series(uniques, dtype=object).astype(str)))
+    codes = np.append(normalized_codes, -1)[codes]
+    return codes[:len(prior_values)], codes[len(prior_values):], categories
+
+
+def lease_keys(df):
+    """Occupied leases of a snapshot with the columns the diff compares"""
+    occupied = df[~df['Is_Vacant'].to_numpy(dtype=bool)]
+    tenants = occupied['Tenant_Name'] if 'Tenant_Name' in occupied.columns else occupied['Lease']
+    return pd.DataFrame({
+        'Fund': occupied['Fund'].to_numpy(dtype=object),
+        'Prop_Code': occupied['Prop_Code'].to_numpy(dtype=object),
+        'Units': occupied['Units'].to_numpy(dtype=object),
+        'Tenant_Name': tenants.to_numpy(dtype=object),
+        'Area': occupied['Area'].to_numpy(dtype=np.float64),
+        'Annual_Rent': occupied['Annual_Rent'].to_numpy(dtype=np.float64),
+        'Lease_From': occupied['Lease_From'].to_numpy(dtype='datetime64[ns]'),
+        'Lease_To': occupied['Lease_To'].to_numpy(dtype='datetime64[ns]'),
+    })
+
+
+def _match(prior, current, key):
+    """Hash-join two frames of integer key codes on `key`, pairing duplicate keys in order
+
+    Returns the index labels of the matched prior and current rows.
+    """
+    ids = pd.concat([prior[key], current[key]], ignore_index=True).groupby(
+        key, sort=False, dropna=False).ngroup().to_numpy()
+    sides = []
+    for frame, frame_ids in ((prior, ids[:len(prior)]), (current, ids[len(prior):])):
+        side = pd.DataFrame({'Key_Id': frame_ids, 'Row': frame.index.to_numpy()})
+        side['Occurrence'] = side.groupby('Key_Id', sort=False).cumcount()
+        sides.append(side)
+    pairs = sides[0].merge(sides[1], on=['Key_Id', 'Occurrence'], suffixes=('_Prior', '_Current'))
+    return pairs['Row_Prior'].to_numpy(), pairs['Row_Current'].to_numpy()
+
+
+def _take(frame, column, rows):
+    """frame[column] at positional rows, with missing values where rows is -1"""
+    values = frame[column].to_numpy()
+    if len(values) == 0:
+        values = np.empty(1, dtype=values.dtype)
+    taken = values[np.maximum(rows, 0)]
+    if taken.dtype.kind == 'M':
+        return np.where(rows >= 0, taken, np.datetime64('NaT'))
+    if taken.dtype.kind == 'f':
+        return np.where(rows >= 0, taken, np.nan)
+    return np.where(rows >= 0, taken, None)
+
+
+def diff_snapshots(prior, current):
+    """Join two snapshots lease by lease and classify every lease in one pass
+
+    Leases are matched on Prop_Code + normalized Units + normalized tenant, then the
+    leftovers on Prop_Code + tenant. Returns one row per lease in either snapshot
+    with its fund, key, prior and current area, rent and dates, the rent change
+    (current - prior, absent sides counting as 0) and a categorical Status:
+
+    - new / lost: only in the current / prior snapshot
+    - renewed: same tenant and unit on a new lease term (Lease_From changed)
+    - extended: same term start with a later Lease_To
+    - rent_changed: same dates, annual rent differs by more than RENT_TOLERANCE
+    - unchanged: everything else
+    """
+    prior_keys, current_keys = lease_keys(prior), lease_keys(current)
+    categories = {}
+    for column, key, transform in (('Prop_Code', 'Prop_Key', None), ('Units', 'Unit_Key', normalize_units),
+                                   ('Tenant_Name', 'Tenant_Key', normalize_tenant)):
+        prior_keys[key], current_keys[key], categories[key] = _encode(
+            prior_keys[column].to_numpy(), current_keys[column].to_numpy(), transform or (lambda values: values))
+    remaining_prior, remaining_current = prior_keys, current_keys
+    prior_rows, current_rows = [], []
+    for key in MATCH_KEYS:
+        matched_prior, matched_current = _match(remaining_prior, remaining_current, key)
+        prior_rows.append(matched_prior)
+        current_rows.append(matched_current)
+        remaining_prior = remaining_prior.drop(matched_prior)
+        remaining_current = remaining_current.drop(matched_current)
+
+    unmatched_prior, unmatched_current = remaining_prior.index.to_numpy(), remaining_current.index.to_numpy()
+    prior_rows = np.concatenate(prior_rows + [unmatched_prior, np.full(len(unmatched_current), -1)])
+    current_rows = np.concatenate(current_rows + [np.full(len(unmatched_prior), -1), unmatched_current])
+    in_prior, in_current = prior_rows >= 0, current_rows >= 0
+    matched = in_prior & in_current
+
+    rent_prior = np.nan_to_num(_take(prior_keys, 'Annual_Rent', prior_rows))
+    rent_current = np.nan_to_num(_take(current_keys, 'Annual_Rent', current_rows))
+    from_prior, from_current = _take(prior_keys, 'Lease_From', prior_rows), _take(current_keys, 'Lease_From', current_rows)
+    to_prior, to_current = _take(prior_keys, 'Lease_To', prior_rows), _take(current_keys, 'Lease_To', current_rows)
+    # NaT compares unequal to itself, so two undated starts are not a new term
+    new_term = matched & (from_current != from_prior) & ~(np.isnat(from_current) & np.isnat(from_prior))
+    extended = matched & (to_current > to_prior)
+    rent_changed = matched & (np.abs(rent_current - rent_prior) > RENT_TOLERANCE)
+    status = np.select([~in_prior, ~in_current, new_term, extended, rent_changed], [0, 1, 2, 3, 4], default=5)
+
+    def pick(column):
+        return np.where(in_current, _take(current_keys, column, current_rows), _take(prior_keys, column, prior_rows))
+
+    def pick_key(key):
+        codes = pick(key).astype(np.int64)
+        return pd.Categorical.from_codes(codes, categories=categories[key])
+
+    return pd.DataFrame({
+        'Fund': pick('Fund'),
+        'Prop_Code': pick('Prop_Code'),
+        'Unit_Key': pick_key('Unit_Key'),
+        'Tenant_Key': pick_key('Tenant_Key'),
+        'Tenant_Name': pick('Tenant_Name'),
+        'Status': pd.Categorical.from_codes(status, categories=LEASE_STATUSES, ordered=True),
+        'Area_Prior': _take(prior_keys, 'Area', prior_rows),
+        'Area_Current': _take(current_keys, 'Area', current_rows),
+        'Rent_Prior': np.where(in_prior, rent_prior, np.nan),
+        'Rent_Current': np.where(in_current, rent_current, np.nan),
+        'Rent_Change': rent_current - rent_prior,
+        'Lease_From_Prior': from_prior,
+        'Lease_From_Current': from_current,
+        'Lease_To_Prior': to_prior,
+        'Lease_To_Current': to_current,
+    })
+
+
+def status_counts(diff, by='Fund'):
+    """Leases per status for every group, as a frame with one column per LEASE_STATUSES entry"""
+    counts = pd.crosstab(diff[by], diff['Status'], dropna=False)
+    return counts.reindex(columns=LEASE_STATUSES, fill_value=0)
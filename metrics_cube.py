@@ -0,0 +1,145 @@
+import re
+
+import numpy as np
+
+from metrics_engine import PERIOD_METRICS
+
+CUBE_METRICS = [key for key in PERIOD_METRICS if key != 'period']
+PERIOD_KEY = re.compile(r'^(?P<prefix>.+)_(?P<year>\d{4})$')
+
+
+def year_ago(period):
+    """Period key one year earlier: 'Q2_2025' -> 'Q2_2024', 'Apr_2025' -> 'Apr_2024'"""
+    match = PERIOD_KEY.match(period)
+    return f"{match.group('prefix')}_{int(match.group('year')) - 1}" if match else None
+
+
+class MetricsCube:
+    """Dense fund x period x metric array with labeled axes
+
+    `values[f, p, m]` holds metric m of fund f in period p as float64. Slicing,
+    period-over-period deltas and derived metrics operate on the whole array at once.
+    """
+
+    def __init__(self, values, funds, periods, metrics, labels=None):
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.funds = list(funds)
+        self.periods = list(periods)
+        self.metrics = list(metrics)
+        self.labels = list(labels) if labels is not None else list(self.periods)
+        if self.values.shape != (len(self.funds), len(self.periods), len(self.metrics)):
+            raise ValueError(f"values shape {self.values.shape} does not match the axes "
+                             f"({len(self.funds)}, {len(self.periods)}, {len(self.metrics)})")
+        self._fund_index = {fund: i for i, fund in enumerate(self.funds)}
+        self._period_index = {period: i for i, period in enumerate(self.periods)}
+        self._metric_index = {metric: i for i, metric in enumerate(self.metrics)}
+
+    @classmethod
+    def from_period_metrics(cls, period_metrics, periods, metrics=CUBE_METRICS):
+        """Build a cube from {fund: {period: metrics dict}} as returned by calculate_period_metrics()"""
+        funds = list(period_metrics)
+        values = np.array([[[period_metrics[fund][period][metric] for metric in metrics] for period in periods]
+                           for fund in funds], dtype=np.float64).reshape(len(funds), len(periods), len(metrics))
+        labels = [period_metrics[funds[0]][period]['period'] for period in periods] if funds else periods
+        return cls(values, funds, periods, metrics, labels)
+
+    @classmethod
+    def from_fund_metrics(cls, fund, metrics):
+        """Build a one-fund cube from a calculate_fund_metrics() dict"""
+        return cls.from_period_metrics({fund: {period: metrics[period] for period in metrics['periods']}},
+                                       metrics['periods'])
+
+    def _positions(self, index, keys):
+        if keys is None:
+            return slice(None)
+        if isinstance(keys, str):
+            keys = [keys]
+        return [index[key] for key in keys]
+
+    def sel(self, funds=None, periods=None, metrics=None):
+        """Sub-cube for the given funds, periods and metrics (None keeps the whole axis)"""
+        f = self._positions(self._fund_index, funds)
+        p = self._positions(self._period_index, periods)
+        m = self._positions(self._metric_index, metrics)
+        values = self.values[f][:, p][:, :, m]
+        return MetricsCube(values, np.array(self.funds, dtype=object)[f], np.array(self.periods, dtype=object)[p],
+                           np.array(self.metrics, dtype=object)[m], np.array(self.labels, dtype=object)[p])
+
+    def metric(self, name):
+        """(fund, period) array of one metric; a view into the cube"""
+        return self.values[:, :, self._metric_index[name]]
+
+    def value(self, fund, period, metric):
+        return float(self.values[self._fund_index[fund], self._period_index[period], self._metric_index[metric]])
+
+    def with_metric(self, name, values):
+        """New cube with a derived (fund, period) metric appended, e.g. from arithmetic on metric() arrays"""
+        values = np.asarray(values, dtype=np.float64).reshape(len(self.funds), len(self.periods), 1)
+        return MetricsCube(np.concatenate([self.values, values], axis=2), self.funds, self.periods,
+                           self.metrics + [name], self.labels)
+
+    def delta(self, lag=1, relative=False):
+        """Change versus `lag` periods earlier along the period axis; NaN where there is no earlier period"""
+        prior = np.arange(len(self.periods)) - lag
+        return self._change(np.where(prior >= 0, prior, -1), relative)
+
+    def qoq(self, relative=False):
+        """Change versus the previous snapshot"""
+        return self.delta(1, relative)
+
+    def yoy(self, relative=False):
+        """Change versus the same period a year earlier, matched by period key rather than position"""
+        prior = np.array([self._period_index.get(year_ago(period), -1) for period in self.periods], dtype=np.int64)
+        return self._change(prior, relative)
+
+    def _change(self, prior, relative):
+        missing = prior < 0
+        base = self.values[:, np.where(missing, 0, prior), :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = (self.values - base) / base * 100 if relative else self.values - base
+        change[:, missing, :] = np.nan
+        return MetricsCube(change, self.funds, self.periods, self.metrics, self.labels)
+
+    def to_period_metrics(self, fund):
+        """{period: metrics dict} for one fund, in the shape calculate_fund_metrics() returns"""
+        f = self._fund_index[fund]
+        return {
+            period: {'period': label, **dict(zip(self.metrics, self.values[f, p].tolist()))}
+            for p, (period, label) in enumerate(zip(self.periods, self.labels))
+        }
+
+    def to_dict(self):
+        """Compact JSON-friendly form: axis labels plus the values flattened in (fund, period, metric) order"""
+        flat = self.values.ravel()
+        return {
+            'funds': self.funds,
+            'periods': self.periods,
+            'labels': self.labels,
+            'metrics': self.metrics,
+            'values': [None if np.isnan(v) else v for v in flat.tolist()]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        values = np.array([np.nan if v is None else v for v in data['values']], dtype=np.float64)
+        shape = (len(data['funds']), len(data['periods']), len(data['metrics']))
+        return cls(values.reshape(shape), data['funds'], data['periods'], data['metrics'], data['labels'])
+
+    def save(self, path):
+        """Write the cube to a compressed .npz file"""
+        np.savez_compressed(path, values=self.values, funds=np.array(self.funds), periods=np.array(self.periods),
+                            metrics=np.array(self.metrics), labels=np.array(self.labels))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['values'], data['funds'].tolist(), data['periods'].tolist(),
+                       data['metrics'].tolist(), data['labels'].tolist())
+
+    def __repr__(self):
+        return f"MetricsCube(funds={len(self.funds)}, periods={len(self.periods)}, metrics={len(self.metrics)})"
+
+
+def as_cube(metrics, fund='Fund'):
+    """Accept a MetricsCube or a calculate_fund_metrics() dict and return a cube"""
+    return metrics if isinstance(metrics, MetricsCube) else MetricsCube.from_fund_metrics(fund, metrics)
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+# Keys of the per-period metrics dict, in the order RentRollProcessor has always returned them
+PERIOD_METRICS = ['period', 'properties', 'total_leases', 'occupied_leases', 'vacant_leases', 'total_sf',
+                  'occupied_sf', 'vacant_sf', 'occupancy_rate', 'annual_revenue', 'monthly_revenue',
+                  'avg_rent_psf', 'walt', 'near_term_expiry_sf', 'near_term_expiry_pct']
+NEAR_TERM_MONTHS = 12
+# Additive per-row contributions; every other metric is derived from their sums
+SUM_METRICS = ['total_leases', 'occupied_leases', 'vacant_leases', 'total_sf', 'occupied_sf', 'vacant_sf',
+               'annual_revenue', 'monthly_revenue', 'walt_weight', 'near_term_expiry_sf']
+
+
+def _ratio(numerator, denominator, scale=1.0):
+    """numerator / denominator * scale, and 0 where the denominator is not positive"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / denominator * scale, 0.0)
+
+
+def metric_contributions(vacant, area, annual_rent, monthly_rent, months):
+    """Each row's contribution to the SUM_METRICS, as {name: array}
+
+    Masked columns keep NaNs on the rows they select, so grouped sums skip them like
+    the old filters did.
+    """
+    occupied = ~vacant
+    return {
+        'total_leases': np.ones(len(vacant), dtype=np.int64),
+        'occupied_leases': occupied.astype(np.int64),
+        'vacant_leases': vacant.astype(np.int64),
+        'total_sf': area,
+        'occupied_sf': np.where(occupied, area, 0.0),
+        'vacant_sf': np.where(vacant, area, 0.0),
+        'annual_revenue': np.where(occupied, annual_rent, 0.0),
+        'monthly_revenue': np.where(occupied, monthly_rent, 0.0),
+        'walt_weight': np.where(occupied, area * months, 0.0),
+        'near_term_expiry_sf': np.where(occupied & (months <= NEAR_TERM_MONTHS), area, 0.0),
+    }
+
+
+def derive_metrics(sums):
+    """Occupancy, rent per SF, WALT and near-term expiry share from summed SUM_METRICS arrays"""
+    occupied_sf = sums['occupied_sf']
+    has_occupied = (sums['occupied_leases'] > 0) & (occupied_sf > 0)
+    return {
+        'occupancy_rate': _ratio(occupied_sf, sums['total_sf'], 100),
+        'avg_rent_psf': _ratio(sums['annual_revenue'], occupied_sf),
+        'walt': np.where(has_occupied, _ratio(sums['walt_weight'], occupied_sf), 0.0),
+        'near_term_expiry_pct': _ratio(sums['near_term_expiry_sf'], occupied_sf, 100),
+    }
+
+
+def stack_snapshots(frames):
+    """Concatenate {period: frame} into one frame with a Period column, keeping only the metric inputs"""
+    columns = ['Fund', 'Prop_Code', 'Is_Vacant', 'Area', 'Annual_Rent', 'Monthly_Rent', 'Months_To_Expiry']
+    stacked = pd.concat({period: df[columns] for period, df in frames.items()}, names=['Period', None])
+    return stacked.reset_index(level='Period')
+
+
+def grouped_period_metrics(stacked, periods, labels=None, funds=None):
+    """Compute every period metric for each (fund, period) pair in one grouped aggregation
+
+    `stacked` is a frame from stack_snapshots(). Returns {fund: {period: metrics}} with the
+    same dict shape as RentRollProcessor._calculate_period_metrics; pairs without rows get
+    zeros. `labels` maps period keys to display labels (default: the key itself).
+    """
+    labels = labels or {}
+    if funds is None:
+        funds = list(pd.unique(stacked['Fund'].dropna()))
+    else:
+        funds = list(funds)
+        stacked = stacked[stacked['Fund'].isin(funds)]
+
+    inputs = pd.DataFrame({
+        'Fund': stacked['Fund'].to_numpy(),
+        'Period': stacked['Period'].to_numpy(),
+        'Prop_Code': stacked['Prop_Code'].to_numpy(),
+        **metric_contributions(stacked['Is_Vacant'].to_numpy(dtype=bool),
+                               stacked['Area'].to_numpy(dtype=np.float64),
+                               stacked['Annual_Rent'].to_numpy(dtype=np.float64),
+                               stacked['Monthly_Rent'].to_numpy(dtype=np.float64),
+                               stacked['Months_To_Expiry'].to_numpy(dtype=np.float64)),
+    })
+    grouped = inputs.groupby(['Fund', 'Period'], sort=False)
+    sums = grouped.sum(numeric_only=True)
+    sums['properties'] = grouped['Prop_Code'].nunique()
+
+    full_index = pd.MultiIndex.from_product([funds, periods], names=['Fund', 'Period'])
+    sums = sums.reindex(full_index, fill_value=0)
+
+    derived = derive_metrics({name: sums[name].to_numpy() for name in SUM_METRICS})
+    for name, values in derived.items():
+        sums[name] = values
+
+    metrics = {fund: {} for fund in funds}
+    for (fund, period), row in zip(sums.index, sums.itertuples(index=False)):
+        values = row._asdict()
+        values['period'] = labels.get(period, period)
+        metrics[fund][period] = {key: values[key] for key in PERIOD_METRICS}
+    return metrics
@@ -0,0 +1,153 @@
+import copy
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+
+DEFAULT_MAX_ENTRIES = 64
+# Size cap of the on-disk tier; the least recently used pickles are removed past it
+DEFAULT_MAX_DISK_BYTES = 256 << 20
+
+
+def _key_part(value):
+    """JSON form of NumPy scalars and dates; anything else (arrays, frames) is refused, never stringified"""
+    if isinstance(value, np.datetime64):
+        return str(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} cannot be part of a memo key")
+
+
+def memo_key(*parts):
+    """Stable hex key for JSON-serializable key parts"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=_key_part).encode()).hexdigest()
+
+
+class MetricsMemo:
+    """In-process LRU of computed metrics with an optional on-disk pickle tier
+
+    Values are deep-copied on the way in and out so callers can mutate what they get
+    back without corrupting the memo. The on-disk tier is kept under max_disk_bytes by
+    removing the pickles least recently read or written.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, cache_dir=None, max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        """Return the memoized value for key, calling compute() only on a miss in both tiers"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self.entries[key])
+
+        value = self._load(key)
+        if value is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            value = compute()
+            self._store(key, value)
+        self._remember(key, value)
+        return copy.deepcopy(value)
+
+    def get(self, key):
+        """The memoized value for key from either tier, or None without counting a miss"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self.entries[key])
+        value = self._load(key)
+        if value is None:
+            return None
+        self.disk_hits += 1
+        self._remember(key, value)
+        return copy.deepcopy(value)
+
+    def put(self, key, value):
+        """Memoize a value computed outside get_or_compute (e.g. built up from an earlier entry)"""
+        self._store(key, value)
+        self._remember(key, value)
+
+    def clear(self, disk=False):
+        """Forget every in-process entry (and the on-disk tier with disk=True); returns the pickles removed"""
+        self.entries.clear()
+        if not disk:
+            return 0
+        files = self._disk_files()
+        for name in files:
+            os.remove(os.path.join(self.cache_dir, name))
+        return len(files)
+
+    def stats(self):
+        return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                'entries': len(self.entries)}
+
+    def disk_stats(self):
+        """Number and total size of the pickles in the on-disk tier"""
+        files = self._disk_files()
+        return {'entries': len(files),
+                'bytes': sum(os.path.getsize(os.path.join(self.cache_dir, name)) for name in files)}
+
+    def _remember(self, key, value):
+        self.entries[key] = copy.deepcopy(value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def _load(self, key):
+        if not self.cache_dir or not os.path.exists(self._path(key)):
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                value = pickle.load(f)
+            # The modification time orders the pickles for the size cap
+            os.utime(self._path(key))
+            return value
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _store(self, key, value):
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self._path(key) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+        self._prune()
+
+    def _prune(self):
+        """Remove the least recently used pickles until the on-disk tier fits max_disk_bytes"""
+        if self.max_disk_bytes is None:
+            return
+        files = []
+        for name in self._disk_files():
+            stat = os.stat(os.path.join(self.cache_dir, name))
+            files.append((stat.st_mtime_ns, stat.st_size, name))
+        total = sum(size for _, size, _ in files)
+        for _, size, name in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+    def _disk_files(self):
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return []
+        return [name for name in os.listdir(self.cache_dir) if name.endswith('.pkl')]
@@ -0,0 +1,211 @@
+import numbers
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from cashflow_projection import month_grid
+
+DEFAULT_PATHS = 1000
+DEFAULT_SIM_HORIZON = 60
+# Paths simulated per batch; also the unit of work handed to each pool worker
+DEFAULT_PATH_BATCH = 50
+PERCENTILES = [5, 25, 50, 75, 95]
+
+# Each entry is a distribution spec: {'dist': 'fixed' | 'uniform' | 'poisson' | 'normal' | 'lognormal', ...}
+DEFAULT_ASSUMPTIONS = {
+    # Probability an expiring tenant renews in place
+    'renewal_probability': 0.65,
+    # Months vacant between a move-out and the next lease commencing
+    'downtime_months': {'dist': 'uniform', 'low': 3, 'high': 12},
+    # Rent change versus the expiring rent, as a fraction
+    'renewal_rent_change': {'dist': 'normal', 'mean': 0.03, 'sd': 0.02},
+    'relet_rent_change': {'dist': 'normal', 'mean': 0.05, 'sd': 0.08},
+    # Term of the renewed or replacement lease
+    'renewal_term_months': {'dist': 'fixed', 'value': 60},
+    'new_lease_term_months': {'dist': 'fixed', 'value': 60},
+    # Months until a suite vacant in the snapshot is let
+    'vacant_lease_up_months': {'dist': 'uniform', 'low': 3, 'high': 12},
+    # Monthly rent per SF for those suites; None uses the fund's in-place rent per SF
+    'vacant_rent_psf': None,
+}
+
+
+def sample(rng, spec, size):
+    """Draw `size` values from a distribution spec (a bare number means a fixed value)"""
+    if not isinstance(spec, dict):
+        return np.full(size, float(spec))
+    dist = spec.get('dist', 'fixed')
+    if dist == 'fixed':
+        return np.full(size, float(spec['value']))
+    if dist == 'uniform':
+        # Integer bounds draw whole months (inclusive); float bounds draw continuously
+        if isinstance(spec['low'], numbers.Integral) and isinstance(spec['high'], numbers.Integral):
+            return rng.integers(spec['low'], spec['high'] + 1, size).astype(np.float64)
+        return rng.uniform(spec['low'], spec['high'], size)
+    if dist == 'poisson':
+        return rng.poisson(spec['mean'], size).astype(np.float64)
+    if dist == 'normal':
+        return rng.normal(spec['mean'], spec['sd'], size)
+    if dist == 'lognormal':
+        return rng.lognormal(spec['mean'], spec['sd'], size)
+    raise ValueError(f"Unknown distribution {dist!r}")
+
+
+def simulation_inputs(df):
+    """Per-lease arrays the simulation needs: fund codes, area, monthly rent, whole months to expiry
+
+    Also the in-place monthly rent per SF of each fund, which vacant suites are let at.
+    """
+    fund_codes, funds = pd.factorize(df['Fund'].to_numpy(dtype=object), sort=True)
+    occupied = ~df['Is_Vacant'].to_numpy(dtype=bool)
+    area = np.nan_to_num(df['Area'].to_numpy(dtype=np.float64))
+    rent = np.nan_to_num(df['Monthly_Rent'].to_numpy(dtype=np.float64))
+    occupied_area = np.bincount(fund_codes[occupied], weights=area[occupied], minlength=len(funds))
+    occupied_rent = np.bincount(fund_codes[occupied], weights=rent[occupied], minlength=len(funds))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rent_psf = np.where(occupied_area > 0, occupied_rent / occupied_area, 0.0)
+    return {
+        'funds': list(funds),
+        'fund_codes': fund_codes,
+        'occupied': occupied,
+        'area': area,
+        'rent': rent,
+        'rent_psf': rent_psf,
+        # A lease expiring part way through a month is in place for that month; leases already
+        # past expiry (0 months) roll over in the first month
+        'expiry': np.ceil(np.nan_to_num(df['Months_To_Expiry'].to_numpy(dtype=np.float64))).astype(np.int64),
+    }
+
+
+def _accumulate(totals, path_ids, fund_codes, n_funds, horizon, start, end, values):
+    """Add `values` over months [start, end) of each (path, fund) into totals via difference arrays"""
+    start = np.clip(start, 0, horizon)
+    end = np.clip(end, 0, horizon)
+    keep = end > start
+    base = (path_ids[keep] * n_funds + fund_codes[keep]) * (horizon + 1)
+    size = totals.size
+    totals += np.bincount(base + start[keep], weights=values[keep], minlength=size).reshape(totals.shape)
+    totals -= np.bincount(base + end[keep], weights=values[keep], minlength=size).reshape(totals.shape)
+
+
+def simulate_batch(inputs, assumptions, n_paths, horizon, seed):
+    """Simulate n_paths paths; returns (occupied SF, monthly revenue), each shaped (paths, funds, months)
+
+    Every occupied lease runs to its expiry, then renews (at a sampled rent change and
+    term) or moves out, stays vacant for a sampled downtime and is re-let at a sampled
+    rent change; the cycle repeats until every lease is past the horizon. Suites vacant
+    in the snapshot are let after a sampled lease-up at vacant_rent_psf (default: the
+    fund's in-place rent per SF) for a new-lease term, then roll over the same way.
+    All draws for a round are made for every path and lease at once.
+    """
+    rng = np.random.default_rng(seed)
+    n_funds = len(inputs['funds'])
+    fund_codes = np.tile(inputs['fund_codes'], n_paths)
+    area = np.tile(inputs['area'], n_paths)
+    rent = np.tile(inputs['rent'], n_paths)
+    vacant = np.tile(~inputs['occupied'], n_paths)
+    end = np.where(vacant, 0, np.tile(inputs['expiry'], n_paths))
+    path_ids = np.repeat(np.arange(n_paths), len(inputs['occupied']))
+
+    occupied_sf = np.zeros((n_paths, n_funds, horizon + 1))
+    revenue = np.zeros((n_paths, n_funds, horizon + 1))
+    start = np.zeros_like(end)
+    _accumulate(occupied_sf, path_ids, fund_codes, n_funds, horizon, start, end, area)
+    _accumulate(revenue, path_ids, fund_codes, n_funds, horizon, start, end, rent)
+
+    leasing = np.flatnonzero(vacant)
+    if len(leasing):
+        size = len(leasing)
+        lease_up = np.maximum(np.rint(sample(rng, assumptions['vacant_lease_up_months'], size)), 0)
+        term = sample(rng, assumptions['new_lease_term_months'], size)
+        lease_start = lease_up.astype(np.int64)
+        lease_end = lease_start + np.maximum(np.rint(term), 1).astype(np.int64)
+        rent_psf = assumptions['vacant_rent_psf']
+        rent_psf = inputs['rent_psf'][fund_codes[leasing]] if rent_psf is None else float(rent_psf)
+        rent[leasing] = area[leasing] * rent_psf
+        ids, codes = path_ids[leasing], fund_codes[leasing]
+        _accumulate(occupied_sf, ids, codes, n_funds, horizon, lease_start, lease_end, area[leasing])
+        _accumulate(revenue, ids, codes, n_funds, horizon, lease_start, lease_end, rent[leasing])
+        end[leasing] = lease_end
+
+    active = np.flatnonzero(end < horizon)
+    while len(active):
+        size = len(active)
+        renew = rng.random(size) < assumptions['renewal_probability']
+        downtime = np.where(renew, 0, np.maximum(np.rint(sample(rng, assumptions['downtime_months'], size)), 0))
+        change = np.where(renew, sample(rng, assumptions['renewal_rent_change'], size),
+                          sample(rng, assumptions['relet_rent_change'], size))
+        term = np.where(renew, sample(rng, assumptions['renewal_term_months'], size),
+                        sample(rng, assumptions['new_lease_term_months'], size))
+
+        lease_start = end[active] + downtime.astype(np.int64)
+        lease_end = lease_start + np.maximum(np.rint(term), 1).astype(np.int64)
+        rent[active] = rent[active] * (1 + change)
+        ids, codes = path_ids[active], fund_codes[active]
+        _accumulate(occupied_sf, ids, codes, n_funds, horizon, lease_start, lease_end, area[active])
+        _accumulate(revenue, ids, codes, n_funds, horizon, lease_start, lease_end, rent[active])
+        end[active] = lease_end
+        active = active[lease_end < horizon]
+
+    return np.cumsum(occupied_sf, axis=2)[:, :, :horizon], np.cumsum(revenue, axis=2)[:, :, :horizon]
+
+
+def simulate_paths(df, assumptions=None, n_paths=DEFAULT_PATHS, horizon=DEFAULT_SIM_HORIZON, seed=None,
+                   batch_size=DEFAULT_PATH_BATCH, parallel=False, max_workers=None):
+    """Occupied SF and monthly revenue of every fund on every simulated path
+
+    Paths run in batches of batch_size, each with its own child of SeedSequence(seed),
+    so a seeded run gives the same paths serially or in a process pool of any size.
+    Returns (funds, occupied_sf, revenue) with arrays shaped (paths, funds, months).
+    """
+    assumptions = {**DEFAULT_ASSUMPTIONS, **(assumptions or {})}
+    inputs = simulation_inputs(df)
+    sizes = [min(batch_size, n_paths - start) for start in range(0, n_paths, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    results = None
+    workers = min(max_workers or os.cpu_count() or 1, len(sizes))
+    if parallel and workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(simulate_batch, inputs, assumptions, size, horizon, batch_seed)
+                           for size, batch_seed in zip(sizes, seeds)]
+                results = [future.result() for future in futures]
+        except (BrokenProcessPool, OSError):
+            results = None
+    if results is None:
+        results = [simulate_batch(inputs, assumptions, size, horizon, batch_seed)
+                   for size, batch_seed in zip(sizes, seeds)]
+
+    n_funds = len(inputs['funds'])
+    occupied_sf = np.concatenate([r[0] for r in results]) if results else np.zeros((0, n_funds, horizon))
+    revenue = np.concatenate([r[1] for r in results]) if results else np.zeros((0, n_funds, horizon))
+    return inputs['funds'], occupied_sf, revenue
+
+
+def simulate_occupancy(df, analysis_date, assumptions=None, n_paths=DEFAULT_PATHS, horizon=DEFAULT_SIM_HORIZON,
+                       seed=None, percentiles=PERCENTILES, **options):
+    """Percentile bands of occupancy rate and monthly revenue per fund per month
+
+    Returns a frame indexed by (Fund, Month) with occupancy_pNN (% of total SF,
+    vacant suites included) and revenue_pNN columns for each percentile. `options`
+    go to simulate_paths (batch_size, parallel, max_workers).
+    """
+    funds, occupied_sf, revenue = simulate_paths(df, assumptions, n_paths, horizon, seed, **options)
+    total_sf = pd.Series(np.nan_to_num(df['Area'].to_numpy(dtype=np.float64))).groupby(
+        df['Fund'].to_numpy(dtype=object)).sum().reindex(funds).to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        occupancy = np.where(total_sf[None, :, None] > 0, occupied_sf / total_sf[None, :, None] * 100, 0.0)
+
+    months = pd.DatetimeIndex(month_grid(analysis_date, horizon), name='Month')
+    index = pd.MultiIndex.from_product([funds, months], names=['Fund', 'Month'])
+    bands = {}
+    for name, paths in (('occupancy', occupancy), ('revenue', revenue)):
+        values = np.percentile(paths, percentiles, axis=0) if len(paths) else np.zeros(
+            (len(percentiles), len(funds), horizon))
+        for pct, band in zip(percentiles, values):
+            bands[f'{name}_p{pct:02d}'] = band.ravel()
+    return pd.DataFrame(bands, index=index)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+ROLLUP_COLUMNS = ['fund', 'property', 'total_sf', 'occupied_sf', 'vacant_sf', 'annual_rent', 'rent_psf', 'walt',
+                  'lease_count', 'vacant_leases', 'has_vacancy']
+
+
+def property_name(properties):
+    """Display name of 'Name (code)' property strings"""
+    return properties.str.split('(').str[0].str.strip()
+
+
+def property_rollup(df):
+    """One row per property of a snapshot, indexed by Prop_Code, from a single grouped pass
+
+    Columns are ROLLUP_COLUMNS: SF split by occupancy, annual rent (every row), rent
+    per occupied SF, area-weighted WALT of the occupied leases, lease counts and a
+    vacancy flag.
+    """
+    vacant = df['Is_Vacant'].to_numpy(dtype=bool)
+    area = df['Area'].to_numpy(dtype=np.float64)
+    inputs = pd.DataFrame({
+        'Prop_Code': df['Prop_Code'].to_numpy(dtype=object),
+        'fund': df['Fund'].to_numpy(dtype=object),
+        'property': df['Property'].to_numpy(dtype=object),
+        'total_sf': area,
+        'occupied_sf': np.where(vacant, 0.0, area),
+        'vacant_sf': np.where(vacant, area, 0.0),
+        'annual_rent': df['Annual_Rent'].to_numpy(dtype=np.float64),
+        'walt_weight': np.where(vacant, 0.0, area * df['Months_To_Expiry'].to_numpy(dtype=np.float64)),
+        'lease_count': 1,
+        'vacant_leases': vacant.astype(np.int64),
+    })
+    grouped = inputs.groupby('Prop_Code', sort=True)
+    rollup = grouped[['fund', 'property']].first()
+    rollup['property'] = property_name(rollup['property'])
+    sums = grouped[['total_sf', 'occupied_sf', 'vacant_sf', 'annual_rent', 'walt_weight', 'lease_count',
+                    'vacant_leases']].sum()
+    rollup = rollup.join(sums)
+    occupied_sf = rollup['occupied_sf'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rollup['rent_psf'] = np.where(occupied_sf > 0, rollup['annual_rent'].to_numpy() / occupied_sf, 0.0)
+        rollup['walt'] = np.where(occupied_sf > 0, rollup['walt_weight'].to_numpy() / occupied_sf, 0.0)
+    rollup['has_vacancy'] = rollup['vacant_leases'].to_numpy() > 0
+    return rollup[ROLLUP_COLUMNS]
+
+
+def top_n(rollup, n=10, column='annual_rent', fund=None):
+    """The n rows with the largest `column`, largest first; ties keep the roll-up's Prop_Code order
+
+    The roll-up has one row per property, so a stable full sort is cheap and, unlike a
+    partial sort, decides which tied rows make the cut-off.
+    """
+    if fund is not None:
+        rollup = rollup[rollup['fund'].to_numpy() == fund]
+    values = np.nan_to_num(rollup[column].to_numpy(dtype=np.float64), nan=-np.inf)
+    return rollup.iloc[np.argsort(-values, kind='stable')[:n]]
+
+
+def top_properties(rollup, n=10, fund=None):
+    """Top properties by annual rent as the list of dicts the dashboard heatmap and JSON export use"""
+    top = top_n(rollup, n, fund=fund)
+    return [
+        {'property': name, 'prop_code': code, 'total_sf': total_sf, 'annual_rent': rent, 'has_vacancy': bool(vacancy)}
+        for code, name, total_sf, rent, vacancy in zip(top.index, top['property'], top['total_sf'].tolist(),
+                                                       top['annual_rent'].tolist(), top['has_vacancy'])
+    ]
@@ -4,6 +4,7 @@ import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 from dashboard_data_processor import RentRollProcessor
 from dashboard_components import DashboardComponents
+from fund_classification import fund_key
 import pandas as pd
 from datetime import datetime
 
@@ -14,22 +15,32 @@ app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 processor = RentRollProcessor()
 processor.load_data()
 
-# Calculate metrics for both funds
-fund2_metrics = processor.calculate_fund_metrics('Fund 2')
-fund3_metrics = processor.calculate_fund_metrics('Fund 3')
+# Calculate metrics for every configured fund
+fund_metrics = {fund: processor.calculate_fund_metrics(fund) for fund in processor.funds}
+
+# Every fund x period x metric in one array for the trend charts and tables
+cube = processor.metrics_cube()
+
+# WALT and occupied SF of the latest rent roll at each of the next 60 month ends
+walt_curves = processor.walt_curve()
+
+# Risk score of every property of the latest rent roll, riskiest first
+property_risk = processor.property_risk()
 
 # Generate insights
-fund2_insights = processor.generate_insights('Fund 2', fund2_metrics)
-fund3_insights = processor.generate_insights('Fund 3', fund3_metrics)
+fund_insights = {fund: processor.generate_insights(fund, metrics) for fund, metrics in fund_metrics.items()}
 
 # Create dashboard components
 components = DashboardComponents()
 
 def create_fund_dashboard(fund_name, metrics, insights):
     """Create a complete dashboard for a specific fund"""
+    fund_cube = cube.sel(funds=fund_name)
     
-    q2_metrics = metrics['Q2_2025']
+    q2_metrics = metrics[metrics['latest_period']]
+    q1_metrics = metrics[metrics['previous_period']]
     q2_summary = metrics['q2_summary']
+    vs_prior = f"vs {q1_metrics['period']}"
     
     # KPI Cards Row
     kpi_row = dbc.Row([
@@ -39,7 +50,7 @@ def create_fund_dashboard(fund_name, metrics, insights):
                     "Occupancy Rate",
                     q2_metrics['occupancy_rate'],
                     delta=q2_summary['occupancy_change'],
-                    delta_text=f"vs Q1 2025",
+                    delta_text=vs_prior,
                     color='green' if q2_summary['occupancy_change'] > 0 else 'red'
                 ),
                 config={'displayModeBar': False}
@@ -63,7 +74,7 @@ def create_fund_dashboard(fund_name, metrics, insights):
                     "WALT (months)",
                     q2_metrics['walt'],
                     delta=q2_summary['walt_change'],
-                    delta_text=f"vs Q1 2025",
+                    delta_text=vs_prior,
                     color='orange' if q2_metrics['walt'] < 36 else 'green'
                 ),
                 config={'displayModeBar': False}
@@ -74,9 +85,9 @@ def create_fund_dashboard(fund_name, metrics, insights):
                 figure=components.create_kpi_card(
                     "Vacant SF",
                     q2_metrics['vacant_sf'] / 1e6,
-                    delta=(q2_metrics['vacant_sf'] - metrics['Q1_2025']['vacant_sf']) / 1e6,
-                    delta_text="vs Q1 2025 (M)",
-                    color='red' if q2_metrics['vacant_sf'] > metrics['Q1_2025']['vacant_sf'] else 'green'
+                    delta=(q2_metrics['vacant_sf'] - q1_metrics['vacant_sf']) / 1e6,
+                    delta_text=f"{vs_prior} (M)",
+                    color='red' if q2_metrics['vacant_sf'] > q1_metrics['vacant_sf'] else 'green'
                 ),
                 config={'displayModeBar': False}
             )
@@ -87,13 +98,13 @@ def create_fund_dashboard(fund_name, metrics, insights):
     charts_row1 = dbc.Row([
         dbc.Col([
             dcc.Graph(
-                figure=components.create_occupancy_trend(metrics),
+                figure=components.create_occupancy_trend(fund_cube),
                 config={'displayModeBar': False}
             )
         ], width=6),
         dbc.Col([
             dcc.Graph(
-                figure=components.create_revenue_waterfall(metrics),
+                figure=components.create_revenue_waterfall(fund_cube, metrics['revenue_bridge']),
                 config={'displayModeBar': False}
             )
         ], width=6)
@@ -140,11 +151,49 @@ def create_fund_dashboard(fund_name, metrics, insights):
         ], width=6)
     ], className="mb-4")
     
+    projection_row = dbc.Row([
+        dbc.Col([
+            dcc.Graph(
+                figure=components.create_rent_projection_chart(metrics['rent_projection']),
+                config={'displayModeBar': False}
+            )
+        ], width=6),
+        dbc.Col([
+            dcc.Graph(
+                figure=components.create_walt_curve_chart(walt_curves.loc[fund_name]),
+                config={'displayModeBar': False}
+            )
+        ], width=6)
+    ], className="mb-4")
+    
+    distribution_row = dbc.Row([
+        dbc.Col([
+            dcc.Graph(
+                figure=components.create_rent_distribution_chart(metrics['rent_distribution']),
+                config={'displayModeBar': False}
+            )
+        ], width=6),
+        dbc.Col([
+            dcc.Graph(
+                figure=components.create_vacancy_aging_chart(metrics['vacancy_aging']),
+                config={'displayModeBar': False}
+            )
+        ], width=6)
+    ], className="mb-4")
+    
+    # Property risk, sortable and filterable in the browser
+    risk_table_row = dbc.Row([
+        dbc.Col([
+            html.H4("Property Risk", className="mb-3"),
+            components.create_property_risk_table(property_risk[property_risk['Fund'] == fund_name])
+        ], width=12)
+    ], className="mb-4")
+    
     # Summary Table
     table_row = dbc.Row([
         dbc.Col([
             dcc.Graph(
-                figure=components.create_quarterly_comparison_table(metrics),
+                figure=components.create_quarterly_comparison_table(fund_cube),
                 config={'displayModeBar': False}
             )
         ], width=12)
@@ -172,7 +221,7 @@ def create_fund_dashboard(fund_name, metrics, insights):
     # Q2 Performance Summary Card
     summary_card = dbc.Card([
         dbc.CardBody([
-            html.H4(f"{fund_name} - Q2 2025 Performance Summary", className="card-title"),
+            html.H4(f"{fund_name} - {q2_metrics['period']} Performance Summary", className="card-title"),
             html.Hr(),
             dbc.Row([
                 dbc.Col([
@@ -234,6 +283,9 @@ def create_fund_dashboard(fund_name, metrics, insights):
         charts_row2,
         charts_row3,
         charts_row4,
+        projection_row,
+        distribution_row,
+        risk_table_row,
         table_row,
         insights_section
     ])
@@ -242,33 +294,25 @@ def create_fund_dashboard(fund_name, metrics, insights):
 app.layout = dbc.Container([
     dbc.Row([
         dbc.Col([
-            html.H1("Q2 2025 Performance Dashboard", className="text-center mb-4"),
+            html.H1(f"{processor.snapshots.label(processor.snapshots.latest)} Performance Dashboard",
+                    className="text-center mb-4"),
             html.H3("Faropoint Rent Roll Analysis", className="text-center text-muted mb-4"),
             html.Hr()
         ], width=12)
     ]),
     
-    dcc.Tabs(id="fund-tabs", value='fund2', children=[
-        dcc.Tab(
-            label='Fund 2 Dashboard',
-            value='fund2',
-            children=[
-                html.Div(
-                    create_fund_dashboard('Fund 2', fund2_metrics, fund2_insights),
-                    className="mt-4"
-                )
-            ]
-        ),
+    dcc.Tabs(id="fund-tabs", value=fund_key(processor.funds[0]), children=[
         dcc.Tab(
-            label='Fund 3 Dashboard',
-            value='fund3',
+            label=f'{fund} Dashboard',
+            value=fund_key(fund),
             children=[
                 html.Div(
-                    create_fund_dashboard('Fund 3', fund3_metrics, fund3_insights),
+                    create_fund_dashboard(fund, fund_metrics[fund], fund_insights[fund]),
                     className="mt-4"
                 )
             ]
-        ),
+        )
+        for fund in processor.funds
     ]),
     
     # Footer
@@ -327,7 +371,7 @@ app.index_string = '''
 '''
 
 if __name__ == '__main__':
-    print("Starting Q2 2025 BI Dashboard...")
+    print(f"Starting {processor.snapshots.label(processor.snapshots.latest)} BI Dashboard...")
     print("Dashboard will be available at: http://127.0.0.1:8050/")
     print("\nPress Ctrl+C to stop the server.")
     app.run_server(debug=True)
\ No newline at end of file
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from fund_classification import default_classifier
+from rent_roll_schema import detect_schema, REQUIRED_COLUMNS
+
+RENT_ROLL_COLUMNS = ['Property', 'Units', 'Lease', 'Lease_Type', 'Area', 'Lease_From', 'Lease_To',
+                     'Term', 'Tenancy_Years', 'Monthly_Rent', 'Monthly_Rent_Area', 'Annual_Rent',
+                     'Annual_Rent_Area', 'Annual_Rec_Area', 'Annual_Misc_Area', 'Security_Deposit', 'LOC_Amount']
+
+TEXT_COLUMNS = ['Property', 'Units', 'Lease', 'Lease_Type']
+DATE_COLUMNS = ['Lease_From', 'Lease_To']
+NUMERIC_COLUMNS = [col for col in RENT_ROLL_COLUMNS if col not in TEXT_COLUMNS + DATE_COLUMNS]
+
+# Columns the dashboard metrics and trend analyses use; the deposit, recovery and
+# per-area columns are only read by the scripts that ask for every column.
+ANALYSIS_COLUMNS = ['Property', 'Units', 'Lease', 'Lease_Type', 'Area', 'Lease_From', 'Lease_To',
+                    'Monthly_Rent', 'Annual_Rent', 'Annual_Rent_Area']
+
+DEFAULT_FUNDS = default_classifier().include
+DAYS_PER_MONTH = 30.44
+
+
+def canonical_columns(columns=None):
+    """Requested columns (default: all) in canonical order, always including REQUIRED_COLUMNS"""
+    return [col for col in RENT_ROLL_COLUMNS if columns is None or col in columns or col in REQUIRED_COLUMNS]
+
+
+def conform_columns(df, columns):
+    """Return df with exactly `columns`, in order, adding all-NaN columns the export lacks"""
+    for col in columns:
+        if col not in df.columns:
+            df[col] = np.nan
+    return df[columns]
+
+
+def read_rent_roll(file_path, sheet_name='Report1', columns=None, schema=None):
+    """Read a rent roll sheet with canonical column names, locating the header by its labels
+
+    Only the requested columns (default: every canonical column) are parsed; ones
+    missing from the export come back as all-NaN columns. Rows are indexed from the
+    first row below the header block.
+    """
+    schema = schema or detect_schema(file_path, sheet_name)
+    columns = canonical_columns(columns)
+    present, _ = schema.select(columns)
+    names = {position: col for col, position in present.items()}
+    df = pd.read_excel(file_path, sheet_name=sheet_name, header=None, skiprows=schema.header_rows,
+                       usecols=sorted(names))
+    df.columns = [names[position] for position in df.columns]
+    return conform_columns(df, columns)
+
+
+def _map_unique(values, transform, missing=np.nan):
+    """Apply a string transform once per distinct value and broadcast it back to every row"""
+    codes, uniques = pd.factorize(values)
+    mapped = transform(pd.Series(uniques, dtype=object)).to_numpy()
+    # factorize marks missing values with -1, which picks up the trailing `missing` entry
+    lookup = np.append(mapped, missing)
+    return pd.Series(lookup[codes], index=values.index)
+
+
+def extract_prop_code(property_names):
+    """Pull the property code out of 'Name (code)' strings"""
+    return _map_unique(property_names, lambda names: names.str.extract(r'\(([^)]+)\)', expand=False))
+
+
+def classify_fund(prop_codes, classifier=None):
+    """Map property codes to fund labels with the rules in fund_classification.json"""
+    return (classifier or default_classifier()).classify(prop_codes)
+
+
+def months_to_expiry(lease_to, is_vacant, analysis_date):
+    """Months from analysis_date to lease expiry, floored at 0 and 0 for vacant or undated rows"""
+    days = (lease_to - pd.Timestamp(analysis_date)).dt.days.to_numpy(dtype=np.float64)
+    months = np.maximum(days / DAYS_PER_MONTH, 0)
+    return np.where(np.isnan(months) | np.asarray(is_vacant, dtype=bool), 0.0, months)
+
+
+def normalize_rent_roll(df, analysis_date, funds=DEFAULT_FUNDS, classifier=None):
+    """Clean a raw rent roll frame and add the derived analysis columns
+
+    Drops rows without a Property, coerces numeric and date columns, adds Prop_Code,
+    Fund, Is_Vacant, Months_To_Expiry and Tenant_Name, and keeps rows with a positive
+    Area in the given funds. Pass funds=None to keep every fund (including 'Other' and
+    'Unknown') and a FundClassifier to override the default classification rules.
+    Prop_Code and Fund columns already on the frame (the streaming reader classifies
+    each batch) are kept rather than classified again.
+    """
+    df = df.dropna(subset=['Property']).copy()
+
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+
+    if 'Fund' not in df.columns:
+        df['Prop_Code'] = extract_prop_code(df['Property'])
+        df['Fund'] = classify_fund(df['Prop_Code'], classifier)
+    df['Is_Vacant'] = _map_unique(df['Lease'], lambda leases: leases.str.contains('VACANT', na=False),
+                                  missing=False)
+    df['Months_To_Expiry'] = months_to_expiry(df['Lease_To'], df['Is_Vacant'], analysis_date)
+
+    keep = df['Area'].notna() & (df['Area'] > 0)
+    if funds is not None:
+        keep &= df['Fund'].isin(funds)
+    df = df[keep].copy()
+
+    df['Tenant_Name'] = _map_unique(df['Lease'],
+                                    lambda leases: leases.str.extract(r'^([^(]+)', expand=False).str.strip())
+    return df
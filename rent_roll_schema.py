@@ -0,0 +1,132 @@
+import argparse
+import re
+
+from openpyxl import load_workbook
+
+# Canonical column -> header labels seen in property-management exports. Labels are
+# compared after normalize_header(), so case, spacing and line breaks do not matter.
+HEADER_ALIASES = {
+    'Property': ['property', 'property name'],
+    'Units': ['unit(s)', 'units', 'unit', 'suite'],
+    'Lease': ['lease', 'tenant', 'lease name'],
+    'Lease_Type': ['lease type'],
+    'Area': ['area', 'rentable area', 'square feet', 'sq ft'],
+    'Lease_From': ['lease from', 'lease start', 'start date'],
+    'Lease_To': ['lease to', 'lease end', 'end date', 'expiration date'],
+    'Term': ['term'],
+    'Tenancy_Years': ['tenancy years'],
+    'Monthly_Rent': ['monthly rent'],
+    'Monthly_Rent_Area': ['monthly rent/area'],
+    'Annual_Rent': ['annual rent'],
+    'Annual_Rent_Area': ['annual rent/area'],
+    'Annual_Rec_Area': ['annual rec./area', 'annual rec/area'],
+    'Annual_Misc_Area': ['annual misc/area', 'annual misc./area'],
+    'Security_Deposit': ['security deposit received', 'security deposit'],
+    'LOC_Amount': ['loc amount/bank guarantee', 'loc amount'],
+}
+REQUIRED_COLUMNS = ['Property', 'Lease', 'Area']
+DEFAULT_SCAN_ROWS = 20
+
+
+def normalize_header(label):
+    """Lowercase a header label and collapse whitespace, including around '/'"""
+    label = re.sub(r'\s+', ' ', str(label)).strip().lower()
+    return re.sub(r'\s*/\s*', '/', label)
+
+
+ALIAS_LOOKUP = {normalize_header(alias): col for col, aliases in HEADER_ALIASES.items() for alias in aliases}
+
+
+class RentRollSchema:
+    """Where the header sits in a rent roll sheet and which column holds each canonical field
+
+    `header_rows` is the number of sheet rows above the first data row, and `positions`
+    maps canonical names to zero-based column indexes. `unmapped` lists source headers
+    that matched no alias.
+    """
+
+    def __init__(self, header_row, header_rows, positions, source_headers, unmapped):
+        self.header_row = header_row
+        self.header_rows = header_rows
+        self.positions = positions
+        self.source_headers = source_headers
+        self.unmapped = unmapped
+
+    def select(self, columns):
+        """Positions of the requested canonical columns present in the sheet, and those missing"""
+        present = {col: self.positions[col] for col in columns if col in self.positions}
+        missing = [col for col in columns if col not in self.positions]
+        return present, missing
+
+    def __repr__(self):
+        return f"RentRollSchema(header_rows={self.header_rows}, columns={len(self.positions)})"
+
+
+def _is_text(value):
+    return isinstance(value, str) and value.strip() != ''
+
+
+def detect_schema(file_path, sheet_name='Report1', scan_rows=DEFAULT_SCAN_ROWS):
+    """Locate the header block in the first scan_rows rows and map it to canonical columns
+
+    The header row is the first row whose labels include every REQUIRED_COLUMNS alias;
+    following rows with text but no Property value continue it (multi-line labels such
+    as 'Monthly' / 'Rent/Area'). Raises ValueError when no header row is found.
+    """
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = list(wb[sheet_name].iter_rows(min_row=1, max_row=scan_rows, values_only=True))
+    finally:
+        wb.close()
+
+    header_index = None
+    for i, row in enumerate(rows):
+        labels = {ALIAS_LOOKUP.get(normalize_header(value)) for value in row if _is_text(value)}
+        if all(col in labels for col in REQUIRED_COLUMNS):
+            header_index = i
+            break
+    if header_index is None:
+        raise ValueError(f"No rent roll header with {', '.join(REQUIRED_COLUMNS)} in the first "
+                         f"{scan_rows} rows of {file_path}")
+
+    header = rows[header_index]
+    property_col = next(j for j, value in enumerate(header)
+                        if _is_text(value) and ALIAS_LOOKUP.get(normalize_header(value)) == 'Property')
+    parts = [[value] if _is_text(value) else [] for value in header]
+    end = header_index + 1
+    while end < len(rows):
+        row = rows[end]
+        if (property_col < len(row) and row[property_col] is not None) or not any(_is_text(v) for v in row):
+            break
+        for j, value in enumerate(row[:len(parts)]):
+            if _is_text(value):
+                parts[j].append(value)
+        end += 1
+
+    positions, source_headers, unmapped = {}, {}, []
+    for j, labels in enumerate(parts):
+        if not labels:
+            continue
+        label = normalize_header(' '.join(labels))
+        col = ALIAS_LOOKUP.get(label)
+        if col is None or col in positions:
+            unmapped.append(label)
+            continue
+        positions[col] = j
+        source_headers[col] = label
+    return RentRollSchema(header_index + 1, end, positions, source_headers, unmapped)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Show how rent roll headers map to canonical columns')
+    parser.add_argument('workbooks', nargs='+')
+    parser.add_argument('--sheet', default='Report1')
+    args = parser.parse_args()
+
+    for workbook in args.workbooks:
+        schema = detect_schema(workbook, args.sheet)
+        print(f"\n{workbook}: header at row {schema.header_row}, data from row {schema.header_rows + 1}")
+        for col, position in schema.positions.items():
+            print(f"  {position:>3}  {schema.source_headers[col]:<32} -> {col}")
+        for label in schema.unmapped:
+            print(f"       {label:<32} -> (unmapped)")
@@ -1,48 +1,41 @@
+import argparse
 import pandas as pd
 import numpy as np
 from datetime import datetime
 import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
+from dashboard_data_processor import RentRollProcessor
+from lease_diff import diff_snapshots, status_counts
 warnings.filterwarnings('ignore')
 
-# Function to process each rent roll file
-def process_rent_roll(file_path, analysis_date):
-    # Read the Excel file
-    df = pd.read_excel(file_path, sheet_name='Report1', skiprows=4)
-    
-    # Clean column names
-    df.columns = ['Property', 'Units', 'Lease', 'Lease_Type', 'Area', 'Lease_From', 'Lease_To', 
-                  'Term', 'Tenancy_Years', 'Monthly_Rent', 'Monthly_Rent_Area', 'Annual_Rent', 
-                  'Annual_Rent_Area', 'Annual_Rec_Area', 'Annual_Misc_Area', 'Security_Deposit', 'LOC_Amount']
-    
-    # Data cleaning
-    df = df.dropna(subset=['Property'])
-    df['Prop_Code'] = df['Property'].str.extract(r'\(([^)]+)\)')
-    df['Fund'] = df['Prop_Code'].apply(lambda x: 'Fund 3' if str(x).startswith('3') else ('Fund 2' if str(x).startswith('x') else 'Other') if pd.notna(x) else 'Unknown')
-    
-    # Process dates and identify vacancies
-    df['Lease_To'] = pd.to_datetime(df['Lease_To'], errors='coerce')
-    df['Is_Vacant'] = df['Lease'].str.contains('VACANT', na=False)
-    df['Months_To_Expiry'] = df.apply(lambda row: 
-        max((row['Lease_To'] - analysis_date).days / 30.44, 0) if pd.notna(row['Lease_To']) and not row['Is_Vacant'] else 0, 
-        axis=1)
-    
-    # Convert numeric columns
-    numeric_cols = ['Area', 'Monthly_Rent', 'Annual_Rent', 'Annual_Rent_Area']
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    # Filter valid data
-    df_valid = df[df['Area'].notna() & (df['Area'] > 0) & df['Fund'].isin(['Fund 2', 'Fund 3'])]
-    
-    return df_valid
+parser = argparse.ArgumentParser(description='Rent roll trend analysis across snapshots')
+parser.add_argument('--start', help='First snapshot date to include (YYYY-MM-DD)')
+parser.add_argument('--end', help='Last snapshot date to include (YYYY-MM-DD)')
+args = parser.parse_args()
+
+# Only these columns of the Fund 2 / Fund 3 partitions are read from the history store
+TREND_COLUMNS = ['Fund', 'Prop_Code', 'Units', 'Lease', 'Tenant_Name', 'Is_Vacant', 'Area', 'Annual_Rent',
+                 'Lease_From', 'Lease_To', 'Months_To_Expiry']
 
-# Load all three files
+# Discover every rent roll snapshot and bring the history store up to date (unchanged workbooks are skipped)
 print("Loading rent roll files...")
-dec_data = process_rent_roll('Faropoint Rent Roll All Funds (24DEC).xlsx', datetime(2024, 12, 31))
-mar_data = process_rent_roll('Faropoint Rent Roll All Funds (25MAR).xlsx', datetime(2025, 3, 31))
-jun_data = process_rent_roll('Faropoint Rent Roll All Funds (25JUN).xlsx', datetime(2025, 6, 30))
+processor = RentRollProcessor()
+processor.load_data()
+snapshots = processor.snapshots
+history = processor.scan_history(start=args.start, end=args.end, columns=TREND_COLUMNS, funds=['Fund 2', 'Fund 3'])
+snapshot_data = dict(tuple(history.groupby('Snapshot_Date')))
+period_keys = [key for key in snapshots.periods if pd.Timestamp(snapshots.snapshots[key].analysis_date) in snapshot_data]
+snapshot_data = {key: snapshot_data[pd.Timestamp(snapshots.snapshots[key].analysis_date)] for key in period_keys}
+periods = [snapshots.snapshots[key].analysis_date.strftime('%b %Y') for key in period_keys]
+if not period_keys:
+    available = ', '.join(f"{key} ({snapshots.snapshots[key].analysis_date:%Y-%m-%d})" for key in snapshots.periods)
+    parser.error(f"no snapshots between --start {args.start or '(first)'} and --end {args.end or '(last)'}; "
+                 f"available: {available or 'none'}")
+first_key, last_key = period_keys[0], period_keys[-1]
+first_date = snapshots.snapshots[first_key].analysis_date
+last_date = snapshots.snapshots[last_key].analysis_date
+span_months = (last_date.year - first_date.year) * 12 + last_date.month - first_date.month
 
 print("Files loaded successfully!")
 
@@ -81,14 +74,14 @@ def calculate_metrics(data, period_name):
     return metrics
 
 # Calculate metrics for all periods
-dec_metrics = calculate_metrics(dec_data, 'Dec 2024')
-mar_metrics = calculate_metrics(mar_data, 'Mar 2025')
-jun_metrics = calculate_metrics(jun_data, 'Jun 2025')
+period_metrics = {key: calculate_metrics(snapshot_data[key], label) for key, label in zip(period_keys, periods)}
+first_metrics = period_metrics[first_key]
+last_metrics = period_metrics[last_key]
 
 # Print trend analysis
 print("\n" + "=" * 80)
-print("RENT ROLL TREND ANALYSIS - 6 MONTH OVERVIEW")
-print("December 2024 → March 2025 → June 2025")
+print(f"RENT ROLL TREND ANALYSIS - {span_months} MONTH OVERVIEW")
+print(" → ".join(periods))
 print("=" * 80)
 
 # 1. PORTFOLIO SIZE TRENDS
@@ -98,13 +91,12 @@ print("-" * 50)
 for fund in ['Fund 2', 'Fund 3']:
     print(f"\n{fund}:")
     print(f"  Total SF:")
-    print(f"    Dec 2024: {dec_metrics[fund]['Total_SF']:>15,.0f}")
-    print(f"    Mar 2025: {mar_metrics[fund]['Total_SF']:>15,.0f}")
-    print(f"    Jun 2025: {jun_metrics[fund]['Total_SF']:>15,.0f}")
+    for key, label in zip(period_keys, periods):
+        print(f"    {label}: {period_metrics[key][fund]['Total_SF']:>15,.0f}")
     
-    dec_to_jun_change = ((jun_metrics[fund]['Total_SF'] - dec_metrics[fund]['Total_SF']) / 
-                         dec_metrics[fund]['Total_SF'] * 100) if dec_metrics[fund]['Total_SF'] > 0 else 0
-    print(f"    6-Month Change: {dec_to_jun_change:>10.1f}%")
+    total_sf_change = ((last_metrics[fund]['Total_SF'] - first_metrics[fund]['Total_SF']) / 
+                         first_metrics[fund]['Total_SF'] * 100) if first_metrics[fund]['Total_SF'] > 0 else 0
+    print(f"    {span_months}-Month Change: {total_sf_change:>10.1f}%")
 
 # 2. OCCUPANCY TRENDS
 print("\n\n2. OCCUPANCY RATE TRENDS")
@@ -113,17 +105,15 @@ print("-" * 50)
 for fund in ['Fund 2', 'Fund 3']:
     print(f"\n{fund}:")
     print(f"  Occupancy Rate:")
-    print(f"    Dec 2024: {dec_metrics[fund]['Occupancy_Rate']:>10.1f}%")
-    print(f"    Mar 2025: {mar_metrics[fund]['Occupancy_Rate']:>10.1f}%")
-    print(f"    Jun 2025: {jun_metrics[fund]['Occupancy_Rate']:>10.1f}%")
+    for key, label in zip(period_keys, periods):
+        print(f"    {label}: {period_metrics[key][fund]['Occupancy_Rate']:>10.1f}%")
     
-    occ_change = jun_metrics[fund]['Occupancy_Rate'] - dec_metrics[fund]['Occupancy_Rate']
-    print(f"    6-Month Change: {occ_change:>7.1f} pp")
+    occ_change = last_metrics[fund]['Occupancy_Rate'] - first_metrics[fund]['Occupancy_Rate']
+    print(f"    {span_months}-Month Change: {occ_change:>7.1f} pp")
     
     print(f"  Vacant SF:")
-    print(f"    Dec 2024: {dec_metrics[fund]['Vacant_SF']:>15,.0f}")
-    print(f"    Mar 2025: {mar_metrics[fund]['Vacant_SF']:>15,.0f}")
-    print(f"    Jun 2025: {jun_metrics[fund]['Vacant_SF']:>15,.0f}")
+    for key, label in zip(period_keys, periods):
+        print(f"    {label}: {period_metrics[key][fund]['Vacant_SF']:>15,.0f}")
 
 # 3. REVENUE TRENDS
 print("\n\n3. REVENUE TRENDS")
@@ -132,18 +122,16 @@ print("-" * 50)
 for fund in ['Fund 2', 'Fund 3']:
     print(f"\n{fund}:")
     print(f"  Annual Revenue:")
-    print(f"    Dec 2024: ${dec_metrics[fund]['Annual_Revenue']:>14,.0f}")
-    print(f"    Mar 2025: ${mar_metrics[fund]['Annual_Revenue']:>14,.0f}")
-    print(f"    Jun 2025: ${jun_metrics[fund]['Annual_Revenue']:>14,.0f}")
+    for key, label in zip(period_keys, periods):
+        print(f"    {label}: ${period_metrics[key][fund]['Annual_Revenue']:>14,.0f}")
     
-    rev_change = ((jun_metrics[fund]['Annual_Revenue'] - dec_metrics[fund]['Annual_Revenue']) / 
-                  dec_metrics[fund]['Annual_Revenue'] * 100) if dec_metrics[fund]['Annual_Revenue'] > 0 else 0
-    print(f"    6-Month Growth: {rev_change:>8.1f}%")
+    rev_change = ((last_metrics[fund]['Annual_Revenue'] - first_metrics[fund]['Annual_Revenue']) / 
+                  first_metrics[fund]['Annual_Revenue'] * 100) if first_metrics[fund]['Annual_Revenue'] > 0 else 0
+    print(f"    {span_months}-Month Growth: {rev_change:>8.1f}%")
     
     print(f"  Average Rent/SF:")
-    print(f"    Dec 2024: ${dec_metrics[fund]['Avg_Rent_PSF']:>9.2f}")
-    print(f"    Mar 2025: ${mar_metrics[fund]['Avg_Rent_PSF']:>9.2f}")
-    print(f"    Jun 2025: ${jun_metrics[fund]['Avg_Rent_PSF']:>9.2f}")
+    for key, label in zip(period_keys, periods):
+        print(f"    {label}: ${period_metrics[key][fund]['Avg_Rent_PSF']:>9.2f}")
 
 # 4. WALT TRENDS
 print("\n\n4. WALT TRENDS (Weighted Average Lease Term)")
@@ -152,12 +140,11 @@ print("-" * 50)
 for fund in ['Fund 2', 'Fund 3']:
     print(f"\n{fund}:")
     print(f"  WALT (months):")
-    print(f"    Dec 2024: {dec_metrics[fund]['WALT']:>10.1f}")
-    print(f"    Mar 2025: {mar_metrics[fund]['WALT']:>10.1f}")
-    print(f"    Jun 2025: {jun_metrics[fund]['WALT']:>10.1f}")
+    for key, label in zip(period_keys, periods):
+        print(f"    {label}: {period_metrics[key][fund]['WALT']:>10.1f}")
     
-    walt_change = jun_metrics[fund]['WALT'] - dec_metrics[fund]['WALT']
-    print(f"    6-Month Change: {walt_change:>7.1f} months")
+    walt_change = last_metrics[fund]['WALT'] - first_metrics[fund]['WALT']
+    print(f"    {span_months}-Month Change: {walt_change:>7.1f} months")
 
 # 5. LEASE ROLLOVER RISK TRENDS
 print("\n\n5. NEAR-TERM LEASE EXPIRY TRENDS (Next 12 Months)")
@@ -166,35 +153,31 @@ print("-" * 50)
 for fund in ['Fund 2', 'Fund 3']:
     print(f"\n{fund}:")
     print(f"  SF Expiring in Next 12 Months:")
-    print(f"    Dec 2024: {dec_metrics[fund]['Near_Term_Expiry_SF']:>15,.0f} ({dec_metrics[fund]['Near_Term_Expiry_Pct']:.1f}%)")
-    print(f"    Mar 2025: {mar_metrics[fund]['Near_Term_Expiry_SF']:>15,.0f} ({mar_metrics[fund]['Near_Term_Expiry_Pct']:.1f}%)")
-    print(f"    Jun 2025: {jun_metrics[fund]['Near_Term_Expiry_SF']:>15,.0f} ({jun_metrics[fund]['Near_Term_Expiry_Pct']:.1f}%)")
+    for key, label in zip(period_keys, periods):
+        print(f"    {label}: {period_metrics[key][fund]['Near_Term_Expiry_SF']:>15,.0f} ({period_metrics[key][fund]['Near_Term_Expiry_Pct']:.1f}%)")
 
 # 6. LEASING ACTIVITY ANALYSIS
 print("\n\n6. LEASING ACTIVITY ANALYSIS")
 print("-" * 50)
 
-# Identify new leases and expirations
+# Join consecutive snapshots lease by lease, so renewals and renamed leases are not counted as churn
+activity = {}
+for prev_key, cur_key in zip(period_keys, period_keys[1:]):
+    activity[cur_key] = status_counts(diff_snapshots(snapshot_data[prev_key], snapshot_data[cur_key]))
+
 for fund in ['Fund 2', 'Fund 3']:
     print(f"\n{fund}:")
     
-    # Count leases by tenant name to track changes
-    dec_tenants = set(dec_data[(dec_data['Fund'] == fund) & (~dec_data['Is_Vacant'])]['Lease'].unique())
-    mar_tenants = set(mar_data[(mar_data['Fund'] == fund) & (~mar_data['Is_Vacant'])]['Lease'].unique())
-    jun_tenants = set(jun_data[(jun_data['Fund'] == fund) & (~jun_data['Is_Vacant'])]['Lease'].unique())
-    
-    new_in_mar = len(mar_tenants - dec_tenants)
-    lost_by_mar = len(dec_tenants - mar_tenants)
-    new_in_jun = len(jun_tenants - mar_tenants)
-    lost_by_jun = len(mar_tenants - jun_tenants)
-    
-    print(f"  Dec 2024 → Mar 2025:")
-    print(f"    New Leases: {new_in_mar}")
-    print(f"    Lost Leases: {lost_by_mar}")
-    print(f"  Mar 2025 → Jun 2025:")
-    print(f"    New Leases: {new_in_jun}")
-    print(f"    Lost Leases: {lost_by_jun}")
-    print(f"  Net Change (6 months): {len(jun_tenants) - len(dec_tenants)}")
+    for prev_key, cur_key, prev_label, cur_label in zip(period_keys, period_keys[1:], periods, periods[1:]):
+        counts = activity[cur_key].reindex([fund], fill_value=0).iloc[0]
+        print(f"  {prev_label} → {cur_label}:")
+        print(f"    New Leases: {counts['new']}")
+        print(f"    Lost Leases: {counts['lost']}")
+        print(f"    Renewed / Extended: {counts['renewed'] + counts['extended']}")
+        print(f"    Rent Changed: {counts['rent_changed']}")
+    occupied = {key: (~snapshot_data[key].loc[snapshot_data[key]['Fund'] == fund, 'Is_Vacant']).sum()
+                for key in (first_key, last_key)}
+    print(f"  Net Change ({span_months} months): {occupied[last_key] - occupied[first_key]}")
 
 # Create visualizations
 print("\nCreating trend visualizations...")
@@ -204,9 +187,8 @@ fig = plt.figure(figsize=(20, 16))
 
 # 1. Occupancy Trend
 ax1 = plt.subplot(3, 3, 1)
-periods = ['Dec 2024', 'Mar 2025', 'Jun 2025']
-fund2_occ = [dec_metrics['Fund 2']['Occupancy_Rate'], mar_metrics['Fund 2']['Occupancy_Rate'], jun_metrics['Fund 2']['Occupancy_Rate']]
-fund3_occ = [dec_metrics['Fund 3']['Occupancy_Rate'], mar_metrics['Fund 3']['Occupancy_Rate'], jun_metrics['Fund 3']['Occupancy_Rate']]
+fund2_occ = [period_metrics[key]['Fund 2']['Occupancy_Rate'] for key in period_keys]
+fund3_occ = [period_metrics[key]['Fund 3']['Occupancy_Rate'] for key in period_keys]
 
 ax1.plot(periods, fund2_occ, 'o-', linewidth=2, markersize=8, label='Fund 2')
 ax1.plot(periods, fund3_occ, 's-', linewidth=2, markersize=8, label='Fund 3')
@@ -218,8 +200,8 @@ ax1.grid(True, alpha=0.3)
 
 # 2. Revenue Trend
 ax2 = plt.subplot(3, 3, 2)
-fund2_rev = [dec_metrics['Fund 2']['Annual_Revenue']/1e6, mar_metrics['Fund 2']['Annual_Revenue']/1e6, jun_metrics['Fund 2']['Annual_Revenue']/1e6]
-fund3_rev = [dec_metrics['Fund 3']['Annual_Revenue']/1e6, mar_metrics['Fund 3']['Annual_Revenue']/1e6, jun_metrics['Fund 3']['Annual_Revenue']/1e6]
+fund2_rev = [period_metrics[key]['Fund 2']['Annual_Revenue']/1e6 for key in period_keys]
+fund3_rev = [period_metrics[key]['Fund 3']['Annual_Revenue']/1e6 for key in period_keys]
 
 ax2.plot(periods, fund2_rev, 'o-', linewidth=2, markersize=8, label='Fund 2')
 ax2.plot(periods, fund3_rev, 's-', linewidth=2, markersize=8, label='Fund 3')
@@ -230,8 +212,8 @@ ax2.grid(True, alpha=0.3)
 
 # 3. WALT Trend
 ax3 = plt.subplot(3, 3, 3)
-fund2_walt = [dec_metrics['Fund 2']['WALT'], mar_metrics['Fund 2']['WALT'], jun_metrics['Fund 2']['WALT']]
-fund3_walt = [dec_metrics['Fund 3']['WALT'], mar_metrics['Fund 3']['WALT'], jun_metrics['Fund 3']['WALT']]
+fund2_walt = [period_metrics[key]['Fund 2']['WALT'] for key in period_keys]
+fund3_walt = [period_metrics[key]['Fund 3']['WALT'] for key in period_keys]
 
 ax3.plot(periods, fund2_walt, 'o-', linewidth=2, markersize=8, label='Fund 2')
 ax3.plot(periods, fund3_walt, 's-', linewidth=2, markersize=8, label='Fund 3')
@@ -242,8 +224,8 @@ ax3.grid(True, alpha=0.3)
 
 # 4. Vacant SF Trend
 ax4 = plt.subplot(3, 3, 4)
-fund2_vac = [dec_metrics['Fund 2']['Vacant_SF']/1e6, mar_metrics['Fund 2']['Vacant_SF']/1e6, jun_metrics['Fund 2']['Vacant_SF']/1e6]
-fund3_vac = [dec_metrics['Fund 3']['Vacant_SF']/1e6, mar_metrics['Fund 3']['Vacant_SF']/1e6, jun_metrics['Fund 3']['Vacant_SF']/1e6]
+fund2_vac = [period_metrics[key]['Fund 2']['Vacant_SF']/1e6 for key in period_keys]
+fund3_vac = [period_metrics[key]['Fund 3']['Vacant_SF']/1e6 for key in period_keys]
 
 ax4.plot(periods, fund2_vac, 'o-', linewidth=2, markersize=8, label='Fund 2')
 ax4.plot(periods, fund3_vac, 's-', linewidth=2, markersize=8, label='Fund 3')
@@ -254,8 +236,8 @@ ax4.grid(True, alpha=0.3)
 
 # 5. Average Rent PSF Trend
 ax5 = plt.subplot(3, 3, 5)
-fund2_rent = [dec_metrics['Fund 2']['Avg_Rent_PSF'], mar_metrics['Fund 2']['Avg_Rent_PSF'], jun_metrics['Fund 2']['Avg_Rent_PSF']]
-fund3_rent = [dec_metrics['Fund 3']['Avg_Rent_PSF'], mar_metrics['Fund 3']['Avg_Rent_PSF'], jun_metrics['Fund 3']['Avg_Rent_PSF']]
+fund2_rent = [period_metrics[key]['Fund 2']['Avg_Rent_PSF'] for key in period_keys]
+fund3_rent = [period_metrics[key]['Fund 3']['Avg_Rent_PSF'] for key in period_keys]
 
 ax5.plot(periods, fund2_rent, 'o-', linewidth=2, markersize=8, label='Fund 2')
 ax5.plot(periods, fund3_rent, 's-', linewidth=2, markersize=8, label='Fund 3')
@@ -266,8 +248,8 @@ ax5.grid(True, alpha=0.3)
 
 # 6. Near-term Expiry Risk Trend
 ax6 = plt.subplot(3, 3, 6)
-fund2_risk = [dec_metrics['Fund 2']['Near_Term_Expiry_Pct'], mar_metrics['Fund 2']['Near_Term_Expiry_Pct'], jun_metrics['Fund 2']['Near_Term_Expiry_Pct']]
-fund3_risk = [dec_metrics['Fund 3']['Near_Term_Expiry_Pct'], mar_metrics['Fund 3']['Near_Term_Expiry_Pct'], jun_metrics['Fund 3']['Near_Term_Expiry_Pct']]
+fund2_risk = [period_metrics[key]['Fund 2']['Near_Term_Expiry_Pct'] for key in period_keys]
+fund3_risk = [period_metrics[key]['Fund 3']['Near_Term_Expiry_Pct'] for key in period_keys]
 
 ax6.plot(periods, fund2_risk, 'o-', linewidth=2, markersize=8, label='Fund 2')
 ax6.plot(periods, fund3_risk, 's-', linewidth=2, markersize=8, label='Fund 3')
@@ -276,24 +258,13 @@ ax6.set_ylabel('% of SF Expiring in 12 Months')
 ax6.legend()
 ax6.grid(True, alpha=0.3)
 
-# 7. Portfolio Composition - Dec 2024
-ax7 = plt.subplot(3, 3, 7)
+# 7-9. Portfolio Composition for the three most recent snapshots
 labels = ['Fund 2', 'Fund 3']
-sizes = [dec_metrics['Fund 2']['Total_SF'], dec_metrics['Fund 3']['Total_SF']]
-ax7.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
-ax7.set_title('Dec 2024 Portfolio (by SF)', fontsize=12, fontweight='bold')
-
-# 8. Portfolio Composition - Mar 2025
-ax8 = plt.subplot(3, 3, 8)
-sizes = [mar_metrics['Fund 2']['Total_SF'], mar_metrics['Fund 3']['Total_SF']]
-ax8.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
-ax8.set_title('Mar 2025 Portfolio (by SF)', fontsize=12, fontweight='bold')
-
-# 9. Portfolio Composition - Jun 2025
-ax9 = plt.subplot(3, 3, 9)
-sizes = [jun_metrics['Fund 2']['Total_SF'], jun_metrics['Fund 3']['Total_SF']]
-ax9.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
-ax9.set_title('Jun 2025 Portfolio (by SF)', fontsize=12, fontweight='bold')
+for position, (key, label) in enumerate(zip(period_keys[-3:], periods[-3:]), start=7):
+    ax = plt.subplot(3, 3, position)
+    sizes = [period_metrics[key]['Fund 2']['Total_SF'], period_metrics[key]['Fund 3']['Total_SF']]
+    ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
+    ax.set_title(f'{label} Portfolio (by SF)', fontsize=12, fontweight='bold')
 
 plt.tight_layout()
 plt.savefig('rent_roll_trend_analysis.png', dpi=300, bbox_inches='tight')
@@ -306,21 +277,21 @@ print("\n" + "=" * 80)
 print("KEY TREND INSIGHTS")
 print("=" * 80)
 
-print("\n🔍 PORTFOLIO EVOLUTION (Dec 2024 → Jun 2025):")
+print(f"\n🔍 PORTFOLIO EVOLUTION ({periods[0]} → {periods[-1]}):")
 print("-" * 50)
 
 # Calculate overall changes
 for fund in ['Fund 2', 'Fund 3']:
-    occ_change = jun_metrics[fund]['Occupancy_Rate'] - dec_metrics[fund]['Occupancy_Rate']
-    rev_change = ((jun_metrics[fund]['Annual_Revenue'] - dec_metrics[fund]['Annual_Revenue']) / 
-                  dec_metrics[fund]['Annual_Revenue'] * 100)
-    walt_change = jun_metrics[fund]['WALT'] - dec_metrics[fund]['WALT']
+    occ_change = last_metrics[fund]['Occupancy_Rate'] - first_metrics[fund]['Occupancy_Rate']
+    rev_change = ((last_metrics[fund]['Annual_Revenue'] - first_metrics[fund]['Annual_Revenue']) / 
+                  first_metrics[fund]['Annual_Revenue'] * 100)
+    walt_change = last_metrics[fund]['WALT'] - first_metrics[fund]['WALT']
     
     print(f"\n{fund}:")
     print(f"  • Occupancy: {'↑' if occ_change > 0 else '↓'} {abs(occ_change):.1f} pp")
     print(f"  • Revenue: {'↑' if rev_change > 0 else '↓'} {abs(rev_change):.1f}%")
     print(f"  • WALT: {'↑' if walt_change > 0 else '↓'} {abs(walt_change):.1f} months")
-    print(f"  • Rent/SF: ${dec_metrics[fund]['Avg_Rent_PSF']:.2f} → ${jun_metrics[fund]['Avg_Rent_PSF']:.2f}")
+    print(f"  • Rent/SF: ${first_metrics[fund]['Avg_Rent_PSF']:.2f} → ${last_metrics[fund]['Avg_Rent_PSF']:.2f}")
 
 print("\n📊 NOTABLE TRENDS:")
 print("-" * 50)
@@ -329,22 +300,22 @@ print("-" * 50)
 trends = []
 
 # Occupancy trends
-if jun_metrics['Fund 2']['Occupancy_Rate'] < dec_metrics['Fund 2']['Occupancy_Rate']:
+if last_metrics['Fund 2']['Occupancy_Rate'] < first_metrics['Fund 2']['Occupancy_Rate']:
     trends.append("• Fund 2 occupancy declining - increased leasing focus needed")
-if jun_metrics['Fund 3']['Occupancy_Rate'] > dec_metrics['Fund 3']['Occupancy_Rate']:
+if last_metrics['Fund 3']['Occupancy_Rate'] > first_metrics['Fund 3']['Occupancy_Rate']:
     trends.append("• Fund 3 showing positive occupancy momentum")
 
 # WALT trends
-if jun_metrics['Fund 2']['WALT'] < dec_metrics['Fund 2']['WALT'] - 3:
+if last_metrics['Fund 2']['WALT'] < first_metrics['Fund 2']['WALT'] - 3:
     trends.append("• Fund 2 WALT deteriorating - lease term structure weakening")
-if jun_metrics['Fund 3']['WALT'] < dec_metrics['Fund 3']['WALT'] - 3:
+if last_metrics['Fund 3']['WALT'] < first_metrics['Fund 3']['WALT'] - 3:
     trends.append("• Fund 3 WALT declining - monitor lease rollover risk")
 
 # Revenue trends
-fund2_rev_growth = ((jun_metrics['Fund 2']['Annual_Revenue'] - dec_metrics['Fund 2']['Annual_Revenue']) / 
-                    dec_metrics['Fund 2']['Annual_Revenue'] * 100)
-fund3_rev_growth = ((jun_metrics['Fund 3']['Annual_Revenue'] - dec_metrics['Fund 3']['Annual_Revenue']) / 
-                    dec_metrics['Fund 3']['Annual_Revenue'] * 100)
+fund2_rev_growth = ((last_metrics['Fund 2']['Annual_Revenue'] - first_metrics['Fund 2']['Annual_Revenue']) / 
+                    first_metrics['Fund 2']['Annual_Revenue'] * 100)
+fund3_rev_growth = ((last_metrics['Fund 3']['Annual_Revenue'] - first_metrics['Fund 3']['Annual_Revenue']) / 
+                    first_metrics['Fund 3']['Annual_Revenue'] * 100)
 
 if fund2_rev_growth > 5:
     trends.append(f"• Fund 2 strong revenue growth: +{fund2_rev_growth:.1f}%")
@@ -365,22 +336,22 @@ print("-" * 50)
 concerns = []
 
 # Check for increasing vacancy
-if jun_metrics['Fund 2']['Vacant_SF'] > dec_metrics['Fund 2']['Vacant_SF'] * 1.1:
+if last_metrics['Fund 2']['Vacant_SF'] > first_metrics['Fund 2']['Vacant_SF'] * 1.1:
     concerns.append("• Fund 2 vacancy increasing significantly")
-if jun_metrics['Fund 3']['Vacant_SF'] > dec_metrics['Fund 3']['Vacant_SF'] * 1.1:
+if last_metrics['Fund 3']['Vacant_SF'] > first_metrics['Fund 3']['Vacant_SF'] * 1.1:
     concerns.append("• Fund 3 vacancy increasing")
 
 # Check for declining WALT
-if jun_metrics['Fund 2']['WALT'] < 36:
+if last_metrics['Fund 2']['WALT'] < 36:
     concerns.append("• Fund 2 WALT below 3 years - high rollover risk")
-if jun_metrics['Fund 3']['WALT'] < 36:
+if last_metrics['Fund 3']['WALT'] < 36:
     concerns.append("• Fund 3 WALT approaching critical levels")
 
 # Near-term expiry risk
-if jun_metrics['Fund 2']['Near_Term_Expiry_Pct'] > 20:
-    concerns.append(f"• Fund 2: {jun_metrics['Fund 2']['Near_Term_Expiry_Pct']:.1f}% of space expiring within 12 months")
-if jun_metrics['Fund 3']['Near_Term_Expiry_Pct'] > 20:
-    concerns.append(f"• Fund 3: {jun_metrics['Fund 3']['Near_Term_Expiry_Pct']:.1f}% of space expiring within 12 months")
+if last_metrics['Fund 2']['Near_Term_Expiry_Pct'] > 20:
+    concerns.append(f"• Fund 2: {last_metrics['Fund 2']['Near_Term_Expiry_Pct']:.1f}% of space expiring within 12 months")
+if last_metrics['Fund 3']['Near_Term_Expiry_Pct'] > 20:
+    concerns.append(f"• Fund 3: {last_metrics['Fund 3']['Near_Term_Expiry_Pct']:.1f}% of space expiring within 12 months")
 
 for concern in concerns:
     print(concern)
@@ -391,15 +362,15 @@ print("-" * 50)
 positives = []
 
 # Check for improvements
-if jun_metrics['Fund 2']['Occupancy_Rate'] > dec_metrics['Fund 2']['Occupancy_Rate'] + 2:
+if last_metrics['Fund 2']['Occupancy_Rate'] > first_metrics['Fund 2']['Occupancy_Rate'] + 2:
     positives.append("• Fund 2 occupancy improving")
-if jun_metrics['Fund 3']['Occupancy_Rate'] > dec_metrics['Fund 3']['Occupancy_Rate'] + 2:
+if last_metrics['Fund 3']['Occupancy_Rate'] > first_metrics['Fund 3']['Occupancy_Rate'] + 2:
     positives.append("• Fund 3 maintaining strong occupancy")
 
 # Rent growth
-if jun_metrics['Fund 2']['Avg_Rent_PSF'] > dec_metrics['Fund 2']['Avg_Rent_PSF'] * 1.02:
+if last_metrics['Fund 2']['Avg_Rent_PSF'] > first_metrics['Fund 2']['Avg_Rent_PSF'] * 1.02:
     positives.append(f"• Fund 2 achieving rent growth")
-if jun_metrics['Fund 3']['Avg_Rent_PSF'] > dec_metrics['Fund 3']['Avg_Rent_PSF'] * 1.02:
+if last_metrics['Fund 3']['Avg_Rent_PSF'] > first_metrics['Fund 3']['Avg_Rent_PSF'] * 1.02:
     positives.append(f"• Fund 3 achieving rent growth")
 
 for positive in positives:
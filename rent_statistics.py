@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+RENT_PERCENTILES = [10, 25, 50, 75, 90]
+# Rent/SF histogram edges; the last bin is open-ended
+RENT_BINS = list(range(0, 32, 2))
+
+
+def _sorted_rents(df, by, occupied_only=True, value='Annual_Rent_Area', weight='Area'):
+    """Group index plus group codes, values and weights sorted by (group, value), and each group's start
+
+    Rows with a missing value are dropped; missing weights count as 0.
+    """
+    if occupied_only:
+        df = df[~df['Is_Vacant'].to_numpy(dtype=bool)]
+    df = df[df[value].notna().to_numpy()]
+    grouped = df.groupby(list(by), sort=True, observed=True, dropna=False)
+    codes = grouped.ngroup().to_numpy()
+    values = df[value].to_numpy(dtype=np.float64)
+    weights = np.nan_to_num(df[weight].to_numpy(dtype=np.float64))
+    order = np.lexsort((values, codes))
+    codes, values, weights = codes[order], values[order], weights[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.zeros(0, dtype=np.int64)
+    return grouped.size().index, codes, values, weights, starts
+
+
+def rent_statistics(df, by=('Fund',), percentiles=RENT_PERCENTILES, occupied_only=True):
+    """Unweighted and SF-weighted rent/SF distribution of every group from one sorted pass
+
+    Rows are sorted once by (group, Annual_Rent_Area); counts, extremes, moments and
+    percentiles are then read off each group's contiguous run with reduceat and index
+    arithmetic. Unweighted percentiles interpolate linearly like Series.quantile and
+    std uses ddof=1 like Series.std. Weighted figures weight each lease by its Area:
+    weighted_pNN is the rent at which NN% of the SF pays that rent or less, and
+    weighted_std is the population standard deviation around the weighted mean.
+
+    Returns a frame indexed by `by` with count, sf, mean, std, min, max, pNN,
+    weighted_mean, weighted_std and weighted_pNN columns.
+    """
+    index, codes, values, weights, starts = _sorted_rents(df, by, occupied_only)
+    ends = np.r_[starts[1:], len(values)].astype(np.int64)
+    counts = ends - starts
+    stats = pd.DataFrame(index=index)
+    stats['count'] = counts
+    stats['sf'] = np.add.reduceat(weights, starts) if len(values) else np.zeros(0)
+    if not len(values):
+        for column in ['mean', 'std', 'min', 'max'] + [f'p{q}' for q in percentiles] + \
+                      ['weighted_mean', 'weighted_std'] + [f'weighted_p{q}' for q in percentiles]:
+            stats[column] = np.zeros(0)
+        return stats
+
+    mean = np.add.reduceat(values, starts) / counts
+    deviations = values - np.repeat(mean, counts)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stats['mean'] = mean
+        stats['std'] = np.where(counts > 1, np.sqrt(np.add.reduceat(deviations ** 2, starts) / (counts - 1)), np.nan)
+    stats['min'] = values[starts]
+    stats['max'] = values[ends - 1]
+    for q in percentiles:
+        position = (counts - 1) * q / 100
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, counts - 1)
+        fraction = position - lower
+        stats[f'p{q}'] = values[starts + lower] + (values[starts + upper] - values[starts + lower]) * fraction
+
+    sf = stats['sf'].to_numpy()
+    weighted_sum = np.add.reduceat(values * weights, starts)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weighted_mean = np.where(sf > 0, weighted_sum / sf, np.nan)
+        spread = np.add.reduceat(weights * (values - np.repeat(weighted_mean, counts)) ** 2, starts)
+        stats['weighted_mean'] = weighted_mean
+        stats['weighted_std'] = np.where(sf > 0, np.sqrt(spread / sf), np.nan)
+    # Cumulative SF is non-decreasing across the whole sorted array, so one searchsorted finds every group's rank
+    cumulative = np.cumsum(weights)
+    offset = cumulative[starts] - weights[starts]
+    for q in percentiles:
+        rank = np.searchsorted(cumulative, offset + sf * q / 100, side='left')
+        rank = np.clip(rank, starts, ends - 1)
+        stats[f'weighted_p{q}'] = np.where(sf > 0, values[rank], np.nan)
+    return stats
+
+
+def rent_histogram(df, by=('Fund',), bins=RENT_BINS, occupied_only=True):
+    """Lease count and SF per rent/SF bin for every group
+
+    Returns a frame indexed by `by` plus Bin (labels like '$4-6' and '$30+') with
+    count and sf columns; every group has every bin.
+    """
+    index, codes, values, weights, _ = _sorted_rents(df, by, occupied_only)
+    edges = np.asarray(bins, dtype=np.float64)
+    labels = [f'${low:g}-{high:g}' for low, high in zip(edges[:-1], edges[1:])] + [f'${edges[-1]:g}+']
+    # Rents below the first edge land in the first bin
+    bin_codes = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(labels) - 1)
+    flat = codes * len(labels) + bin_codes
+    size = len(index) * len(labels)
+    rows = pd.MultiIndex.from_tuples(
+        [(*(key if isinstance(key, tuple) else (key,)), label) for key in index for label in labels],
+        names=list(by) + ['Bin'])
+    return pd.DataFrame({
+        'count': np.bincount(flat, minlength=size).astype(np.int64),
+        'sf': np.bincount(flat, weights=weights, minlength=size),
+    }, index=rows)
+
+
+def distribution_summary(stats, histogram, key):
+    """One group's statistics and histogram as the dict stored in calculate_fund_metrics()['rent_distribution']"""
+    row = stats.loc[key] if key in stats.index else pd.Series(0.0, index=stats.columns)
+    bins = histogram.loc[key] if key in histogram.index.get_level_values(0) else None
+    return {
+        'statistics': {column: None if pd.isna(value) else float(value) for column, value in row.items()},
+        'histogram': {
+            'bins': list(bins.index) if bins is not None else [],
+            'count': bins['count'].tolist() if bins is not None else [],
+            'sf': bins['sf'].tolist() if bins is not None else [],
+        },
+    }
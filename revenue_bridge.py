@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from lease_diff import LEASE_STATUSES
+
+# Bridge steps between prior and current annual revenue, in chart order
+BRIDGE_COMPONENTS = ['new_leases', 'move_outs', 'renewals', 'rent_changes']
+BRIDGE_LABELS = {'new_leases': 'New Leases', 'move_outs': 'Move-outs', 'renewals': 'Renewals',
+                 'rent_changes': 'Rent Changes'}
+# Component of every lease status; sub-tolerance drift on unchanged leases stays in rent_changes
+# so the bridge always reconciles to the penny
+STATUS_COMPONENTS = {'new': 'new_leases', 'lost': 'move_outs', 'renewed': 'renewals', 'extended': 'renewals',
+                     'rent_changed': 'rent_changes', 'unchanged': 'rent_changes'}
+
+
+def revenue_bridge(diff, funds=None):
+    """Attribute the change in annual revenue between two snapshots for every fund at once
+
+    `diff` is a frame from lease_diff.diff_snapshots(). Returns one row per fund with
+    prior_revenue, the BRIDGE_COMPONENTS and current_revenue, where
+    prior_revenue + sum(components) == current_revenue.
+    """
+    component_codes = np.array([BRIDGE_COMPONENTS.index(STATUS_COMPONENTS[status]) for status in LEASE_STATUSES])
+    inputs = pd.DataFrame({
+        'Fund': diff['Fund'].to_numpy(),
+        'Component': pd.Categorical.from_codes(component_codes[diff['Status'].cat.codes.to_numpy()],
+                                               categories=BRIDGE_COMPONENTS),
+        'Rent_Change': diff['Rent_Change'].to_numpy(dtype=np.float64),
+        'Rent_Prior': np.nan_to_num(diff['Rent_Prior'].to_numpy(dtype=np.float64)),
+        'Rent_Current': np.nan_to_num(diff['Rent_Current'].to_numpy(dtype=np.float64)),
+    })
+    changes = inputs.pivot_table(index='Fund', columns='Component', values='Rent_Change', aggfunc='sum',
+                                 fill_value=0.0, observed=False)
+    totals = inputs.groupby('Fund', sort=False)[['Rent_Prior', 'Rent_Current']].sum()
+
+    bridge = pd.DataFrame({'prior_revenue': totals['Rent_Prior']})
+    for component in BRIDGE_COMPONENTS:
+        bridge[component] = changes[component] if component in changes.columns else 0.0
+    bridge['current_revenue'] = totals['Rent_Current']
+    if funds is not None:
+        bridge = bridge.reindex(list(funds), fill_value=0.0)
+    bridge.index.name = 'Fund'
+    return bridge.astype(np.float64)
+
+
+def bridge_summary(bridge, fund, prior_label=None, current_label=None):
+    """One fund's bridge as a plain dict, as stored in calculate_fund_metrics()['revenue_bridge']"""
+    row = bridge.loc[fund] if fund in bridge.index else pd.Series(0.0, index=bridge.columns)
+    summary = {'prior_period': prior_label, 'current_period': current_label}
+    summary.update({column: float(row[column]) for column in bridge.columns})
+    return summary
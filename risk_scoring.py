@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+from metrics_engine import SUM_METRICS, metric_contributions, derive_metrics
+
+# Scored components: the metric each reads, the threshold ladder (worst first) and the
+# points of each rung. 'below' rules score when the metric is under a threshold, 'above'
+# rules when it is over one; the first rung that matches wins.
+RISK_RULES = {
+    'occupancy': {'metric': 'occupancy_rate', 'direction': 'below', 'thresholds': [85, 90, 95],
+                  'points': [30, 20, 10]},
+    'walt': {'metric': 'walt', 'direction': 'below', 'thresholds': [24, 36, 48], 'points': [30, 20, 10]},
+    'near_term_expiry': {'metric': 'near_term_expiry_pct', 'direction': 'above', 'thresholds': [25, 15, 10],
+                         'points': [20, 10, 5]},
+    'concentration': {'metric': 'top_10_concentration', 'direction': 'above', 'thresholds': [30, 20, 15],
+                      'points': [20, 10, 5]},
+}
+# Lowest overall score of each level, highest level first
+RISK_LEVELS = [('High', 60), ('Medium', 30)]
+DEFAULT_LEVEL = 'Low'
+RISK_INPUTS = ['occupancy_rate', 'walt', 'near_term_expiry_pct', 'top_5_concentration', 'top_10_concentration',
+               'unique_tenants', 'total_sf', 'annual_revenue']
+
+
+def risk_inputs(df, by=('Fund',), tenants=None):
+    """Occupancy, WALT, near-term expiry and tenant concentration of every group of a snapshot
+
+    The SF and rent metrics come from one grouped sum of the metrics engine's row
+    contributions; concentration sums each group's tenants' rent, ranks the tenants
+    within their group and adds up the top 5 and top 10 in the same pass. `tenants`
+    (one entry per row, e.g. TenantRegistry.resolve() IDs) replaces Tenant_Name as the
+    tenant identity, so variants of one tenant's name count as one tenant.
+    """
+    by = list(by)
+    keys = {column: df[column].to_numpy(dtype=object) for column in by}
+    inputs = pd.DataFrame({
+        **keys,
+        **metric_contributions(df['Is_Vacant'].to_numpy(dtype=bool), df['Area'].to_numpy(dtype=np.float64),
+                               df['Annual_Rent'].to_numpy(dtype=np.float64),
+                               df['Monthly_Rent'].to_numpy(dtype=np.float64),
+                               df['Months_To_Expiry'].to_numpy(dtype=np.float64)),
+    })
+    sums = inputs.groupby(by, sort=True, dropna=False)[SUM_METRICS].sum()
+    table = pd.DataFrame(derive_metrics({name: sums[name].to_numpy() for name in SUM_METRICS}), index=sums.index)
+
+    occupied = ~df['Is_Vacant'].to_numpy(dtype=bool)
+    tenants = pd.DataFrame({
+        **{column: values[occupied] for column, values in keys.items()},
+        'Tenant_Name': (df['Tenant_Name'].to_numpy(dtype=object) if tenants is None
+                        else np.asarray(tenants, dtype=object))[occupied],
+        'Annual_Rent': df['Annual_Rent'].to_numpy(dtype=np.float64)[occupied],
+    }).groupby(by + ['Tenant_Name'], sort=False)['Annual_Rent'].sum().reset_index()
+    tenants = tenants.sort_values(by + ['Annual_Rent'], ascending=[True] * len(by) + [False], kind='stable')
+    rank = tenants.groupby(by, sort=False, dropna=False).cumcount().to_numpy()
+    rent = tenants['Annual_Rent'].to_numpy()
+    tenants = tenants.assign(top_5=np.where(rank < 5, rent, 0.0), top_10=np.where(rank < 10, rent, 0.0))
+    concentration = tenants.groupby(by, sort=True, dropna=False).agg(
+        total=('Annual_Rent', 'sum'), top_5=('top_5', 'sum'), top_10=('top_10', 'sum'),
+        unique_tenants=('Tenant_Name', 'size')).reindex(table.index, fill_value=0)
+
+    total = concentration['total'].to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table['top_5_concentration'] = np.where(total > 0, concentration['top_5'].to_numpy() / total * 100, 0.0)
+        table['top_10_concentration'] = np.where(total > 0, concentration['top_10'].to_numpy() / total * 100, 0.0)
+    table['unique_tenants'] = concentration['unique_tenants'].to_numpy(dtype=np.int64)
+    table['total_sf'] = sums['total_sf'].to_numpy()
+    table['annual_revenue'] = sums['annual_revenue'].to_numpy()
+    return table[RISK_INPUTS]
+
+
+def score_risk(inputs, rules=None, weights=None, levels=RISK_LEVELS):
+    """Score every row of a risk_inputs() frame against the rule ladders with np.select
+
+    `rules` overrides entries of RISK_RULES (by component name) and `weights` scales
+    each component's points (default 1). Adds a <component>_score column per rule,
+    overall_risk_score (0-100 with the default rules) and risk_level.
+    """
+    rules = {**RISK_RULES, **(rules or {})}
+    weights = weights or {}
+    scored = inputs.copy()
+    total = np.zeros(len(scored))
+    for name, rule in rules.items():
+        values = scored[rule['metric']].to_numpy(dtype=np.float64)
+        thresholds = np.asarray(rule['thresholds'], dtype=np.float64)[:, None]
+        conditions = values < thresholds if rule['direction'] == 'below' else values > thresholds
+        points = np.select(list(conditions), rule['points'], default=0) * weights.get(name, 1)
+        scored[f'{name}_score'] = points
+        total += points
+    scored['overall_risk_score'] = total
+    scored['risk_level'] = np.select([total >= floor for _, floor in levels], [level for level, _ in levels],
+                                     default=DEFAULT_LEVEL)
+    return scored
+
+
+def risk_summary(scored, key, rules=None, weights=None):
+    """One row of score_risk() as the dict stored in calculate_fund_metrics()['risk_metrics']
+
+    A key without rows is scored from all-zero inputs with `rules` and `weights`, which
+    should be the ones `scored` was scored with.
+    """
+    if key in scored.index:
+        row = scored.loc[key]
+    else:
+        row = score_risk(pd.DataFrame(0.0, index=[key], columns=RISK_INPUTS), rules, weights).loc[key]
+    score = float(row['overall_risk_score'])
+    return {
+        'overall_risk_score': int(score) if score.is_integer() else score,
+        'risk_level': row['risk_level'],
+        'top_5_concentration': float(row['top_5_concentration']),
+        'top_10_concentration': float(row['top_10_concentration']),
+        'unique_tenants': int(row['unique_tenants']),
+    }
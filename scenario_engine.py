@@ -0,0 +1,201 @@
+import numpy as np
+import pandas as pd
+
+from metrics_engine import PERIOD_METRICS, SUM_METRICS, metric_contributions, derive_metrics
+
+SCENARIO_METRICS = [key for key in PERIOD_METRICS if key != 'period']
+SCENARIO_LEVELS = ['portfolio', 'fund', 'property']
+BASE_SCENARIO = 'Base'
+
+
+def vacate(rows):
+    """Override: the tenants of `rows` move out"""
+    return {'action': 'vacate', 'rows': list(rows)}
+
+
+def new_lease(rows, rent_psf, term_months):
+    """Override: lease `rows` (typically vacant suites) at rent_psf per SF per year for term_months"""
+    return {'action': 'new_lease', 'rows': list(rows), 'rent_psf': rent_psf, 'term_months': term_months}
+
+
+def rent_change(rows, pct=None, rent_psf=None):
+    """Override: change the rent of `rows` by a fraction (pct=0.05 is +5%) or reset it to rent_psf"""
+    if (pct is None) == (rent_psf is None):
+        raise ValueError("rent_change needs exactly one of pct or rent_psf")
+    return {'action': 'rent_change', 'rows': list(rows), 'pct': pct, 'rent_psf': rent_psf}
+
+
+def extend_term(rows, months):
+    """Override: push the expiry of `rows` out by `months`"""
+    return {'action': 'extend_term', 'rows': list(rows), 'months': months}
+
+
+class ScenarioEngine:
+    """What-if evaluation of lease overrides against one snapshot
+
+    The snapshot's per-row metric contributions and their property, fund and portfolio
+    sums are computed once. A scenario is a list of overrides (vacate, new_lease,
+    rent_change, extend_term) naming rows by the snapshot's index labels; only those
+    rows are re-scored, and the difference is added to the base sums of the properties
+    and funds they belong to, so evaluating a scenario costs time proportional to the
+    rows it touches rather than the whole rent roll.
+    """
+
+    def __init__(self, df, label=None):
+        self.label = label
+        self.index = df.index
+        self.fund = df['Fund'].to_numpy(dtype=object)
+        self.prop_code = df['Prop_Code'].to_numpy(dtype=object)
+        self.tenant = df['Tenant_Name'].to_numpy(dtype=object)
+        self.area = np.nan_to_num(df['Area'].to_numpy(dtype=np.float64))
+        self.state = {
+            'vacant': df['Is_Vacant'].to_numpy(dtype=bool),
+            'annual_rent': df['Annual_Rent'].to_numpy(dtype=np.float64),
+            'monthly_rent': df['Monthly_Rent'].to_numpy(dtype=np.float64),
+            'months': df['Months_To_Expiry'].to_numpy(dtype=np.float64),
+        }
+        self.contributions = self._contributions(self.area, self.state)
+
+        self.property_codes, properties = pd.factorize(self.prop_code, sort=True)
+        self.fund_codes, funds = pd.factorize(self.fund, sort=True)
+        self.properties, self.funds = pd.Index(properties, name='Prop_Code'), pd.Index(funds, name='Fund')
+        self.property_sums = self._group_sums(self.property_codes, len(self.properties))
+        self.fund_sums = self._group_sums(self.fund_codes, len(self.funds))
+        self.portfolio_sums = self.contributions.sum(axis=0)
+        # Overrides change leases, never which property or fund a row belongs to, so these are fixed
+        self.property_funds = self.fund_codes[np.unique(self.property_codes, return_index=True)[1]]
+        self.fund_properties = np.bincount(self.property_funds, minlength=len(self.funds))
+
+    def _contributions(self, area, state):
+        """(rows, SUM_METRICS) matrix; NaN rents or months contribute 0 as in the grouped sums"""
+        values = metric_contributions(state['vacant'], area, state['annual_rent'], state['monthly_rent'],
+                                      state['months'])
+        return np.nan_to_num(np.column_stack([values[name] for name in SUM_METRICS]).astype(np.float64))
+
+    def _group_sums(self, codes, n_groups):
+        return np.column_stack([np.bincount(codes, weights=column, minlength=n_groups)
+                                for column in self.contributions.T]).reshape(n_groups, len(SUM_METRICS))
+
+    def rows(self, tenant=None, prop_code=None, fund=None, vacant=None):
+        """Index labels of the rows matching every given filter (tenant is a case-insensitive substring)"""
+        mask = np.ones(len(self.index), dtype=bool)
+        if tenant is not None:
+            mask &= pd.Series(self.tenant).str.contains(tenant, case=False, regex=False, na=False).to_numpy()
+        if prop_code is not None:
+            mask &= self.prop_code == prop_code
+        if fund is not None:
+            mask &= self.fund == fund
+        if vacant is not None:
+            mask &= self.state['vacant'] == vacant
+        return list(self.index[mask])
+
+    def _positions(self, rows):
+        positions = self.index.get_indexer(rows)
+        if (positions < 0).any():
+            missing = [row for row, position in zip(rows, positions) if position < 0]
+            raise KeyError(f"Rows not in the snapshot: {missing}")
+        return positions
+
+    def apply(self, overrides):
+        """Positions of the rows the overrides touch and their lease state after applying them in order"""
+        targets = [self._positions(override['rows']) for override in overrides]
+        positions = np.unique(np.concatenate(targets)) if targets else np.zeros(0, dtype=np.int64)
+        state = {name: values[positions].copy() for name, values in self.state.items()}
+        area = self.area[positions]
+
+        for override, target in zip(overrides, targets):
+            rows = np.searchsorted(positions, target)
+            action = override['action']
+            if action == 'vacate':
+                state['vacant'][rows] = True
+                state['annual_rent'][rows] = 0.0
+                state['monthly_rent'][rows] = 0.0
+                state['months'][rows] = 0.0
+            elif action == 'new_lease':
+                state['vacant'][rows] = False
+                state['annual_rent'][rows] = area[rows] * override['rent_psf']
+                state['monthly_rent'][rows] = state['annual_rent'][rows] / 12
+                state['months'][rows] = override['term_months']
+            elif action == 'rent_change':
+                if override['pct'] is not None:
+                    state['annual_rent'][rows] *= 1 + override['pct']
+                    state['monthly_rent'][rows] *= 1 + override['pct']
+                else:
+                    state['annual_rent'][rows] = area[rows] * override['rent_psf']
+                    state['monthly_rent'][rows] = state['annual_rent'][rows] / 12
+            elif action == 'extend_term':
+                state['months'][rows] += override['months']
+            else:
+                raise ValueError(f"Unknown override action {action!r}")
+        return positions, state
+
+    def evaluate(self, overrides):
+        """Metrics after the overrides: {'portfolio': metrics, 'funds': {fund: metrics}, 'properties': {...}}
+
+        'properties' holds only the properties the overrides touch; every fund is
+        returned, with the untouched ones at their base values.
+        """
+        positions, state = self.apply(overrides)
+        delta = self._contributions(self.area[positions], state) - self.contributions[positions]
+
+        touched, inverse = np.unique(self.property_codes[positions], return_inverse=True)
+        property_sums = self.property_sums[touched].copy()
+        np.add.at(property_sums, inverse, delta)
+        fund_sums = self.fund_sums.copy()
+        np.add.at(fund_sums, self.fund_codes[positions], delta)
+        portfolio_sums = self.portfolio_sums + delta.sum(axis=0)
+        return {
+            'portfolio': self._metrics(portfolio_sums[None, :], [len(self.properties)])[0],
+            'funds': dict(zip(self.funds, self._metrics(fund_sums, self.fund_properties))),
+            'properties': self._property_metrics(touched, property_sums),
+        }
+
+    def _property_metrics(self, codes, sums):
+        """{Prop_Code: metrics} for property codes `codes` with summed contributions `sums`"""
+        funds = [self.funds[code] for code in self.property_funds[codes]]
+        return dict(zip(self.properties[codes], self._metrics(sums, np.ones(len(codes), dtype=np.int64), funds)))
+
+    def _metrics(self, sums, properties, funds=None):
+        """Period-metrics dicts (as in grouped_period_metrics) from a (groups, SUM_METRICS) array"""
+        columns = {name: sums[:, i] for i, name in enumerate(SUM_METRICS)}
+        columns.update(derive_metrics(columns))
+        columns['properties'] = np.asarray(properties)
+        results = []
+        for i in range(len(sums)):
+            metrics = {'period': self.label}
+            metrics.update({key: columns[key][i].item() for key in SCENARIO_METRICS})
+            for key in ('properties', 'total_leases', 'occupied_leases', 'vacant_leases'):
+                metrics[key] = int(round(metrics[key]))
+            if funds is not None:
+                metrics['fund'] = funds[i]
+            results.append(metrics)
+        return results
+
+    def compare(self, scenarios, level='fund'):
+        """Evaluate {name: overrides} side by side with the base case
+
+        Returns a frame indexed by (Scenario, Fund), (Scenario, Prop_Code) or Scenario
+        for level 'fund', 'property' or 'portfolio', with SCENARIO_METRICS columns and
+        the base case first. At the property level every scenario reports the union of
+        the properties any scenario touches.
+        """
+        if level not in SCENARIO_LEVELS:
+            raise ValueError(f"level must be one of {SCENARIO_LEVELS}, got {level!r}")
+        results = {BASE_SCENARIO: self.evaluate([])}
+        results.update({name: self.evaluate(overrides) for name, overrides in scenarios.items()})
+
+        if level == 'portfolio':
+            return pd.DataFrame([result['portfolio'] for result in results.values()],
+                                index=pd.Index(list(results), name='Scenario'))[SCENARIO_METRICS]
+        if level == 'fund':
+            keys, names, columns = list(self.funds), ['Scenario', 'Fund'], SCENARIO_METRICS
+            rows = [result['funds'][key] for result in results.values() for key in keys]
+        else:
+            keys = sorted({code for result in results.values() for code in result['properties']})
+            names, columns = ['Scenario', 'Prop_Code'], ['fund'] + SCENARIO_METRICS
+            # Properties a scenario does not touch are at their base values
+            codes = self.properties.get_indexer(keys)
+            base = self._property_metrics(codes, self.property_sums[codes])
+            rows = [result['properties'].get(key, base[key]) for result in results.values() for key in keys]
+        index = pd.MultiIndex.from_product([list(results), keys], names=names)
+        return pd.DataFrame(rows, index=index)[columns]
@@ -0,0 +1,230 @@
+import argparse
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from metrics_memo import MetricsMemo
+
+# Bump whenever the processing in RentRollProcessor changes the shape or
+# contents of the processed frame, so stale entries are never served.
+PIPELINE_VERSION = '3'
+DEFAULT_CACHE_DIR = '.rent_roll_cache'
+# Subdirectory holding the metrics memo's pickles
+METRICS_DIR = 'metrics'
+
+
+def file_sha256(file_path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileDigests:
+    """SHA-256 of workbooks, rehashed only when a file's mtime or size changes"""
+
+    def __init__(self):
+        self.digests = {}
+
+    def __call__(self, file_path):
+        stat = os.stat(file_path)
+        cached = self.digests.get(file_path)
+        if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+            cached = (stat.st_mtime_ns, stat.st_size, file_sha256(file_path))
+            self.digests[file_path] = cached
+        return cached[2]
+
+
+class SnapshotCache:
+    """On-disk Parquet cache of processed rent roll snapshots
+
+    Hits and misses are counted in memory and added to the lifetime counters in
+    stats.json by flush_stats(), once per load rather than once per lookup.
+    """
+
+    INDEX_FILE = 'index.json'
+    STATS_FILE = 'stats.json'
+    # {key: {Prop_Code: rows}} of the codes that matched no fund rule when the entry was parsed
+    UNMATCHED_FILE = 'unmatched.json'
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, pipeline_version=PIPELINE_VERSION, digests=None):
+        self.cache_dir = cache_dir
+        self.pipeline_version = pipeline_version
+        # Share a FileDigests with the caller so a workbook is hashed once per change
+        self.digests = digests or FileDigests()
+        self.hits = 0
+        self.misses = 0
+        self._unflushed = {'hits': 0, 'misses': 0}
+
+    def key(self, file_path, analysis_date):
+        """Build the cache key for a workbook and analysis date"""
+        return f"{self.digests(file_path)}_{analysis_date:%Y%m%d}_v{self.pipeline_version}"
+
+    def load(self, file_path, analysis_date):
+        """Return the cached frame for a workbook, or None on a miss"""
+        df = self.load_key(self.key(file_path, analysis_date))
+        self.flush_stats()
+        return df
+
+    def store(self, file_path, analysis_date, df):
+        """Write a processed frame to the cache"""
+        self.store_key(self.key(file_path, analysis_date), file_path, df)
+
+    def get_or_process(self, file_path, analysis_date, process):
+        """Return the cached frame, calling process(file_path, analysis_date) on a miss"""
+        key = self.key(file_path, analysis_date)
+        df = self.load_key(key)
+        if df is None:
+            df = process(file_path, analysis_date)
+            self.store_key(key, file_path, df)
+        self.flush_stats()
+        return df
+
+    def load_key(self, key):
+        """Return the cached frame for a precomputed key, or None on a miss"""
+        entry_path = self._entry_path(key)
+        if os.path.exists(entry_path):
+            self._record('hits')
+            return pd.read_parquet(entry_path)
+        self._record('misses')
+        return None
+
+    def store_key(self, key, file_path, df, unmatched=None):
+        """Write a processed frame under a precomputed key, with its unmatched property codes if given"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self._entry_path(key) + '.tmp'
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, self._entry_path(key))
+
+        index = self._read_json(self.INDEX_FILE)
+        index[key] = os.path.abspath(file_path)
+        self._write_json(self.INDEX_FILE, index)
+        if unmatched is not None:
+            recorded = self._read_json(self.UNMATCHED_FILE)
+            recorded[key] = dict(unmatched)
+            self._write_json(self.UNMATCHED_FILE, recorded)
+
+    def unmatched(self, key):
+        """{Prop_Code: rows} that matched no fund rule when the entry was parsed ({} if not recorded)"""
+        return self._read_json(self.UNMATCHED_FILE).get(key, {})
+
+    def invalidate(self, file_paths=None):
+        """Remove cached entries for the given workbooks (all entries if None)
+
+        Memoized metrics are keyed on every workbook at once, so any invalidation
+        also clears the metrics memo (see invalidate_metrics).
+        """
+        index = self._read_json(self.INDEX_FILE)
+        targets = None if file_paths is None else {os.path.abspath(p) for p in file_paths}
+
+        recorded = self._read_json(self.UNMATCHED_FILE)
+        removed = 0
+        for key, source in list(index.items()):
+            if targets is not None and source not in targets:
+                continue
+            entry_path = self._entry_path(key)
+            if os.path.exists(entry_path):
+                os.remove(entry_path)
+            del index[key]
+            recorded.pop(key, None)
+            removed += 1
+
+        if targets is None:
+            # Also sweep entries written before the index existed
+            for name in self._entry_files():
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+            self._write_json(self.STATS_FILE, {})
+            self._unflushed = {'hits': 0, 'misses': 0}
+        if os.path.isdir(self.cache_dir):
+            self._write_json(self.INDEX_FILE, index)
+            self._write_json(self.UNMATCHED_FILE, recorded if targets is not None else {})
+        self.invalidate_metrics()
+        return removed
+
+    def invalidate_metrics(self):
+        """Remove every memoized metrics pickle; returns how many were removed"""
+        return self._metrics_memo().clear(disk=True)
+
+    def stats(self):
+        """Return hit/miss counters and the on-disk footprint of the cache"""
+        lifetime = self._read_json(self.STATS_FILE)
+        entries = self._entry_files()
+        metrics = self._metrics_memo().disk_stats()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'lifetime_hits': lifetime.get('hits', 0) + self._unflushed['hits'],
+            'lifetime_misses': lifetime.get('misses', 0) + self._unflushed['misses'],
+            'entries': len(entries),
+            'bytes': sum(os.path.getsize(os.path.join(self.cache_dir, name)) for name in entries),
+            'metrics_entries': metrics['entries'],
+            'metrics_bytes': metrics['bytes'],
+        }
+
+    def flush_stats(self):
+        """Add the hits and misses counted since the last flush to the lifetime counters on disk"""
+        if not any(self._unflushed.values()):
+            return
+        lifetime = self._read_json(self.STATS_FILE)
+        for counter, count in self._unflushed.items():
+            lifetime[counter] = lifetime.get(counter, 0) + count
+        self._write_json(self.STATS_FILE, lifetime)
+        self._unflushed = {'hits': 0, 'misses': 0}
+
+    def _record(self, counter):
+        setattr(self, counter, getattr(self, counter) + 1)
+        self._unflushed[counter] += 1
+
+    def _metrics_memo(self):
+        return MetricsMemo(cache_dir=os.path.join(self.cache_dir, METRICS_DIR))
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.parquet')
+
+    def _entry_files(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return [name for name in os.listdir(self.cache_dir) if name.endswith('.parquet')]
+
+    def _read_json(self, name):
+        path = os.path.join(self.cache_dir, name)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_json(self, name, data):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, name)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Inspect or clear the processed rent roll cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('stats', help='Show cache hits, misses and size')
+    invalidate_parser = subparsers.add_parser('invalidate', help='Remove cached snapshots')
+    invalidate_parser.add_argument('files', nargs='*', help='Workbooks to invalidate (default: everything)')
+    args = parser.parse_args()
+
+    cache = SnapshotCache(args.cache_dir)
+    if args.command == 'stats':
+        stats = cache.stats()
+        print(f"Cache directory: {args.cache_dir}")
+        print(f"  Entries: {stats['entries']}")
+        print(f"  Size: {stats['bytes']:,} bytes")
+        print(f"  Memoized metrics: {stats['metrics_entries']} ({stats['metrics_bytes']:,} bytes)")
+        print(f"  Hits: {stats['lifetime_hits']}")
+        print(f"  Misses: {stats['lifetime_misses']}")
+    else:
+        metrics = cache.stats()['metrics_entries']
+        removed = cache.invalidate(args.files or None)
+        print(f"Removed {removed} cached snapshot(s) and {metrics} memoized metric(s)")
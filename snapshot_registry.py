@@ -0,0 +1,144 @@
+import calendar
+import glob
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime
+
+SNAPSHOT_GLOB = 'Faropoint Rent Roll All Funds (*).xlsx'
+SNAPSHOT_TOKEN = re.compile(r'\((\d{2})([A-Za-z]{3})\)\.xlsx$')
+MONTHS = {name.upper(): number for number, name in enumerate(calendar.month_abbr) if name}
+DEFAULT_MAX_LOADED = 4
+
+
+def parse_snapshot_date(file_path):
+    """Return the month-end analysis date encoded in a 'YYMON' filename token, e.g. 25JUN -> 2025-06-30"""
+    match = SNAPSHOT_TOKEN.search(os.path.basename(file_path))
+    if not match or match.group(2).upper() not in MONTHS:
+        raise ValueError(f"No YYMON snapshot token in filename: {file_path}")
+    year = 2000 + int(match.group(1))
+    month = MONTHS[match.group(2).upper()]
+    return datetime(year, month, calendar.monthrange(year, month)[1])
+
+
+def period_key(analysis_date):
+    """Metrics key for a snapshot date: 'Q2_2025' at quarter ends, 'Apr_2025' otherwise"""
+    if analysis_date.month % 3 == 0:
+        return f"Q{analysis_date.month // 3}_{analysis_date.year}"
+    return f"{analysis_date:%b}_{analysis_date.year}"
+
+
+def period_label(analysis_date):
+    """Display label for a snapshot date, e.g. 'Q2 2025'"""
+    return period_key(analysis_date).replace('_', ' ')
+
+
+class Snapshot:
+    """A discovered rent roll workbook and the period it represents"""
+
+    def __init__(self, file_path, analysis_date):
+        self.file_path = file_path
+        self.analysis_date = analysis_date
+        self.key = period_key(analysis_date)
+        self.label = period_label(analysis_date)
+
+    def __repr__(self):
+        return f"Snapshot({self.key}, {os.path.basename(self.file_path)!r})"
+
+
+class SnapshotRegistry:
+    """Discovers rent roll snapshots on disk and loads them lazily with an LRU bound"""
+
+    def __init__(self, load_snapshot, load_many=None, data_dir='.', pattern=SNAPSHOT_GLOB,
+                 max_loaded=DEFAULT_MAX_LOADED):
+        self.load_snapshot = load_snapshot
+        self.load_many = load_many
+        self.data_dir = data_dir
+        self.pattern = pattern
+        self.max_loaded = max_loaded
+        self.snapshots = OrderedDict()
+        self._loaded = OrderedDict()
+
+    def discover(self):
+        """Scan data_dir for snapshot workbooks, ordered by analysis date"""
+        found = []
+        for file_path in glob.glob(os.path.join(glob.escape(self.data_dir), self.pattern)):
+            try:
+                found.append(Snapshot(file_path, parse_snapshot_date(file_path)))
+            except ValueError:
+                continue
+        found.sort(key=lambda snapshot: snapshot.analysis_date)
+
+        self.snapshots = OrderedDict((snapshot.key, snapshot) for snapshot in found)
+        for key in list(self._loaded):
+            if key not in self.snapshots:
+                del self._loaded[key]
+        return list(self.snapshots.values())
+
+    @property
+    def periods(self):
+        """Period keys in chronological order"""
+        return list(self.snapshots)
+
+    @property
+    def latest(self):
+        return self.periods[-1] if self.snapshots else None
+
+    @property
+    def previous(self):
+        return self.periods[-2] if len(self.snapshots) > 1 else None
+
+    def label(self, key):
+        return self.snapshots[key].label
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def __contains__(self, key):
+        return key in self.snapshots
+
+    def __iter__(self):
+        return iter(self.snapshots)
+
+    def __getitem__(self, key):
+        """Return the processed frame for a period, loading it on first access"""
+        if key in self._loaded:
+            self._loaded.move_to_end(key)
+            return self._loaded[key]
+        snapshot = self.snapshots[key]
+        df = self.load_snapshot(snapshot.file_path, snapshot.analysis_date)
+        self._remember(key, df)
+        return df
+
+    def preload(self, keys=None, parallel=False, max_workers=None):
+        """Load several periods at once (the most recent max_loaded by default)"""
+        keys = keys if keys is not None else self.periods[-self.max_loaded:]
+        missing = [key for key in keys if key not in self._loaded]
+        if self.load_many is None or not missing:
+            for key in missing:
+                self[key]
+            return
+        pairs = [(self.snapshots[key].file_path, self.snapshots[key].analysis_date) for key in missing]
+        for key, df in zip(missing, self.load_many(pairs, parallel, max_workers)):
+            self._remember(key, df)
+
+    def loaded_periods(self):
+        """Periods currently held in memory, least recently used first"""
+        return list(self._loaded)
+
+    def loaded_frames(self):
+        """(period, frame) pairs currently held in memory, least recently used first"""
+        return list(self._loaded.items())
+
+    def evict(self, key=None):
+        """Drop one loaded period (or all of them) from memory"""
+        if key is None:
+            self._loaded.clear()
+        else:
+            self._loaded.pop(key, None)
+
+    def _remember(self, key, df):
+        self._loaded[key] = df
+        self._loaded.move_to_end(key)
+        while len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
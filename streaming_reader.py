@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from rent_roll_normalization import (RENT_ROLL_COLUMNS, TEXT_COLUMNS, DATE_COLUMNS, NUMERIC_COLUMNS,
+                                     DEFAULT_FUNDS, extract_prop_code, classify_fund, normalize_rent_roll,
+                                     canonical_columns, conform_columns)
+from rent_roll_schema import detect_schema
+
+DEFAULT_BATCH_SIZE = 5000
+# Classified once per batch and carried through to normalize_rent_roll
+DERIVED_COLUMNS = ['Prop_Code', 'Fund']
+
+
+def iter_row_batches(file_path, header_rows, max_col, batch_size=DEFAULT_BATCH_SIZE, sheet_name='Report1'):
+    """Yield (first_row_number, rows) batches of raw cell values below the header from a read-only workbook"""
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name]
+        batch = []
+        first_row = header_rows + 1
+        for row in ws.iter_rows(min_row=header_rows + 1, max_col=max_col, values_only=True):
+            batch.append(row)
+            if len(batch) == batch_size:
+                yield first_row, batch
+                first_row += len(batch)
+                batch = []
+        if batch:
+            yield first_row, batch
+    finally:
+        wb.close()
+
+
+class _ColumnBuffer:
+    """Column arrays that surviving rows are copied into, doubling in size as they fill"""
+
+    def __init__(self, capacity, columns):
+        self.size = 0
+        self.order = list(columns)
+        self.columns = {col: np.empty(capacity, dtype=object) for col in TEXT_COLUMNS + DERIVED_COLUMNS
+                        if col in columns}
+        self.columns.update({col: np.empty(capacity, dtype='datetime64[ns]') for col in DATE_COLUMNS if col in columns})
+        self.columns.update({col: np.empty(capacity, dtype=np.float64) for col in NUMERIC_COLUMNS if col in columns})
+        self.row_numbers = np.empty(capacity, dtype=np.int64)
+
+    def append(self, batch_df, row_numbers):
+        n = len(batch_df)
+        if self.size + n > len(self.row_numbers):
+            self._grow(max(self.size + n, 2 * len(self.row_numbers)))
+        end = self.size + n
+        for col, values in self.columns.items():
+            values[self.size:end] = batch_df[col].to_numpy()
+        self.row_numbers[self.size:end] = row_numbers
+        self.size = end
+
+    def _grow(self, capacity):
+        for col, values in self.columns.items():
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[:self.size] = values[:self.size]
+            self.columns[col] = grown
+        grown = np.empty(capacity, dtype=np.int64)
+        grown[:self.size] = self.row_numbers[:self.size]
+        self.row_numbers = grown
+
+    def to_frame(self, index_offset):
+        data = {col: values[:self.size] for col, values in self.columns.items()}
+        index = pd.Index(self.row_numbers[:self.size] - index_offset)
+        return pd.DataFrame(data, index=index)[self.order]
+
+
+def _filter_batch(rows, first_row, positions, funds, classifier=None):
+    """Pick the mapped columns, then apply the Property/Area/Fund filters and typed conversion to one batch
+
+    Prop_Code and Fund are added to the surviving rows, so the fund rules run (and
+    unmatched codes are tallied) once per row.
+    """
+    batch_df = pd.DataFrame.from_records(rows)[list(positions.values())]
+    batch_df.columns = list(positions)
+    batch_df.index = np.arange(first_row, first_row + len(batch_df))
+
+    batch_df = batch_df[batch_df['Property'].notna()]
+    if batch_df.empty:
+        return batch_df
+
+    batch_df['Area'] = pd.to_numeric(batch_df['Area'], errors='coerce')
+    batch_df['Prop_Code'] = extract_prop_code(batch_df['Property'].astype(str))
+    batch_df['Fund'] = classify_fund(batch_df['Prop_Code'], classifier)
+    keep = batch_df['Area'].notna() & (batch_df['Area'] > 0)
+    if funds is not None:
+        keep &= batch_df['Fund'].isin(funds)
+    batch_df = batch_df[keep].copy()
+
+    for col in NUMERIC_COLUMNS:
+        if col in positions:
+            batch_df[col] = pd.to_numeric(batch_df[col], errors='coerce').astype(np.float64)
+    for col in DATE_COLUMNS:
+        if col in positions:
+            batch_df[col] = pd.to_datetime(batch_df[col], errors='coerce')
+    return batch_df
+
+
+def read_rent_roll_streaming(file_path, analysis_date, batch_size=DEFAULT_BATCH_SIZE,
+                             funds=DEFAULT_FUNDS, sheet_name='Report1', classifier=None, columns=None):
+    """Stream a rent roll workbook in batches, keeping only rows that survive the filters
+
+    Returns the same frame as RentRollProcessor._parse_rent_roll, but peak memory
+    is bounded by the batch size and the surviving rows rather than the whole sheet:
+    the column buffers start at one batch and double only as surviving rows fill them.
+    Cells right of the last requested column are never read.
+    """
+    schema = detect_schema(file_path, sheet_name)
+    columns = canonical_columns(columns)
+    positions, _ = schema.select(columns)
+
+    buffer = _ColumnBuffer(batch_size, list(positions) + DERIVED_COLUMNS)
+    for first_row, rows in iter_row_batches(file_path, schema.header_rows, max(positions.values()) + 1,
+                                            batch_size, sheet_name):
+        batch_df = _filter_batch(rows, first_row, positions, funds, classifier)
+        if not batch_df.empty:
+            buffer.append(batch_df, batch_df.index.to_numpy())
+
+    # Index rows the same way read_rent_roll does: the first row below the header is 0
+    frame = buffer.to_frame(index_offset=schema.header_rows + 1)
+    df = conform_columns(frame, columns).assign(**{col: frame[col] for col in DERIVED_COLUMNS})
+    return normalize_rent_roll(df, analysis_date, funds, classifier)
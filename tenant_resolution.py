@@ -0,0 +1,240 @@
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from lease_diff import normalize_tenant
+
+DEFAULT_TENANT_MAP = '.rent_roll_tenants.json'
+# Character-trigram Jaccard similarity at or above which two tenant keys are the same entity
+SIMILARITY_THRESHOLD = 0.7
+# Blocks larger than this are skipped: a token shared by that many keys does not discriminate
+MAX_BLOCK = 200
+# Tokens too generic to block on
+_STOP_TOKENS = {'the', 'and', 'of', 'a', 'an', 'dba', 'usa', 'us', 'america', 'american', 'group', 'services',
+                'service', 'international', 'holdings', 'enterprises', 'logistics', 'trucking', 'transport'}
+
+
+def trigrams(key):
+    """Character trigrams (as character tuples) of a tenant key, padded so short keys still have some"""
+    padded = f'  {key} '
+    return set(zip(padded, padded[1:], padded[2:]))
+
+
+def blocking_keys(keys):
+    """(key position, block) pairs: each key's first token and its rarest token (by key count)
+
+    Only keys sharing a block are ever compared. The first token catches added or
+    dropped trailing words; the rarest token catches a typo or reordering up front.
+    """
+    tokens = pd.Series(keys, dtype=object).str.split().explode().dropna()
+    tokens = tokens[(tokens.str.len() >= 3) & ~tokens.isin(_STOP_TOKENS)]
+    positions = tokens.index.to_numpy()
+    frequency = tokens.map(tokens.groupby(tokens).size()).to_numpy()
+    table = pd.DataFrame({'position': positions, 'token': tokens.to_numpy(), 'frequency': frequency})
+    first = table.drop_duplicates('position', keep='first')
+    rarest = table.sort_values(['position', 'frequency', 'token'], kind='stable').drop_duplicates('position')
+    blocks = pd.concat([first.assign(kind='first'), rarest.assign(kind='rare')], ignore_index=True)
+    return blocks.drop_duplicates(['position', 'token'])[['position', 'token']]
+
+
+def candidate_pairs(blocks, max_block=MAX_BLOCK, only=None):
+    """Distinct (i, j) key positions with i < j that share a block of at most max_block keys
+
+    With `only` (a boolean mask over positions), blocks without a flagged key are
+    skipped and pairs where neither side is flagged are dropped, so already-resolved
+    keys are not compared with each other again. Blocks are laid out contiguously
+    and pairs are generated by offset (k, k + d) for d = 1, 2, ... up to the largest
+    block, so no Python loop runs per block.
+    """
+    token_codes = pd.factorize(blocks['token'].to_numpy(dtype=object))[0]
+    positions = blocks['position'].to_numpy()
+    sizes = np.bincount(token_codes)
+    keep = (sizes >= 2) & (sizes <= max_block)
+    if only is not None:
+        keep &= np.bincount(token_codes, weights=only[positions], minlength=len(sizes)) > 0
+    rows = keep[token_codes]
+    token_codes, positions = token_codes[rows], positions[rows]
+    order = np.lexsort((positions, token_codes))
+    token_codes, positions = token_codes[order], positions[order]
+
+    pairs = [np.zeros((0, 2), dtype=np.int64)]
+    for offset in range(1, int(sizes[keep].max()) if keep.any() else 1):
+        same = token_codes[offset:] == token_codes[:-offset]
+        pairs.append(np.column_stack([positions[:-offset][same], positions[offset:][same]]))
+    pairs = np.unique(np.concatenate(pairs), axis=0)
+    if only is not None:
+        pairs = pairs[only[pairs[:, 0]] | only[pairs[:, 1]]]
+    return pairs
+
+
+def connected_components(n, pairs):
+    """Component label (smallest member position) of each of n nodes joined by pairs"""
+    labels = np.arange(n)
+    while len(pairs):
+        low = np.minimum(labels[pairs[:, 0]], labels[pairs[:, 1]])
+        updated = labels.copy()
+        np.minimum.at(updated, pairs[:, 0], low)
+        np.minimum.at(updated, pairs[:, 1], low)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+    return labels
+
+
+class TenantRegistry:
+    """Persistent mapping of raw tenant names to canonical tenant IDs
+
+    Names are normalized to keys (case, punctuation, legal suffixes and the '*' marker
+    removed, see lease_diff.normalize_tenant), so spelling variants of one name share a
+    key. Keys are then clustered by trigram similarity, comparing only keys that share
+    a blocking token (their first or rarest token), and each cluster gets a stable ID
+    ('T000001'). The mapping is saved as JSON and reused by every later snapshot, so
+    only names never seen before go through matching, and IDs never change once given.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path=DEFAULT_TENANT_MAP, threshold=SIMILARITY_THRESHOLD, max_block=MAX_BLOCK):
+        self.path = path
+        self.threshold = threshold
+        self.max_block = max_block
+        self.names = {}
+        self.keys = {}
+        self.tenants = {}
+        # Sources (e.g. workbook hashes) whose names have all been registered
+        self.sources = set()
+        # (key count, digest) of self.keys; keys are only ever added, so the count tells when to rehash
+        self._digest = (0, None)
+        if path and os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            if (saved.get('version') == self.VERSION and saved.get('threshold') == threshold
+                    and saved.get('max_block') == max_block):
+                self.names, self.keys, self.tenants = saved['names'], saved['keys'], saved['tenants']
+                self.sources = set(saved.get('sources', []))
+
+    def fingerprint(self):
+        """Resolution settings and a digest of the key -> ID mapping, used to key memoized metrics on tenant IDs"""
+        if self._digest[0] != len(self.keys) or self._digest[1] is None:
+            mapping = json.dumps(self.keys, sort_keys=True).encode()
+            self._digest = (len(self.keys), hashlib.sha256(mapping).hexdigest())
+        return [self.VERSION, self.threshold, self.max_block, self._digest[1]]
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': self.VERSION, 'threshold': self.threshold, 'max_block': self.max_block,
+                       'names': self.names, 'keys': self.keys, 'tenants': self.tenants,
+                       'sources': sorted(self.sources)}, f)
+        os.replace(tmp_path, self.path)
+
+    def synced(self, source):
+        """Whether every name of `source` has been registered by sync()"""
+        return source in self.sources
+
+    def sync(self, source, names):
+        """Register every name of one source (e.g. a workbook hash) and record the source as synced"""
+        self.resolve(names)
+        self.sources.add(source)
+        self.save()
+
+    def resolve(self, names):
+        """Canonical tenant ID of every name (None where the name is missing), registering new names"""
+        names = pd.Series(names, dtype=object)
+        codes, uniques = pd.factorize(names)
+        new = [name for name in uniques if name not in self.names]
+        if new:
+            self._register(new)
+            self.save()
+        ids = np.array([self.names[name] for name in uniques] + [None], dtype=object)
+        return ids[codes]
+
+    def _register(self, names):
+        new_keys = normalize_tenant(pd.Series(names, dtype=object).astype(str)).to_numpy(dtype=object)
+        unseen = list(dict.fromkeys(key for key in new_keys if key not in self.keys))
+        if unseen:
+            self._cluster(unseen, names, new_keys)
+        for name, key in zip(names, new_keys):
+            self.names[name] = self.keys[key]
+
+    def _cluster(self, unseen, names, new_keys):
+        """Give every unseen key the ID of a similar known key, or a new ID shared by its similar unseen keys"""
+        known = list(self.keys)
+        keys = known + unseen
+        is_new = np.r_[np.zeros(len(known), dtype=bool), np.ones(len(unseen), dtype=bool)]
+        pairs = candidate_pairs(blocking_keys(keys), self.max_block, only=is_new)
+
+        # Jaccard >= threshold needs the smaller trigram set to be at least threshold x the larger one,
+        # a cheap vectorized filter before any set is intersected
+        grams = {position: trigrams(keys[position]) for position in np.unique(pairs)}
+        sizes = np.zeros(len(keys))
+        sizes[list(grams)] = [len(grams[position]) for position in grams]
+        left, right = sizes[pairs[:, 0]], sizes[pairs[:, 1]]
+        pairs = pairs[np.minimum(left, right) >= self.threshold * np.maximum(left, right)]
+        similar = np.array([len(grams[i] & grams[j]) >= self.threshold * len(grams[i] | grams[j])
+                            for i, j in pairs.tolist()], dtype=bool)
+        # Known IDs are never merged with each other (candidate_pairs only returns pairs with a new key),
+        # so a new key joins at most one existing tenant
+        pairs = pairs[similar] if len(pairs) else pairs
+        labels = connected_components(len(keys), pairs)
+
+        display = {}
+        for name, key in zip(names, new_keys):
+            display.setdefault(key, name.lstrip('* ').strip())
+        next_id = len(self.tenants) + 1
+        assigned = {}
+        for position in range(len(known), len(keys)):
+            label = labels[position]
+            if label < len(known):
+                tenant_id = self.keys[known[label]]
+            elif label in assigned:
+                tenant_id = assigned[label]
+            else:
+                tenant_id = assigned[label] = f'T{next_id:06d}'
+                self.tenants[tenant_id] = display[keys[label]]
+                next_id += 1
+            self.keys[keys[position]] = tenant_id
+
+    def canonical_names(self, ids):
+        """Display name of each tenant ID (the first raw name registered for it)"""
+        return np.array([self.tenants.get(tenant_id) if tenant_id is not None else None for tenant_id in ids],
+                        dtype=object)
+
+    def merges(self):
+        """{tenant ID: [raw names]} for every tenant registered under more than one name"""
+        members = {}
+        for name, tenant_id in self.names.items():
+            members.setdefault(tenant_id, []).append(name)
+        return {tenant_id: sorted(group) for tenant_id, group in members.items() if len(group) > 1}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Resolve rent roll tenant names to canonical tenant IDs')
+    parser.add_argument('command', choices=['sync', 'merges', 'stats'])
+    parser.add_argument('--tenant-map', default=DEFAULT_TENANT_MAP)
+    args = parser.parse_args()
+
+    if args.command == 'sync':
+        from dashboard_data_processor import RentRollProcessor
+
+        # load_data registers the tenant names of every snapshot not synced yet
+        processor = RentRollProcessor(tenant_map=args.tenant_map)
+        processor.load_data()
+        registry = processor.tenants
+    else:
+        registry = TenantRegistry(args.tenant_map)
+
+    if args.command == 'merges':
+        for tenant_id, group in registry.merges().items():
+            print(f"{tenant_id}  {registry.tenants[tenant_id]}")
+            for name in group:
+                print(f"           {name}")
+    else:
+        print(f"{len(registry.names):,} names -> {len(registry.keys):,} keys -> {len(registry.tenants):,} tenants")
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from cashflow_projection import holdover_exposure, holdover_leases, month_grid, project_rent, projection_summary
+from conftest import ANALYSIS_DATE
+
+
+def test_month_grid_starts_after_the_analysis_date():
+    months = month_grid(ANALYSIS_DATE, 3)
+    assert [str(month) for month in months] == ['2025-07-01', '2025-08-01', '2025-09-01']
+
+
+def test_partial_months_are_prorated_by_day(make_rent_roll):
+    df = make_rent_roll([('xnj100', '1', 'Alpha Co', 1000, 12000, '2025-07-16', '2025-09-15')])
+    rent = project_rent(df, ANALYSIS_DATE, horizon=4, by=['Fund']).loc['Fund 2'].to_numpy()
+    assert rent == pytest.approx([1000 * 16 / 31, 1000, 1000 * 15 / 30, 0])
+
+
+def test_undated_and_expired_leases_hold_over(make_rent_roll):
+    df = make_rent_roll([
+        ('xnj100', '1', 'Month To Month Co', 1000, 12000, '2020-01-01', None),
+        ('xnj100', '2', 'Holdover Co', 1000, 24000, '2020-01-01', '2025-03-31'),
+        ('xnj100', '3', 'Term Co', 1000, 6000, '2020-01-01', '2030-12-31'),
+    ])
+    assert holdover_leases(df, ANALYSIS_DATE).tolist() == [True, True, False]
+
+    rent = project_rent(df, ANALYSIS_DATE, horizon=6, by=['Fund'], holdover_months=2).loc['Fund 2'].to_numpy()
+    assert rent == pytest.approx([3500, 3500, 500, 500, 500, 500])
+    through = project_rent(df, ANALYSIS_DATE, horizon=6, by=['Fund'], holdover_months=None).loc['Fund 2'].to_numpy()
+    assert through == pytest.approx([3500] * 6)
+    gone = project_rent(df, ANALYSIS_DATE, horizon=6, by=['Fund'], holdover_months=0).loc['Fund 2'].to_numpy()
+    assert gone == pytest.approx([500] * 6)
+
+
+def test_holdover_exposure_reports_the_excluded_rent(make_rent_roll):
+    df = make_rent_roll([
+        ('xnj100', '1', 'Month To Month Co', 1000, 12000, '2020-01-01', None),
+        ('xnj100', '2', 'Term Co', 1000, 6000, '2020-01-01', '2030-12-31'),
+        ('3md200', 'A', 'VACANT', 1000, None, None, None),
+    ])
+    exposure = holdover_exposure(df, ANALYSIS_DATE, horizon=12, by=['Fund'], holdover_months=3)
+    assert exposure.loc['Fund 2'].tolist() == pytest.approx([1, 1000, 3000, 9000])
+    assert 'Fund 3' not in exposure.index
+
+    summary = projection_summary(project_rent(df, ANALYSIS_DATE, 12, ['Fund'], 3), 'Fund 3', exposure, 3)
+    assert summary['monthly_rent'] == [0.0] * 12
+    assert summary['holdover'] == {'months': 3, 'leases': 0, 'monthly_rent': 0.0, 'projected_rent': 0.0,
+                                   'excluded_rent': 0.0}
+
+
+def test_projection_total_matches_summed_leases(make_rent_roll):
+    df = make_rent_roll([
+        ('xnj100', '1', 'Alpha Co', 1000, 12000, '2024-01-01', '2026-06-30'),
+        ('xnj200', '1', 'Beta Co', 2000, 36000, '2025-10-01', '2027-09-30'),
+    ])
+    projection = project_rent(df, ANALYSIS_DATE, horizon=36)
+    assert projection.shape == (2, 36)
+    assert np.isclose(projection.to_numpy().sum(), 1000 * 12 + 3000 * 24)
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from expiry_buckets import ExpiryBuckets, expiry_table, bucket_summary
+
+
+def test_edges_are_right_closed():
+    buckets = ExpiryBuckets([0, 6, 12])
+    assert buckets.labels == ['0-6 months', '6-12 months', '12+ months']
+    codes = buckets.codes([0.5, 6, 6.01, 12, 12.5, 100])
+    assert codes.tolist() == [0, 0, 1, 1, 2, 2]
+
+
+def test_lowest_edge_is_excluded_unless_include_lowest():
+    values = [0, 0.0001, 3]
+    assert ExpiryBuckets([0, 6]).codes(values).tolist() == [-1, 0, 0]
+    assert ExpiryBuckets([0, 6], include_lowest=True).codes(values).tolist() == [0, 0, 0]
+
+
+def test_values_below_first_edge_go_to_expired_bucket_when_labelled():
+    buckets = ExpiryBuckets([0, 6], expired='Expired', signed=True)
+    assert buckets.labels == ['Expired', '0-6 months', '6+ months']
+    assert buckets.codes([-3, 0, 2, 7]).tolist() == [0, 0, 1, 2]
+
+
+def test_include_lowest_with_expired_bucket_keeps_the_edge_in_the_first_bucket():
+    buckets = ExpiryBuckets([0, 6], expired='Expired', include_lowest=True, signed=True)
+    assert buckets.codes([-1, 0, 6]).tolist() == [0, 1, 1]
+
+
+def test_nan_and_values_past_a_closed_last_edge_are_left_out():
+    buckets = ExpiryBuckets([0, 6, 12], open_ended=False)
+    assert buckets.codes([np.nan, 12, 12.5]).tolist() == [-1, 1, -1]
+
+
+def test_edges_must_ascend():
+    with pytest.raises(ValueError):
+        ExpiryBuckets([0, 12, 6])
+
+
+def test_expiry_table_sums_each_fund_and_zero_fills_buckets(make_rent_roll):
+    df = make_rent_roll([
+        ('xnj100', '1', 'Alpha Co', 1000, 12000, '2020-01-01', '2025-09-30'),
+        ('xnj100', '2', 'Beta Co', 2000, 30000, '2020-01-01', '2026-03-31'),
+        ('3md200', 'A', 'Gamma Co', 4000, 40000, '2020-01-01', '2025-08-31'),
+        ('3md200', 'B', 'VACANT', 500, None, None, None),
+    ])
+    table = expiry_table(df, ExpiryBuckets([0, 6, 12]))
+
+    fund2 = bucket_summary(table, 'Fund 2')
+    assert list(fund2) == ['0-6 months', '6-12 months', '12+ months']
+    assert fund2['0-6 months'] == {'count': 1, 'sf': 1000.0, 'annual_rent': 12000.0}
+    assert fund2['6-12 months'] == {'count': 1, 'sf': 2000.0, 'annual_rent': 30000.0}
+    assert fund2['12+ months']['count'] == 0
+    # The vacant suite is left out of the occupied schedule
+    assert bucket_summary(table, 'Fund 3')['0-6 months'] == {'count': 1, 'sf': 4000.0, 'annual_rent': 40000.0}
+    assert table['sf'].sum() == pytest.approx(df.loc[~df['Is_Vacant'], 'Area'].sum())
+
+
+def test_calendar_year_buckets():
+    buckets = ExpiryBuckets.calendar_years(2025, 2027)
+    assert buckets.labels == ['2025', '2026', '2027', '2028+']
+    df = pd.DataFrame({'Lease_To': pd.to_datetime(['2025-01-01', '2027-12-31', '2031-06-30', None])})
+    assert buckets.codes(buckets.values(df)).tolist() == [0, 2, 3, -1]
@@ -0,0 +1,51 @@
+import json
+
+import pandas as pd
+import pytest
+
+from fund_classification import FundClassifier, fund_key
+from conftest import REPO_DIR
+
+
+def test_first_matching_rule_wins_and_unmatched_codes_are_tallied():
+    classifier = FundClassifier([{'fund': 'Fund 3', 'prefix': '3'}, {'fund': 'Fund 2', 'pattern': r'x\w+'},
+                                 {'fund': 'Catch All', 'prefix': '3x'}])
+    funds = classifier.classify(pd.Series(['3md200', 'xnj100', 'xnj100', '3xpa1', 'iga001', 'iga001', None]))
+    assert funds.tolist() == ['Fund 3', 'Fund 2', 'Fund 2', 'Fund 3', 'Other', 'Other', 'Unknown']
+    assert dict(classifier.unmatched) == {'iga001': 2}
+
+
+def test_fund_key():
+    assert [fund_key(fund) for fund in ('Fund 2', 'Fund I-A', 'fund 3')] == ['fund2', 'fundia', 'fund3']
+
+
+def test_configured_funds_are_exported_and_unmatched_codes_survive_the_cache(tmp_path):
+    from dashboard_data_processor import RentRollProcessor
+    from export_data_for_web import export_dashboard_data
+
+    config = tmp_path / 'funds.json'
+    config.write_text(json.dumps({
+        'rules': [{'fund': 'Fund 3', 'prefix': '3'}, {'fund': 'Fund 2', 'prefix': 'x'},
+                  {'fund': 'Fund I', 'pattern': 'i(?!ga)'}],
+        'include': ['Fund 2', 'Fund 3', 'Fund I'],
+    }))
+
+    def processor():
+        loaded = RentRollProcessor(cache_dir=str(tmp_path / 'cache'), data_dir=REPO_DIR, fund_config=str(config),
+                                   memoize=False, tenant_map=None)
+        loaded.load_data()
+        return loaded
+
+    parsed = processor()
+    if len(parsed.snapshots) < 3:
+        pytest.skip('bundled rent roll workbooks not found')
+    unmatched = parsed.unmatched_prop_codes()
+    assert unmatched and all(code.startswith('iga') for code in unmatched)
+
+    cached = processor()
+    assert cached.unmatched_prop_codes() == unmatched
+    assert cached.cache_stats()['hits'] == 3
+
+    exported = export_dashboard_data(cached, tmp_path / 'dashboard_data.json')
+    assert exported['metadata']['funds'] == {'fund2': 'Fund 2', 'fund3': 'Fund 3', 'fundi': 'Fund I'}
+    assert exported['fundi']['metrics']['risk_metrics']['unique_tenants'] > 0
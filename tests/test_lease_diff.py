@@ -0,0 +1,75 @@
+import pandas as pd
+
+from lease_diff import diff_snapshots, normalize_tenant, normalize_units, status_counts
+
+PRIOR_DATE = pd.Timestamp('2025-03-31')
+
+
+def statuses(diff):
+    return dict(zip(diff['Tenant_Name'], diff['Status'].astype(str)))
+
+
+def test_normalize_tenant_ignores_case_punctuation_suffixes_codes_and_marker():
+    names = pd.Series(['* Acme, Inc. (t0000123)', 'ACME INC', 'Acme LLC', 'acme', 'Acme Logistics Co.'])
+    assert normalize_tenant(names).tolist() == ['acme', 'acme', 'acme', 'acme', 'acme logistics']
+
+
+def test_normalize_units():
+    assert normalize_units(pd.Series(['a,  b', '101.0', ' 7 '])).tolist() == ['A,B', '101', '7']
+
+
+def test_renamed_tenant_is_matched_not_new_and_lost(make_rent_roll):
+    prior = make_rent_roll([('xnj100', '1', '* Acme, Inc.', 1000, 12000, '2024-01-01', '2029-12-31')], PRIOR_DATE)
+    current = make_rent_roll([('xnj100', '1', 'ACME INC', 1000, 12000, '2024-01-01', '2029-12-31')])
+    diff = diff_snapshots(prior, current)
+    assert len(diff) == 1
+    assert diff['Status'].astype(str).tolist() == ['unchanged']
+    counts = status_counts(diff).loc['Fund 2']
+    assert counts['new'] == 0 and counts['lost'] == 0
+
+
+def test_redrawn_unit_list_matches_on_the_second_pass(make_rent_roll):
+    prior = make_rent_roll([('3md200', 'A', 'Beta Co', 2000, 20000, '2024-01-01', '2028-12-31')], PRIOR_DATE)
+    current = make_rent_roll([('3md200', 'A, B', 'Beta Co', 3000, 30000, '2024-01-01', '2028-12-31')])
+    diff = diff_snapshots(prior, current)
+    assert diff['Status'].astype(str).tolist() == ['rent_changed']
+    assert diff['Rent_Change'].tolist() == [10000]
+
+
+def test_every_status_is_classified(make_rent_roll):
+    prior = make_rent_roll([
+        ('xnj100', '1', 'Stay Co', 1000, 10000, '2024-01-01', '2029-12-31'),
+        ('xnj100', '2', 'Leave Co', 1000, 10000, '2024-01-01', '2029-12-31'),
+        ('xnj100', '3', 'Renew Co', 1000, 10000, '2020-01-01', '2025-05-31'),
+        ('xnj100', '4', 'Extend Co', 1000, 10000, '2024-01-01', '2025-12-31'),
+        ('xnj100', '5', 'Bump Co', 1000, 10000, '2024-01-01', '2029-12-31'),
+        ('xnj100', '6', 'VACANT', 1000, None, None, None),
+    ], PRIOR_DATE)
+    current = make_rent_roll([
+        ('xnj100', '1', 'Stay Co', 1000, 10000.5, '2024-01-01', '2029-12-31'),
+        ('xnj100', '3', 'Renew Co', 1000, 11000, '2025-06-01', '2030-05-31'),
+        ('xnj100', '4', 'Extend Co', 1000, 10000, '2024-01-01', '2027-12-31'),
+        ('xnj100', '5', 'Bump Co', 1000, 12000, '2024-01-01', '2029-12-31'),
+        ('xnj100', '6', 'Arrive Co', 1000, 9000, '2025-05-01', '2030-04-30'),
+        ('xnj100', '2', 'VACANT', 1000, None, None, None),
+    ])
+    diff = diff_snapshots(prior, current)
+    assert statuses(diff) == {'Stay Co': 'unchanged', 'Leave Co': 'lost', 'Renew Co': 'renewed',
+                              'Extend Co': 'extended', 'Bump Co': 'rent_changed', 'Arrive Co': 'new'}
+    assert status_counts(diff).loc['Fund 2'].tolist() == [1, 1, 1, 1, 1, 1]
+
+
+def test_duplicate_keys_pair_in_order(make_rent_roll):
+    leases = [('xnj100', '1', 'Twin Co', 500, 5000, '2024-01-01', '2029-12-31'),
+              ('xnj100', '1', 'Twin Co', 500, 5000, '2030-01-01', '2034-12-31')]
+    diff = diff_snapshots(make_rent_roll(leases, PRIOR_DATE), make_rent_roll(leases))
+    assert diff['Status'].astype(str).tolist() == ['unchanged', 'unchanged']
+    assert (diff['Lease_From_Prior'] == diff['Lease_From_Current']).all()
+
+
+def test_star_marked_tenants_do_not_churn_between_the_bundled_snapshots(bundled_processor):
+    counts = status_counts(bundled_processor.lease_diff('Q1_2025', 'Q2_2025'))
+    # '* Tenant' (lease not yet commenced) and 'Tenant' are the same lease; before the
+    # marker was normalized away Fund 3 showed 47 new and 54 lost leases
+    assert counts.loc['Fund 3', ['new', 'lost']].tolist() == [0, 7]
+    assert counts.loc['Fund 2', ['new', 'lost']].tolist() == [0, 10]
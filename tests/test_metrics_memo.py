@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics_memo import MetricsMemo, memo_key
+from snapshot_cache import METRICS_DIR, SnapshotCache
+
+
+def test_keys_accept_numpy_scalars_and_dates_but_not_arrays():
+    assert memo_key('kind', np.int64(3), pd.Timestamp('2025-06-30')) == memo_key('kind', 3, '2025-06-30T00:00:00')
+    with pytest.raises(TypeError):
+        memo_key('kind', np.arange(3))
+    with pytest.raises(TypeError):
+        memo_key('kind', pd.DataFrame({'a': [1]}))
+
+
+def test_values_are_copied_and_reloaded_from_disk(tmp_path):
+    memo = MetricsMemo(cache_dir=tmp_path)
+    value = memo.get_or_compute('a', lambda: {'rows': [1, 2]})
+    value['rows'].append(3)
+    assert MetricsMemo(cache_dir=tmp_path).get_or_compute('a', lambda: None) == {'rows': [1, 2]}
+    assert memo.stats()['misses'] == 1
+
+
+def test_disk_tier_drops_the_least_recently_used_pickles(tmp_path):
+    payload = b'x' * 1000
+    memo = MetricsMemo(cache_dir=tmp_path, max_disk_bytes=3500)
+    for key in 'abc':
+        memo.put(key, payload)
+    assert memo.disk_stats()['entries'] == 3
+    # Reading 'a' makes 'b' the least recently used
+    MetricsMemo(cache_dir=tmp_path).get('a')
+    memo.put('d', payload)
+    assert sorted(path.stem for path in tmp_path.glob('*.pkl')) == ['a', 'c', 'd']
+    assert memo.disk_stats()['bytes'] <= 3500
+
+
+def test_snapshot_cache_invalidate_and_stats_cover_the_metrics(tmp_path):
+    memo = MetricsMemo(cache_dir=tmp_path / METRICS_DIR)
+    memo.put('a', {'walt': 30.0})
+    cache = SnapshotCache(tmp_path)
+    stats = cache.stats()
+    assert stats['metrics_entries'] == 1 and stats['metrics_bytes'] > 0
+    cache.invalidate(['missing.xlsx'])
+    assert cache.stats()['metrics_entries'] == 0
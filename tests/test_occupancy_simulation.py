@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from occupancy_simulation import sample, simulate_occupancy, simulate_paths
+from conftest import ANALYSIS_DATE
+
+
+@pytest.fixture
+def rent_roll(make_rent_roll):
+    return make_rent_roll([
+        ('xnj100', '1', 'Alpha Co', 1000, 12000, '2024-01-01', '2025-12-31'),
+        ('xnj100', '2', 'Beta Co', 3000, 30000, '2024-01-01', '2027-06-30'),
+        ('xnj100', '3', 'VACANT', 2000, None, None, None),
+        ('3md200', 'A', 'Gamma Co', 1500, 18000, '2023-01-01', '2026-03-31'),
+    ])
+
+
+def test_seeded_runs_repeat_with_and_without_the_pool(rent_roll):
+    serial = simulate_paths(rent_roll, n_paths=40, horizon=24, seed=11, batch_size=7)
+    again = simulate_paths(rent_roll, n_paths=40, horizon=24, seed=11, batch_size=7)
+    pooled = simulate_paths(rent_roll, n_paths=40, horizon=24, seed=11, batch_size=7, parallel=True, max_workers=2)
+    for first, second, third in zip(serial[1:], again[1:], pooled[1:]):
+        assert np.array_equal(first, second)
+        assert np.array_equal(first, third)
+    other = simulate_paths(rent_roll, n_paths=40, horizon=24, seed=12, batch_size=7)
+    assert not np.array_equal(serial[1], other[1])
+
+
+def test_vacant_suites_are_let_after_the_lease_up(rent_roll):
+    funds, occupied_sf, revenue = simulate_paths(rent_roll, {'vacant_lease_up_months': 4}, n_paths=3,
+                                                 horizon=12, seed=0)
+    fund2 = funds.index('Fund 2')
+    # Nothing else expires before December, so only the vacant suite changes occupied SF
+    assert occupied_sf[:, fund2, :4].tolist() == [[4000] * 4] * 3
+    assert occupied_sf[:, fund2, 4:6].tolist() == [[6000] * 2] * 3
+    # Let at the fund's in-place rent per SF: (1000 + 2500) / 4000 SF a month
+    assert revenue[:, fund2, 4] == pytest.approx([3500 + 2000 * 3500 / 4000] * 3)
+
+
+def test_vacant_rent_psf_overrides_the_in_place_rent(rent_roll):
+    funds, _, revenue = simulate_paths(rent_roll, {'vacant_lease_up_months': 0, 'vacant_rent_psf': 2.0},
+                                       n_paths=2, horizon=3, seed=0)
+    assert revenue[:, funds.index('Fund 2'), 0] == pytest.approx([3500 + 4000] * 2)
+
+
+def test_occupancy_bands_are_ordered_and_include_vacant_sf(rent_roll):
+    bands = simulate_occupancy(rent_roll, ANALYSIS_DATE, n_paths=50, horizon=24, seed=3)
+    assert bands.loc[('Fund 2', bands.index.levels[1][0]), 'occupancy_p50'] == pytest.approx(4000 / 6000 * 100)
+    occupancy = bands.filter(like='occupancy_').to_numpy()
+    assert (np.diff(occupancy, axis=1) >= 0).all()
+    assert occupancy.max() <= 100
+
+
+def test_numpy_integer_bounds_draw_whole_months():
+    rng = np.random.default_rng(0)
+    for low, high in ((3, 12), (np.int64(3), np.int64(12)), (np.int32(3), 12)):
+        draws = sample(rng, {'dist': 'uniform', 'low': low, 'high': high}, 500)
+        assert (draws == np.round(draws)).all() and draws.min() == 3 and draws.max() == 12
+    draws = sample(rng, {'dist': 'uniform', 'low': 3.0, 'high': 12.0}, 500)
+    assert (draws != np.round(draws)).any()
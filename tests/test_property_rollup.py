@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from property_rollup import property_rollup, top_n, top_properties
+
+
+def test_rollup_sums_each_property(make_rent_roll):
+    df = make_rent_roll([
+        ('xnj100', '1', 'Alpha Co', 1000, 12000, '2024-01-01', '2029-12-31'),
+        ('xnj100', '2', 'VACANT', 500, None, None, None),
+        ('3md200', 'A', 'Beta Co', 2000, 30000, '2024-01-01', '2027-12-31'),
+    ])
+    rollup = property_rollup(df)
+    assert rollup.loc['xnj100', ['total_sf', 'occupied_sf', 'vacant_sf', 'annual_rent', 'rent_psf']].tolist() == \
+        [1500, 1000, 500, 12000, 12]
+    assert rollup.loc['xnj100', 'has_vacancy'] and not rollup.loc['3md200', 'has_vacancy']
+    assert rollup.loc['3md200', 'property'] == '3MD200 Industrial Park'
+
+
+def test_top_n_breaks_ties_at_the_cut_off_in_prop_code_order():
+    codes = [f'p{i:03d}' for i in range(200)]
+    rent = np.where(np.arange(200) % 3 == 0, 100.0, 50.0)
+    rent[7] = np.nan
+    rollup = pd.DataFrame({'fund': 'Fund 2', 'property': codes, 'annual_rent': rent, 'total_sf': 1.0,
+                           'has_vacancy': False}, index=pd.Index(codes, name='Prop_Code'))
+    top = top_n(rollup, 70)
+    tied = [code for code, value in zip(codes, rent) if value == 100]
+    assert list(top.index) == tied + [code for code, value in zip(codes, rent) if value == 50][:3]
+    assert list(top_n(rollup, 500).index)[-1] == 'p007'
+    assert [row['prop_code'] for row in top_properties(rollup, 2)] == ['p000', 'p003']
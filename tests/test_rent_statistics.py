@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from rent_statistics import RENT_PERCENTILES, distribution_summary, rent_histogram, rent_statistics
+
+
+def leases(make_rent_roll, rows):
+    """(prop_code, unit, area, rent/SF) rows; rent None marks a vacant suite"""
+    return make_rent_roll([(prop_code, unit, 'VACANT' if psf is None else f'Tenant {prop_code} {unit}', area,
+                            None if psf is None else area * psf, None if psf is None else '2024-01-01',
+                            None if psf is None else '2029-12-31')
+                           for prop_code, unit, area, psf in rows])
+
+
+def test_weighted_percentiles_follow_the_sf(make_rent_roll):
+    df = leases(make_rent_roll, [('xnj100', '1', 500, 20.0), ('xnj200', '1', 500_000, 6.0),
+                                 ('xnj100', '2', 10_000, None)])
+    stats = rent_statistics(df).loc['Fund 2']
+    assert stats['count'] == 2 and stats['sf'] == 500_500
+    # Unweighted, the suite and the warehouse count the same
+    assert stats['mean'] == stats['p50'] == pytest.approx(13.0)
+    # Weighted, 99.9% of the SF pays $6
+    weighted_mean = (500 * 20 + 500_000 * 6) / 500_500
+    assert stats['weighted_mean'] == pytest.approx(weighted_mean)
+    assert [stats[f'weighted_p{q}'] for q in RENT_PERCENTILES] == [6.0] * 5
+    assert stats['weighted_std'] == pytest.approx(
+        np.sqrt((500 * (20 - weighted_mean) ** 2 + 500_000 * (6 - weighted_mean) ** 2) / 500_500))
+
+
+def test_unweighted_statistics_match_pandas(make_rent_roll):
+    rng = np.random.default_rng(5)
+    rows = [(f'{prefix}{site}', str(unit), int(rng.integers(500, 50_000)), round(float(rng.uniform(3, 25)), 2))
+            for prefix in ('xnj', '3md') for site in (100, 200, 300) for unit in range(int(rng.integers(1, 9)))]
+    df = leases(make_rent_roll, rows)
+    for by in (['Fund'], ['Fund', 'Prop_Code']):
+        stats = rent_statistics(df, by)
+        grouped = df.groupby(by)['Annual_Rent_Area']
+        assert stats['count'].tolist() == grouped.size().tolist()
+        for column, expected in (('mean', grouped.mean()), ('std', grouped.std()), ('min', grouped.min()),
+                                 ('max', grouped.max())):
+            np.testing.assert_allclose(stats[column].to_numpy(), expected.to_numpy(), equal_nan=True)
+        for q in RENT_PERCENTILES:
+            np.testing.assert_allclose(stats[f'p{q}'].to_numpy(), grouped.quantile(q / 100).to_numpy())
+
+
+def test_histogram_counts_every_bin_of_every_group(make_rent_roll):
+    df = leases(make_rent_roll, [('xnj100', '1', 1000, 1.0), ('xnj100', '2', 2000, 6.0), ('xnj100', '3', 500, 7.5),
+                                 ('xnj100', '4', 800, 40.0), ('xnj100', '5', 900, None),
+                                 ('3md200', 'A', 3000, 20.0)])
+    histogram = rent_histogram(df)
+    fund2 = histogram.loc['Fund 2']
+    assert len(fund2) == len(histogram.loc['Fund 3']) == 16
+    assert fund2.loc[['$0-2', '$6-8', '$30+'], 'count'].tolist() == [1, 2, 1]
+    assert fund2.loc['$6-8', 'sf'] == 2500
+    assert fund2['count'].sum() == 4
+    assert histogram.loc['Fund 3'].loc['$20-22', 'count'] == 1 and histogram.loc['Fund 3', 'count'].sum() == 1
+
+    summary = distribution_summary(rent_statistics(df), histogram, 'Fund 3')
+    assert summary['statistics']['std'] is None
+    assert summary['histogram']['count'] == histogram.loc['Fund 3', 'count'].tolist()
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from lease_diff import diff_snapshots
+from revenue_bridge import BRIDGE_COMPONENTS, bridge_summary, revenue_bridge
+
+PRIOR_DATE = pd.Timestamp('2025-03-31')
+
+
+def assert_reconciles(bridge):
+    components = bridge[BRIDGE_COMPONENTS].sum(axis=1)
+    assert (bridge['prior_revenue'] + components).tolist() == pytest.approx(bridge['current_revenue'].tolist(),
+                                                                           abs=1e-6)
+
+
+def test_components_attribute_each_lease(make_rent_roll):
+    prior = make_rent_roll([
+        ('xnj100', '1', 'Leave Co', 1000, 10000, '2024-01-01', '2029-12-31'),
+        ('xnj100', '2', 'Renew Co', 1000, 10000, '2020-01-01', '2025-05-31'),
+        ('xnj100', '3', 'Bump Co', 1000, 10000, '2024-01-01', '2029-12-31'),
+        ('xnj100', '4', 'Drift Co', 1000, 10000, '2024-01-01', '2029-12-31'),
+        ('3md200', 'A', 'Other Fund Co', 1000, 5000, '2024-01-01', '2029-12-31'),
+    ], PRIOR_DATE)
+    current = make_rent_roll([
+        ('xnj100', '2', 'Renew Co', 1000, 11500, '2025-06-01', '2030-05-31'),
+        ('xnj100', '3', 'Bump Co', 1000, 12000, '2024-01-01', '2029-12-31'),
+        ('xnj100', '4', 'Drift Co', 1000, 10000.4, '2024-01-01', '2029-12-31'),
+        ('xnj100', '5', 'Arrive Co', 1000, 9000, '2025-05-01', '2030-04-30'),
+        ('3md200', 'A', 'Other Fund Co', 1000, 5000, '2024-01-01', '2029-12-31'),
+    ])
+    bridge = revenue_bridge(diff_snapshots(prior, current))
+
+    fund2 = bridge.loc['Fund 2']
+    assert fund2['prior_revenue'] == 40000
+    assert fund2['new_leases'] == 9000
+    assert fund2['move_outs'] == -10000
+    assert fund2['renewals'] == 1500
+    # Sub-tolerance drift on an unchanged lease stays in rent_changes so the bridge still reconciles
+    assert fund2['rent_changes'] == pytest.approx(2000.4)
+    assert fund2['current_revenue'] == pytest.approx(42500.4)
+    assert bridge.loc['Fund 3', BRIDGE_COMPONENTS].tolist() == [0, 0, 0, 0]
+    assert_reconciles(bridge)
+
+
+def test_missing_funds_are_zero_filled_and_summarized(make_rent_roll):
+    snapshot = make_rent_roll([('xnj100', '1', 'Stay Co', 1000, 10000, '2024-01-01', '2029-12-31')])
+    bridge = revenue_bridge(diff_snapshots(snapshot, snapshot), funds=['Fund 2', 'Fund 3'])
+    assert bridge.loc['Fund 3'].tolist() == [0.0] * len(bridge.columns)
+    summary = bridge_summary(bridge, 'Fund 2', 'Q1 2025', 'Q2 2025')
+    assert summary['prior_period'] == 'Q1 2025'
+    assert summary['prior_revenue'] == summary['current_revenue'] == 10000.0
+
+
+def test_bridge_reconciles_between_the_bundled_snapshots(bundled_processor):
+    for prior, current in (('Q4_2024', 'Q1_2025'), ('Q1_2025', 'Q2_2025'), ('Q4_2024', 'Q2_2025')):
+        bridge = bundled_processor.revenue_bridge(prior, current)
+        assert_reconciles(bridge)
+        revenue = {period: bundled_processor.snapshots[period].groupby('Fund')['Annual_Rent'].sum()
+                   for period in (prior, current)}
+        for fund in bridge.index:
+            assert bridge.loc[fund, 'prior_revenue'] == pytest.approx(revenue[prior][fund])
+            assert bridge.loc[fund, 'current_revenue'] == pytest.approx(revenue[current][fund])
@@ -0,0 +1,40 @@
+import pytest
+
+from risk_scoring import RISK_RULES, risk_inputs, risk_summary, score_risk
+
+
+@pytest.fixture
+def rent_roll(make_rent_roll):
+    return make_rent_roll([
+        ('xnj100', '1', 'Alpha Co', 1000, 12000, '2024-01-01', '2026-03-31'),
+        ('xnj100', '2', 'Beta Co', 3000, 30000, '2024-01-01', '2028-06-30'),
+        ('xnj100', '3', 'VACANT', 1000, None, None, None),
+    ])
+
+
+def test_rule_ladders_score_the_first_matching_rung(rent_roll):
+    scored = score_risk(risk_inputs(rent_roll))
+    row = scored.loc['Fund 2']
+    # 80% occupied, 29.6 months WALT, a quarter of the SF expiring within 12 months, two tenants
+    assert row['occupancy_rate'] == pytest.approx(80)
+    assert row[['occupancy_score', 'walt_score', 'near_term_expiry_score', 'concentration_score']].tolist() == \
+        [30, 20, 10, 20]
+    assert row['overall_risk_score'] == 80 and row['risk_level'] == 'High'
+
+
+def test_weights_scale_each_component(rent_roll):
+    scored = score_risk(risk_inputs(rent_roll), weights={'occupancy': 0, 'concentration': 0.5})
+    assert scored.loc['Fund 2', 'overall_risk_score'] == 40
+    assert scored.loc['Fund 2', 'risk_level'] == 'Medium'
+
+
+def test_missing_keys_are_scored_with_the_active_rules(rent_roll):
+    rules = {'walt': {**RISK_RULES['walt'], 'points': [0, 0, 0]}}
+    weights = {'occupancy': 0.5}
+    scored = score_risk(risk_inputs(rent_roll), rules, weights)
+    # All-zero inputs: 30 * 0.5 occupancy points, no WALT points under the overridden ladder
+    summary = risk_summary(scored, 'Fund 3', rules, weights)
+    assert summary['overall_risk_score'] == 15
+    assert summary['risk_level'] == 'Low'
+    assert summary['unique_tenants'] == 0
+    assert risk_summary(scored, 'Fund 3')['overall_risk_score'] == 60
@@ -0,0 +1,72 @@
+import pytest
+
+from metrics_engine import grouped_period_metrics, stack_snapshots
+from scenario_engine import SCENARIO_METRICS, ScenarioEngine, extend_term, new_lease, rent_change, vacate
+
+
+@pytest.fixture
+def rent_roll(make_rent_roll):
+    return make_rent_roll([
+        ('xnj100', '1', 'Alpha Co', 1000, 12000, '2024-01-01', '2025-12-31'),
+        ('xnj100', '2', 'Beta Co', 3000, 30000, '2024-01-01', '2028-06-30'),
+        ('xnj100', '3', 'VACANT', 2000, None, None, None),
+        ('xnj200', '1', 'Gamma Co', 1500, 18000, '2023-01-01', '2026-03-31'),
+        ('3md200', 'A', 'Delta Co', 2500, 25000, '2022-01-01', '2027-09-30'),
+        ('3md200', 'B', 'VACANT', 500, None, None, None),
+    ])
+
+
+def recompute(df, label='Q2_2025'):
+    """Metrics from scratch: period metrics per fund and for the whole snapshot"""
+    funds = grouped_period_metrics(stack_snapshots({label: df}), [label])
+    portfolio = grouped_period_metrics(stack_snapshots({label: df.assign(Fund='All')}), [label])['All'][label]
+    return {fund: periods[label] for fund, periods in funds.items()}, portfolio
+
+
+def apply_to_frame(df, rows):
+    """The overrides of the scenario below applied to a copy of the whole frame"""
+    df = df.copy()
+    vacated, leased, bumped, extended = rows
+    df.loc[vacated, ['Is_Vacant', 'Annual_Rent', 'Monthly_Rent', 'Months_To_Expiry']] = [True, 0.0, 0.0, 0.0]
+    df.loc[leased, 'Is_Vacant'] = False
+    df.loc[leased, 'Annual_Rent'] = df.loc[leased, 'Area'] * 9.5
+    df.loc[leased, 'Monthly_Rent'] = df.loc[leased, 'Annual_Rent'] / 12
+    df.loc[leased, 'Months_To_Expiry'] = 60
+    df.loc[bumped, ['Annual_Rent', 'Monthly_Rent']] *= 1.05
+    df.loc[extended, 'Months_To_Expiry'] += 24
+    return df
+
+
+def test_scenario_deltas_match_a_full_recompute(rent_roll):
+    engine = ScenarioEngine(rent_roll, 'Q2 2025')
+    rows = (engine.rows(tenant='alpha'), engine.rows(vacant=True), engine.rows(fund='Fund 3', vacant=False),
+            engine.rows(tenant='Gamma'))
+    result = engine.evaluate([vacate(rows[0]), new_lease(rows[1], 9.5, 60), rent_change(rows[2], pct=0.05),
+                              extend_term(rows[3], 24)])
+    funds, portfolio = recompute(apply_to_frame(rent_roll, rows))
+
+    for fund, metrics in funds.items():
+        for key in SCENARIO_METRICS:
+            assert result['funds'][fund][key] == pytest.approx(metrics[key]), (fund, key)
+    for key in SCENARIO_METRICS:
+        assert result['portfolio'][key] == pytest.approx(portfolio[key]), key
+
+
+def test_base_case_matches_the_period_metrics(rent_roll):
+    comparison = ScenarioEngine(rent_roll).compare({'Alpha leaves': [vacate([0])]})
+    funds, _ = recompute(rent_roll)
+    for fund, metrics in funds.items():
+        assert comparison.loc[('Base', fund)].tolist() == pytest.approx([metrics[key] for key in SCENARIO_METRICS])
+    assert comparison.loc[('Alpha leaves', 'Fund 3')].tolist() == comparison.loc[('Base', 'Fund 3')].tolist()
+
+
+def test_unknown_rows_raise(rent_roll):
+    with pytest.raises(KeyError):
+        ScenarioEngine(rent_roll).evaluate([vacate([999])])
+
+
+def test_processor_keeps_engines_out_of_the_memo(bundled_processor):
+    engine = bundled_processor.scenario_engine()
+    assert bundled_processor.scenario_engine() is engine
+    scenarios = {'Leave': [vacate(engine.rows(fund='Fund 2', vacant=False)[:1])]}
+    assert bundled_processor.compare_scenarios(scenarios).equals(engine.compare(scenarios))
@@ -0,0 +1,51 @@
+import json
+
+from tenant_resolution import TenantRegistry
+
+
+NAMES = ['* Acme Logistics, LLC', 'ACME LOGISTICS LLC', 'Acme Logistic LLC', 'Beta Foods Inc']
+
+
+def test_variants_resolve_to_one_tenant(tmp_path):
+    registry = TenantRegistry(tmp_path / 'tenants.json')
+    ids = registry.resolve(NAMES + [None])
+    assert ids[0] == ids[1] == ids[2] != ids[3]
+    assert ids[4] is None
+    assert registry.canonical_names(ids[:1]).tolist() == ['Acme Logistics, LLC']
+
+
+def test_saved_map_keeps_ids_and_settings(tmp_path):
+    path = tmp_path / 'tenants.json'
+    first = TenantRegistry(path)
+    ids = first.resolve(NAMES)
+    saved = json.loads(path.read_text())
+    assert (saved['threshold'], saved['max_block']) == (first.threshold, first.max_block)
+
+    reloaded = TenantRegistry(path)
+    assert reloaded.fingerprint() == first.fingerprint()
+    assert reloaded.resolve(['Beta Foods, Inc.', 'Acme Logistics']).tolist() == [ids[3], ids[0]]
+    # A map built with other settings is not reused
+    assert TenantRegistry(path, threshold=0.8).keys == {}
+    assert TenantRegistry(path, max_block=50).keys == {}
+
+
+def test_fingerprint_changes_with_the_mapping():
+    registry = TenantRegistry(None)
+    empty = registry.fingerprint()
+    registry.resolve(NAMES)
+    resolved = registry.fingerprint()
+    assert resolved != empty
+    registry.resolve(NAMES)
+    assert registry.fingerprint() == resolved
+    registry.resolve(['Gamma Storage Co'])
+    assert registry.fingerprint() != resolved
+
+
+def test_synced_sources_are_saved_with_the_map(tmp_path):
+    path = tmp_path / 'tenants.json'
+    registry = TenantRegistry(path)
+    registry.sync('sha-q1', NAMES)
+    fingerprint = registry.fingerprint()
+    reloaded = TenantRegistry(path)
+    assert reloaded.synced('sha-q1') and not reloaded.synced('sha-q2')
+    assert reloaded.fingerprint() == fingerprint
@@ -0,0 +1,91 @@
+import pickle
+
+import pandas as pd
+import pytest
+
+from rent_roll_normalization import DAYS_PER_MONTH
+from vacancy_aging import VacancyTracker, aging_summary, aging_table
+
+DATES = {'Q4_2024': pd.Timestamp('2024-12-31'), 'Q1_2025': pd.Timestamp('2025-03-31'),
+         'Q2_2025': pd.Timestamp('2025-06-30')}
+VACANT = ('VACANT', None, None, None)
+# Unit: (lease, annual_rent, lease_from, lease_to) in each snapshot
+UNITS = {
+    # Moves out when its lease expires in January
+    '1': [('Alpha Co', 12000, '2020-02-01', '2025-01-31'), VACANT, VACANT],
+    # Vacant in every snapshot, so its downtime is censored
+    '2': [VACANT, VACANT, VACANT],
+    # Let between the first and second snapshots, dark again by the third
+    '3': [VACANT, ('Epsilon Co', 24000, '2025-02-01', '2025-04-30'), VACANT],
+    # Leaves years before its expiry
+    '4': [('Zeta Co', 6000, '2020-01-01', '2029-12-31'), VACANT, VACANT],
+    '5': [('Delta Co', 9000, '2020-01-01', '2029-12-31')] * 3,
+}
+
+
+def snapshots(make_rent_roll):
+    frames = {}
+    for i, (period, date) in enumerate(DATES.items()):
+        frames[period] = make_rent_roll([('xnj100', unit, *states[i][:1], 1000, *states[i][1:])
+                                         for unit, states in UNITS.items()], date)
+    return frames
+
+
+def fold(tracker, frames, periods):
+    for period in periods:
+        tracker.update(frames[period], DATES[period], period)
+    return tracker
+
+
+def test_downtime_of_every_vacant_unit(make_rent_roll):
+    aging = fold(VacancyTracker(), snapshots(make_rent_roll), DATES).aging().xs('xnj100')
+    assert sorted(aging.index) == ['1', '2', '3', '4']
+
+    # First vacant snapshot; the run starts the day after the lease expired
+    assert aging.loc['1', 'Vacant_Since_Period'] == 'Q1_2025'
+    assert aging.loc['1', 'Vacant_Since'] == pd.Timestamp('2025-02-01')
+    assert aging.loc['1', 'Downtime_Months'] == pytest.approx(149 / DAYS_PER_MONTH)
+    # Last in-place lease carried forward through the later vacant snapshot
+    assert aging.loc['1', ['Last_Tenant', 'Last_Annual_Rent', 'Last_Rent_PSF']].tolist() == ['Alpha Co', 12000, 12]
+    assert aging.loc['1', 'Last_Lease_To'] == pd.Timestamp('2025-01-31')
+
+    # Vacant since first seen: censored at the first snapshot, no last lease
+    assert aging.loc['2', 'Censored'] and aging.loc['2', 'Vacant_Since'] == DATES['Q4_2024']
+    assert pd.isna(aging.loc['2', 'Last_Tenant'])
+
+    # Re-let, then vacant again: the run restarts after the new lease, not at the first vacancy
+    assert aging.loc['3', 'Vacant_Since_Period'] == 'Q2_2025'
+    assert aging.loc['3', 'Vacant_Since'] == pd.Timestamp('2025-05-01')
+    assert not aging.loc['3', 'Censored'] and aging.loc['3', 'Last_Tenant'] == 'Epsilon Co'
+
+    # An expiry after the first vacant snapshot is not when the unit went dark
+    assert aging.loc['4', 'Vacant_Since'] == DATES['Q1_2025']
+
+
+def test_incremental_update_matches_a_full_rebuild(make_rent_roll):
+    frames = snapshots(make_rent_roll)
+    # Round-trip the two-snapshot tracker as the processor's memo does, then fold in the third
+    prefix = pickle.loads(pickle.dumps(fold(VacancyTracker(), frames, ['Q4_2024', 'Q1_2025'])))
+    incremental = fold(prefix, frames, ['Q2_2025'])
+    rebuilt = fold(VacancyTracker(), frames, DATES)
+    pd.testing.assert_frame_equal(incremental.state, rebuilt.state)
+    pd.testing.assert_frame_equal(incremental.aging(), rebuilt.aging())
+    assert incremental.periods == list(DATES)
+
+
+def test_snapshots_must_arrive_in_date_order(make_rent_roll):
+    frames = snapshots(make_rent_roll)
+    tracker = fold(VacancyTracker(), frames, ['Q1_2025'])
+    with pytest.raises(ValueError):
+        tracker.update(frames['Q4_2024'], DATES['Q4_2024'], 'Q4_2024')
+
+
+def test_aging_buckets_and_summary(make_rent_roll):
+    aging = fold(VacancyTracker(), snapshots(make_rent_roll), DATES).aging()
+    table = aging_table(aging)
+    # Downtimes of 4.9, 5.9, 2.0 and 2.99 months
+    assert table.loc['Fund 2', 'count'].tolist() == [2, 2, 0, 0, 0]
+    summary = aging_summary(aging, table, 'Fund 2')
+    assert summary['vacant_units'] == 4 and summary['censored_units'] == 1
+    assert summary['vacant_sf'] == 4000
+    assert aging_summary(aging, table, 'Fund 3')['buckets']['count'] == [0] * 5
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics_engine import grouped_period_metrics, stack_snapshots
+from rent_roll_normalization import DAYS_PER_MONTH
+from walt_curve import calendar_months_between, month_end_grid, walt_curve
+from conftest import ANALYSIS_DATE
+
+
+def months_reference(start, end):
+    """Calendar months counted anniversary by anniversary with pandas DateOffset"""
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    if end <= start:
+        return 0.0
+    whole = (end.year - start.year) * 12 + end.month - start.month + 1
+    while start + pd.DateOffset(months=whole) > end:
+        whole -= 1
+    anniversary = start + pd.DateOffset(months=whole)
+    following = start + pd.DateOffset(months=whole + 1)
+    return whole + (end - anniversary).days / (following - anniversary).days
+
+
+def months(start, end):
+    return float(calendar_months_between(np.datetime64(start, 'D'), np.datetime64(end, 'D')))
+
+
+@pytest.mark.parametrize('start, end, expected', [
+    ('2025-01-31', '2025-02-28', 1.0),
+    ('2024-01-31', '2024-02-29', 1.0),
+    ('2025-01-31', '2025-03-31', 2.0),
+    ('2025-02-28', '2025-03-28', 1.0),
+    ('2025-01-15', '2025-02-15', 1.0),
+    ('2025-06-30', '2026-06-30', 12.0),
+    ('2025-01-15', '2025-01-30', 15 / 31),
+    ('2025-06-30', '2025-06-30', 0.0),
+    ('2025-06-30', '2025-05-31', 0.0),
+])
+def test_calendar_months_at_month_ends(start, end, expected):
+    assert months(start, end) == pytest.approx(expected)
+
+
+def test_calendar_months_match_anniversary_counting():
+    rng = np.random.default_rng(7)
+    month_ends = pd.date_range('2023-01-31', '2027-12-31', freq='M')
+    days = pd.date_range('2023-01-01', '2027-12-31', freq='D')
+    starts = np.concatenate([month_ends[rng.integers(len(month_ends), size=150)],
+                             days[rng.integers(len(days), size=150)]])
+    ends = np.concatenate([month_ends[rng.integers(len(month_ends), size=150)],
+                           days[rng.integers(len(days), size=150)]])
+    vectorized = calendar_months_between(starts.astype('datetime64[D]'), ends.astype('datetime64[D]'))
+    expected = [months_reference(start, end) for start, end in zip(starts, ends)]
+    assert vectorized == pytest.approx(expected)
+
+
+def test_calendar_months_broadcast_a_grid():
+    grid = calendar_months_between(np.array(['2025-06-30', '2025-07-31'], dtype='datetime64[D]')[None, :],
+                                   np.array(['2026-06-30', '2025-09-30'], dtype='datetime64[D]')[:, None])
+    assert grid.shape == (2, 2)
+    assert grid[0].tolist() == pytest.approx([12.0, months('2025-07-31', '2026-06-30')])
+
+
+def test_curve_at_the_snapshot_matches_period_metrics(make_rent_roll):
+    df = make_rent_roll([
+        ('xnj100', '1', 'Alpha Co', 1000, 12000, '2024-01-01', '2025-12-31'),
+        ('xnj100', '2', 'Beta Co', 3000, 30000, '2024-01-01', '2028-06-30'),
+        ('xnj100', '3', 'Holdover Co', 500, 6000, '2020-01-01', '2025-03-31'),
+        ('xnj100', '4', 'VACANT', 800, None, None, None),
+    ])
+    curve = walt_curve(df, month_end_grid(ANALYSIS_DATE, 12), ANALYSIS_DATE).loc['Fund 2']
+    period = grouped_period_metrics(stack_snapshots({'Q2_2025': df}), ['Q2_2025'])['Fund 2']['Q2_2025']
+    assert curve.iloc[0]['walt'] == pytest.approx(period['walt'])
+    assert curve.iloc[0]['occupied_sf'] == 4500
+
+    # Alpha Co rolls off after December; the lease already past expiry stays in place with 0 months
+    assert curve.loc[pd.Timestamp('2025-12-31'), 'occupied_sf'] == 4500
+    assert curve.loc[pd.Timestamp('2026-01-31'), 'occupied_sf'] == 3500
+    assert curve.loc[pd.Timestamp('2026-01-31'), 'walt'] == pytest.approx(
+        3000 * (pd.Timestamp('2028-06-30') - pd.Timestamp('2026-01-31')).days / DAYS_PER_MONTH / 3500)
+
+
+def test_exact_months_curve_uses_calendar_months(make_rent_roll):
+    df = make_rent_roll([('xnj100', '1', 'Alpha Co', 1000, 12000, '2024-01-01', '2026-02-28')])
+    as_of = month_end_grid(ANALYSIS_DATE, 3)
+    curve = walt_curve(df, as_of, ANALYSIS_DATE, exact_months=True).loc['Fund 2']
+    assert curve['walt'].tolist() == pytest.approx([months(date, '2026-02-28') for date in as_of])
@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+
+from expiry_buckets import ExpiryBuckets
+from lease_diff import normalize_units
+from rent_roll_normalization import DAYS_PER_MONTH
+
+UNIT_KEYS = ['Prop_Code', 'Unit_Key']
+# Per-unit state carried from snapshot to snapshot
+STATE_COLUMNS = ['Fund', 'Property', 'Units', 'Area', 'Vacant', 'First_Seen', 'Last_Seen', 'Vacant_Since_Snapshot',
+                 'Vacant_Since_Period', 'Last_Occupied', 'Last_Tenant', 'Last_Annual_Rent', 'Last_Area',
+                 'Last_Lease_To']
+AGING_COLUMNS = ['Fund', 'Property', 'Units', 'Area', 'Vacant_Since_Period', 'Vacant_Since', 'Downtime_Months',
+                 'Censored', 'Last_Tenant', 'Last_Annual_Rent', 'Last_Rent_PSF', 'Last_Lease_To']
+# Months dark: 0-3, 3-6, 6-12, 12-24 and 24+ (a unit vacant since this snapshot is in the first bucket)
+AGING_BUCKETS = ExpiryBuckets([0, 3, 6, 12, 24], include_lowest=True)
+
+
+def unit_observations(df, analysis_date):
+    """One row per (Prop_Code, Unit_Key) of a snapshot: vacant only if every row of the unit is vacant
+
+    Units with a current and a future lease have several rows; the in-place lease
+    (started on or before analysis_date, latest start first) supplies the tenant, rent
+    and expiry.
+    """
+    vacant = df['Is_Vacant'].to_numpy(dtype=bool)
+    lease_from = df['Lease_From']
+    rows = pd.DataFrame({
+        'Prop_Code': df['Prop_Code'].to_numpy(dtype=object),
+        'Unit_Key': normalize_units(df['Units'].astype(str)).to_numpy(dtype=object),
+        'Fund': df['Fund'].to_numpy(dtype=object),
+        'Property': df['Property'].to_numpy(dtype=object),
+        'Units': df['Units'].to_numpy(dtype=object),
+        'Area': df['Area'].to_numpy(dtype=np.float64),
+        'Vacant': vacant,
+        'Tenant': df['Tenant_Name'].to_numpy(dtype=object),
+        'Annual_Rent': df['Annual_Rent'].to_numpy(dtype=np.float64),
+        'Lease_To': df['Lease_To'].to_numpy(dtype='datetime64[ns]'),
+        # Sort keys: occupied before vacant, in-place before future, later start first
+        '_future': (lease_from > pd.Timestamp(analysis_date)).to_numpy(),
+        '_start': lease_from.to_numpy(dtype='datetime64[ns]'),
+    })
+    rows = rows.sort_values(UNIT_KEYS + ['Vacant', '_future', '_start'], ascending=[True, True, True, True, False],
+                            kind='stable', na_position='last')
+    grouped = rows.groupby(UNIT_KEYS, sort=False)
+    units = grouped.first()
+    units['Vacant'] = grouped['Vacant'].all()
+    units['Area'] = grouped['Area'].max()
+    return units.drop(columns=['_future', '_start'])
+
+
+class VacancyTracker:
+    """How long every currently vacant unit has been dark, folded snapshot by snapshot
+
+    The state holds one row per (Prop_Code, Unit_Key) ever seen: its last observed
+    occupied lease (tenant, rent, expiry, snapshot date) and, while it is vacant, the
+    first snapshot of the current vacant run. update() folds in the next snapshot
+    with one index-aligned join of the state against that snapshot's units, so adding
+    a snapshot costs one pass over it and the history is never replayed.
+    """
+
+    def __init__(self):
+        self.state = pd.DataFrame(columns=STATE_COLUMNS,
+                                  index=pd.MultiIndex.from_tuples([], names=UNIT_KEYS)).astype({
+            'Area': np.float64, 'Vacant': bool, 'First_Seen': 'datetime64[ns]', 'Last_Seen': 'datetime64[ns]',
+            'Vacant_Since_Snapshot': 'datetime64[ns]', 'Last_Occupied': 'datetime64[ns]',
+            'Last_Annual_Rent': np.float64, 'Last_Area': np.float64, 'Last_Lease_To': 'datetime64[ns]'})
+        self.periods = []
+        self.analysis_date = None
+
+    def update(self, df, analysis_date, period):
+        """Fold one snapshot into the state; snapshots must arrive in date order"""
+        analysis_date = pd.Timestamp(analysis_date)
+        if self.analysis_date is not None and analysis_date <= self.analysis_date:
+            raise ValueError(f"Snapshot {period} ({analysis_date:%Y-%m-%d}) is not after the last one "
+                             f"({self.analysis_date:%Y-%m-%d}); rebuild the tracker instead")
+        units = unit_observations(df, analysis_date)
+        state = self.state.reindex(self.state.index.union(units.index, sort=True))
+        seen = state.index.isin(units.index)
+        units = units.reindex(state.index)
+
+        vacant_now = seen & units['Vacant'].fillna(False).to_numpy(dtype=bool)
+        occupied_now = seen & ~vacant_now
+        # A vacant run starts at the first vacant snapshot after the unit was last seen occupied
+        was_vacant = state['Vacant'].fillna(False).to_numpy(dtype=bool) & \
+            state['Vacant_Since_Snapshot'].notna().to_numpy()
+        continues = vacant_now & was_vacant
+
+        for column in ('Fund', 'Property', 'Units', 'Area'):
+            state[column] = np.where(seen, units[column].to_numpy(dtype=object), state[column].to_numpy(dtype=object))
+        state['Area'] = state['Area'].astype(np.float64)
+        state['Vacant'] = np.where(seen, vacant_now, state['Vacant'].fillna(False).to_numpy(dtype=bool))
+        state['First_Seen'] = state['First_Seen'].fillna(analysis_date)
+        state['Last_Seen'] = state['Last_Seen'].mask(seen, analysis_date)
+        state['Vacant_Since_Snapshot'] = state['Vacant_Since_Snapshot'].where(continues, pd.NaT).mask(
+            vacant_now & ~continues, analysis_date)
+        state['Vacant_Since_Period'] = np.where(continues, state['Vacant_Since_Period'].to_numpy(dtype=object),
+                                                np.where(vacant_now, period, None))
+        state['Last_Occupied'] = state['Last_Occupied'].mask(occupied_now, analysis_date)
+        state['Last_Tenant'] = np.where(occupied_now, units['Tenant'].to_numpy(dtype=object),
+                                        state['Last_Tenant'].to_numpy(dtype=object))
+        for column, source in (('Last_Annual_Rent', 'Annual_Rent'), ('Last_Area', 'Area'),
+                               ('Last_Lease_To', 'Lease_To')):
+            state[column] = state[column].mask(occupied_now, units[source])
+
+        self.state = state[STATE_COLUMNS]
+        self.periods.append(period)
+        self.analysis_date = analysis_date
+        return self
+
+    def aging(self):
+        """Every unit vacant in the latest snapshot, longest dark first
+
+        Vacant_Since is the day after the last in-place lease expired when that falls
+        between the last occupied and the first vacant snapshot, else the first vacant
+        snapshot date. Censored marks units already vacant when first seen, whose
+        downtime is at least Downtime_Months.
+        """
+        state = self.state
+        current = state[state['Vacant'].to_numpy(dtype=bool) & (state['Last_Seen'] == self.analysis_date).to_numpy()]
+        first_vacant = current['Vacant_Since_Snapshot']
+        expired = current['Last_Lease_To'] + pd.Timedelta(days=1)
+        plausible = expired.notna() & (expired > current['Last_Occupied']) & (expired <= first_vacant)
+        vacant_since = first_vacant.mask(plausible, expired)
+
+        aging = current.assign(
+            Vacant_Since=vacant_since,
+            Downtime_Months=(self.analysis_date - vacant_since).dt.days / DAYS_PER_MONTH,
+            Censored=current['Last_Occupied'].isna(),
+        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            aging['Last_Rent_PSF'] = np.where(aging['Last_Area'] > 0, aging['Last_Annual_Rent'] / aging['Last_Area'],
+                                              np.nan)
+        return aging[AGING_COLUMNS].sort_values('Downtime_Months', ascending=False, kind='stable')
+
+
+def aging_table(aging, buckets=AGING_BUCKETS, by=('Fund',)):
+    """Vacant unit count, SF and last in-place rent per downtime bucket for every group
+
+    Indexed by `by` plus an ordered Bucket level, every bucket present for every group.
+    """
+    by = list(by)
+    codes = buckets.codes(aging['Downtime_Months'].to_numpy(dtype=np.float64))
+    keep = codes >= 0
+    frame = pd.DataFrame({key: aging[key].to_numpy()[keep] for key in by})
+    frame['Bucket'] = pd.Categorical.from_codes(codes[keep], categories=buckets.labels, ordered=True)
+    frame['count'] = 1
+    frame['sf'] = aging['Area'].to_numpy(dtype=np.float64)[keep]
+    frame['last_annual_rent'] = np.nan_to_num(aging['Last_Annual_Rent'].to_numpy(dtype=np.float64)[keep])
+    return frame.groupby(by + ['Bucket'], observed=False, sort=True)[['count', 'sf', 'last_annual_rent']].sum()
+
+
+def aging_summary(aging, table, key):
+    """One fund's vacant units and downtime buckets as the dict stored in calculate_fund_metrics()['vacancy_aging']
+
+    avg_downtime_months is weighted by the vacant SF.
+    """
+    rows = aging[aging['Fund'].to_numpy() == key]
+    sf = rows['Area'].to_numpy(dtype=np.float64)
+    months = rows['Downtime_Months'].to_numpy(dtype=np.float64)
+    buckets = table.xs(key, level=0) if key in table.index.get_level_values(0) else None
+    return {
+        'vacant_units': len(rows),
+        'vacant_sf': float(np.nansum(sf)),
+        'avg_downtime_months': float(np.nansum(sf * months) / np.nansum(sf)) if np.nansum(sf) > 0 else 0.0,
+        'max_downtime_months': float(months.max()) if len(rows) else 0.0,
+        'censored_units': int(rows['Censored'].sum()),
+        'buckets': {
+            'labels': list(AGING_BUCKETS.labels) if buckets is None else [str(bucket) for bucket in buckets.index],
+            'count': [0] * len(AGING_BUCKETS.labels) if buckets is None else buckets['count'].astype(int).tolist(),
+            'sf': [0.0] * len(AGING_BUCKETS.labels) if buckets is None else buckets['sf'].astype(float).tolist(),
+        },
+    }
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+from metrics_engine import NEAR_TERM_MONTHS
+from rent_roll_normalization import DAYS_PER_MONTH
+
+DEFAULT_CURVE_MONTHS = 60
+CURVE_COLUMNS = ['occupied_sf', 'walt', 'near_term_expiry_sf', 'near_term_expiry_pct']
+# Leases per broadcast block, bounding the lease x date scratch arrays to a few MB
+CHUNK_ROWS = 8192
+# Day number standing in for an undated expiry: earlier than any as-of date, so 0 months remain
+_UNDATED = np.iinfo(np.int64).min // 2
+
+
+def month_end_grid(start, months=DEFAULT_CURVE_MONTHS):
+    """start plus the last day of each of the following `months` months"""
+    start = pd.Timestamp(start).normalize()
+    return pd.DatetimeIndex([start]).append(pd.date_range(start + pd.offsets.MonthEnd(1), periods=months, freq='M'))
+
+
+def _month_parts(dates):
+    """Month number, 0-based day of month and days in the previous, same and next month of datetime64[D] dates"""
+    month = dates.astype('datetime64[M]')
+    day = (dates - month.astype('datetime64[D]')).astype(np.int64)
+    starts = [(month + offset).astype('datetime64[D]') for offset in (-1, 0, 1, 2)]
+    lengths = [(later - earlier).astype(np.int64) for earlier, later in zip(starts, starts[1:])]
+    return month.astype(np.int64), day, lengths
+
+
+def calendar_months_between(start, end):
+    """Exact calendar months from start to end (datetime64[D] arrays that broadcast together)
+
+    Whole months are counted the way a lease anniversary falls (Jan 31 + 1 month is
+    Feb 28/29); the remainder is the days past the last anniversary over the days to
+    the next one. Negative spans give 0. Month and day parts are taken from each
+    input before broadcasting, so a lease x date grid costs only integer arithmetic.
+    """
+    start_month, start_day, _ = _month_parts(np.asarray(start, dtype='datetime64[D]'))
+    end_month, end_day, (prev_len, end_len, next_len) = _month_parts(np.asarray(end, dtype='datetime64[D]'))
+
+    # Anniversary day of `start` in the end's month, the month before and the month after
+    anniversary = np.minimum(start_day, end_len - 1)
+    prev_anniversary = np.minimum(start_day, prev_len - 1)
+    next_anniversary = np.minimum(start_day, next_len - 1)
+
+    reached = end_day >= anniversary
+    whole = end_month - start_month - np.where(reached, 0, 1)
+    fraction = np.where(
+        reached,
+        (end_day - anniversary) / (end_len - anniversary + next_anniversary),
+        (prev_len - prev_anniversary + end_day) / (prev_len - prev_anniversary + anniversary),
+    )
+    return np.maximum(whole + fraction, 0.0)
+
+
+def walt_curve(df, as_of_dates, analysis_date=None, by=('Fund',), exact_months=False, include_vacant=False,
+               near_term_months=NEAR_TERM_MONTHS):
+    """WALT, occupied SF and near-term expiry SF of every group at every as-of date at once
+
+    Remaining months are broadcast over the Lease_To array against the whole date grid
+    (30.44-day months like Months_To_Expiry, or exact calendar months). Leases that
+    expire after analysis_date roll out of occupied SF once an as-of date passes their
+    expiry; leases already past expiry in the snapshot stay in with 0 months, so the
+    curve at the snapshot date matches the period metrics. include_vacant adds vacant
+    SF to the WALT denominator.
+
+    Returns a frame indexed by `by` plus As_Of with CURVE_COLUMNS.
+    """
+    by = list(by)
+    as_of = pd.DatetimeIndex(as_of_dates).normalize()
+    grid_dates = as_of.to_numpy(dtype='datetime64[D]')
+    as_of_days = grid_dates.astype(np.int64)
+    snapshot_day = as_of_days.min() if analysis_date is None else \
+        np.datetime64(pd.Timestamp(analysis_date).normalize(), 'D').astype(np.int64)
+
+    vacant = df['Is_Vacant'].to_numpy(dtype=bool)
+    if not include_vacant:
+        df, vacant = df[~vacant], vacant[~vacant]
+    area = np.nan_to_num(df['Area'].to_numpy(dtype=np.float64))
+    lease_to = df['Lease_To'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    lease_to = np.where(df['Lease_To'].isna().to_numpy() | vacant, _UNDATED, lease_to)
+
+    grouped = df.groupby(by, sort=True, observed=True, dropna=False)
+    group_codes = grouped.ngroup().to_numpy()
+    index = grouped.size().index
+    order = np.argsort(group_codes, kind='stable')
+    area, lease_to, vacant, group_codes = area[order], lease_to[order], vacant[order], group_codes[order]
+
+    sums = {name: np.zeros((len(index), len(as_of))) for name in ('occupied_sf', 'denominator_sf', 'walt_weight',
+                                                                     'near_term_expiry_sf')}
+    for start in range(0, len(order), CHUNK_ROWS):
+        block = slice(start, start + CHUNK_ROWS)
+        expiry = lease_to[block, None]
+        if exact_months:
+            # Undated expiries are clamped to the first as-of date; anything before an as-of date gives 0
+            months = calendar_months_between(grid_dates[None, :],
+                                             np.maximum(expiry, as_of_days.min()).astype('datetime64[D]'))
+        else:
+            months = np.maximum((expiry - as_of_days[None, :]) / DAYS_PER_MONTH, 0.0)
+        # Rolled off: expired after the snapshot but before the as-of date
+        in_place = ~((expiry >= snapshot_day) & (expiry < as_of_days[None, :]))
+        occupied_area = np.where(in_place & ~vacant[block, None], area[block, None], 0.0)
+        values = {
+            'occupied_sf': occupied_area,
+            'denominator_sf': np.where(in_place, area[block, None], 0.0),
+            'walt_weight': occupied_area * months,
+            'near_term_expiry_sf': np.where(months <= near_term_months, occupied_area, 0.0),
+        }
+        codes = group_codes[block]
+        boundaries = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        for name, matrix in values.items():
+            sums[name][codes[boundaries]] += np.add.reduceat(matrix, boundaries, axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        walt = np.where(sums['denominator_sf'] > 0, sums['walt_weight'] / sums['denominator_sf'], 0.0)
+        near_term_pct = np.where(sums['occupied_sf'] > 0,
+                                 sums['near_term_expiry_sf'] / sums['occupied_sf'] * 100, 0.0)
+
+    curve_index = pd.MultiIndex.from_tuples(
+        [(*(key if isinstance(key, tuple) else (key,)), date) for key in index for date in as_of],
+        names=by + ['As_Of'])
+    return pd.DataFrame({
+        'occupied_sf': sums['occupied_sf'].ravel(),
+        'walt': walt.ravel(),
+        'near_term_expiry_sf': sums['near_term_expiry_sf'].ravel(),
+        'near_term_expiry_pct': near_term_pct.ravel(),
+    }, index=curve_index)
@@ -0,0 +1,157 @@
+import argparse
+import json
+import os
+import time
+import zipfile
+from datetime import datetime
+
+from snapshot_cache import file_sha256
+
+WATCH_STATE_FILE = 'watch_state.json'
+EVENTS_FILE = 'events.jsonl'
+DEFAULT_INTERVAL = 30
+# Seconds a workbook must stay unmodified before it is ingested, so half-copied exports are skipped
+DEFAULT_SETTLE = 5
+
+
+class SnapshotWatcher:
+    """Polls the data directory and ingests new or changed rent roll workbooks
+
+    A workbook is hashed only when its mtime or size changes and re-parsed only when its
+    hash changes; unchanged snapshots come from the snapshot cache. Each poll that finds
+    changes calls the subscribed handlers once with its events and appends them to
+    events.jsonl in the cache directory for out-of-process consumers.
+    """
+
+    def __init__(self, processor, interval=DEFAULT_INTERVAL, settle=DEFAULT_SETTLE):
+        if processor.cache is None:
+            raise ValueError("SnapshotWatcher needs a RentRollProcessor with the snapshot cache enabled")
+        self.processor = processor
+        self.interval = interval
+        self.settle = settle
+        self.state_dir = processor.cache.cache_dir
+        self.state = self._read_state()
+        self.handlers = []
+
+    def subscribe(self, handler):
+        """Register handler(events), called after every poll that produced events"""
+        self.handlers.append(handler)
+
+    def poll(self):
+        """Check the data directory once and return the events for added, modified or removed workbooks"""
+        registry = self.processor.snapshots
+        registry.discover()
+        now = time.time()
+        state, events = {}, []
+
+        for snapshot in registry.snapshots.values():
+            path = os.path.abspath(snapshot.file_path)
+            stat = os.stat(path)
+            previous = self.state.get(path)
+            if previous and previous['mtime'] == stat.st_mtime and previous['size'] == stat.st_size:
+                state[path] = previous
+                continue
+            if now - stat.st_mtime < self.settle:
+                # Still being written; keep the old entry (if any) and look again next poll
+                if previous:
+                    state[path] = previous
+                continue
+
+            sha = file_sha256(path)
+            entry = {'mtime': stat.st_mtime, 'size': stat.st_size, 'sha256': sha, 'period': snapshot.key}
+            if previous and previous['sha256'] == sha:
+                state[path] = entry
+                continue
+
+            registry.evict(snapshot.key)
+            try:
+                df = registry[snapshot.key]
+            except (zipfile.BadZipFile, ValueError, KeyError) as exc:
+                # Remember the failure so an unreadable file is reported once, not on every poll
+                state[path] = {**entry, 'error': str(exc)}
+                events.append(self._event('error', snapshot.key, path, sha, error=str(exc)))
+                continue
+            state[path] = entry
+            events.append(self._event('modified' if previous else 'added', snapshot.key, path, sha, rows=len(df)))
+
+        for path, previous in self.state.items():
+            if path not in state and not os.path.exists(path):
+                events.append(self._event('removed', previous['period'], path, previous['sha256']))
+
+        self.state = state
+        self._write_state()
+        if events:
+            self._publish(events)
+        return events
+
+    def run(self, max_polls=None):
+        """Poll every `interval` seconds until interrupted (or max_polls polls have run)"""
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                self.poll()
+                polls += 1
+                if max_polls is None or polls < max_polls:
+                    time.sleep(self.interval)
+        except KeyboardInterrupt:
+            pass
+
+    def _event(self, event_type, period, file_path, sha256, **details):
+        return {'type': event_type, 'period': period, 'file_path': file_path, 'sha256': sha256,
+                'time': datetime.now().isoformat(timespec='seconds'), **details}
+
+    def _publish(self, events):
+        os.makedirs(self.state_dir, exist_ok=True)
+        with open(os.path.join(self.state_dir, EVENTS_FILE), 'a') as f:
+            for event in events:
+                f.write(json.dumps(event) + '\n')
+        for handler in self.handlers:
+            handler(events)
+
+    def _read_state(self):
+        path = os.path.join(self.state_dir, WATCH_STATE_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_state(self):
+        os.makedirs(self.state_dir, exist_ok=True)
+        path = os.path.join(self.state_dir, WATCH_STATE_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+
+def print_events(events):
+    for event in events:
+        detail = f"{event['rows']:,} rows" if 'rows' in event else event.get('error', '')
+        print(f"[{event['time']}] {event['type']:<9} {event['period']:<8} "
+              f"{os.path.basename(event['file_path'])}  {detail}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Watch the data directory and ingest new or changed rent rolls')
+    parser.add_argument('--data-dir', default='.')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help='Seconds between polls')
+    parser.add_argument('--settle', type=float, default=DEFAULT_SETTLE,
+                        help='Skip workbooks modified less than this many seconds ago')
+    parser.add_argument('--once', action='store_true', help='Poll once and exit')
+    parser.add_argument('--export', action='store_true',
+                        help='Rewrite docs/data/dashboard_data.json after every ingest')
+    parser.add_argument('--history', action='store_true', help='Write ingested snapshots to the history store')
+    args = parser.parse_args()
+
+    from dashboard_data_processor import RentRollProcessor
+
+    processor = RentRollProcessor(data_dir=args.data_dir)
+    watcher = SnapshotWatcher(processor, interval=args.interval, settle=args.settle)
+    watcher.subscribe(print_events)
+    if args.history:
+        watcher.subscribe(lambda events: processor.sync_history())
+    if args.export:
+        from export_data_for_web import export_dashboard_data
+        watcher.subscribe(lambda events: export_dashboard_data(processor))
+
+    print(f"Watching {os.path.abspath(args.data_dir)} every {args.interval:g}s (Ctrl+C to stop)")
+    watcher.run(max_polls=1 if args.once else None)